@@ -24,6 +24,8 @@ class ConnectionSettings(TypedDict, total=False):
     MQTT_CERT_FILE: str
     MQTT_KEY_FILE: str
     MQTT_KEY_FILE_PASSWORD: str
+    MQTT_WIRE_CODECS: str
+    MQTT_DEVICE_ID: str
 
 mqtt_setting_names: list[str] = [
     'MQTT_HOST_NAME',
@@ -38,7 +40,9 @@ mqtt_setting_names: list[str] = [
     'MQTT_CERT_FILE',
     'MQTT_KEY_FILE',
     'MQTT_KEY_FILE_PASSWORD',
-    'MQTT_TLS_INSECURE'
+    'MQTT_TLS_INSECURE',
+    'MQTT_WIRE_CODECS',
+    'MQTT_DEVICE_ID'
 ]
 
 def _convert_to_int(value: str, name: str) -> int:
@@ -68,7 +72,9 @@ def get_connection_settings(env_filename: str) -> ConnectionSettings:
         'MQTT_KEY_FILE_PASSWORD': '',
         'MQTT_CLIENT_ID': '',
         'MQTT_TLS_INSECURE': 'false',
-        'MQTT_PASSWORD_FILE': None
+        'MQTT_PASSWORD_FILE': None,
+        'MQTT_WIRE_CODECS': '',
+        'MQTT_DEVICE_ID': 'default'
     }
 
     final_values = {**default_values, **envvar_values, **envfile_values}
@@ -86,11 +92,24 @@ def get_connection_settings(env_filename: str) -> ConnectionSettings:
     if 'MQTT_KEEP_ALIVE_IN_SECONDS' in final_values:
         final_values['MQTT_KEEP_ALIVE_IN_SECONDS'] = _convert_to_int(final_values['MQTT_KEEP_ALIVE_IN_SECONDS'],
                                                                      'MQTT_KEEP_ALIVE_IN_SECONDS')
+    if any(c in final_values['MQTT_DEVICE_ID'] for c in '/+#') or final_values['MQTT_DEVICE_ID'] == '':
+        raise ValueError('MQTT_DEVICE_ID must be a non-empty topic level without /, + or #')
     if 'MQTT_TLS_INSECURE' in final_values:
         final_values['MQTT_TLS_INSECURE'] = _convert_to_bool(final_values['MQTT_TLS_INSECURE'], 'MQTT_TLS_INSECURE')
 
     return final_values
 
+def device_topic(device_id: str, direction: str, name: str) -> str:
+    """
+    Topic of a device, e.g., tasqsym/<device_id>/c2d/command.
+    device_id: id of the core (+ to subscribe to all devices)
+    direction: c2d (server to device) or d2c (device to server)
+    """
+    return "tasqsym/%s/%s/%s" % (device_id, direction, name)
+
+def device_from_topic(topic: str) -> str:
+    return topic.split('/')[1]
+
 def create_mqtt_client(connection_settings: ConnectionSettings):
     mqtt_client = mqtt.Client(
         client_id=connection_settings["MQTT_CLIENT_ID"],
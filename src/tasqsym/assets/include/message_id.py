@@ -0,0 +1,56 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import time
+import threading
+
+
+# Crockford's base32 as used by ULIDs
+_ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+class MessageIdGenerator:
+    """
+    Generates monotonic ULIDs (26 character strings) to identify the messages between the core and the encoder.
+
+    The first 48 bits are the unix time in milliseconds and the remaining 80 bits are random, so that ids
+    from different processes do not collide. Within the same millisecond the random part is incremented
+    instead of regenerated, so that ids from the same process are strictly increasing (also when compared as strings).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def next(self) -> str:
+        with self._lock:
+            ms = time.time_ns() // 1000000
+            if ms > self._last_ms:
+                random = int.from_bytes(os.urandom(_RANDOM_BITS // 8), "big")
+            else:  # same millisecond or clock moved backwards
+                ms = self._last_ms
+                random = self._last_random + 1
+                if random > _RANDOM_MAX:
+                    ms += 1
+                    random = int.from_bytes(os.urandom(_RANDOM_BITS // 8), "big")
+            self._last_ms, self._last_random = ms, random
+
+        value = (ms << _RANDOM_BITS) | random
+        chars = []
+        for _ in range(26):
+            chars.append(_ENCODING[value & 0x1f])
+            value >>= 5
+        return "".join(reversed(chars))
+
+
+_generator = MessageIdGenerator()
+
+def newMessageId() -> str:
+    """Returns a new message id from the process-wide generator."""
+    return _generator.next()
@@ -0,0 +1,173 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import time
+import random
+import typing
+import threading
+import collections
+import paho.mqtt.client as mqtt
+import tasqsym.assets.include.load_mqtt_config as load_mqtt_config
+
+
+class MQTTSession:
+    """
+    MQTT connection shared by the bridges which survives broker or network outages.
+
+    The network loop runs in its own thread and reconnects with exponential backoff and jitter
+    (so that a fleet of devices does not reconnect all at once). Subscriptions are renewed on every reconnect,
+    and messages published while offline are buffered (bounded, oldest dropped first) and replayed in order.
+    Buffered messages older than buffer_ttl_sec are dropped instead of replayed, as they may no longer be valid after a long outage.
+    """
+
+    def __init__(self, connection_settings: load_mqtt_config.ConnectionSettings, subscriptions: list[str],
+                 on_message: typing.Callable, on_connected: typing.Callable=None, cleared_on_loss: str="",
+                 buffer_size: int=1000, buffer_ttl_sec: float=60., min_backoff_sec: float=0.5, max_backoff_sec: float=30.):
+        """
+        connection_settings: settings from load_mqtt_config.get_connection_settings()
+        subscriptions:       topics to (re)subscribe to on every connection
+        on_message:          paho on_message callback
+        on_connected:        called (in the network thread) after every (re)connection, e.g., to announce retained content
+        cleared_on_loss:     topic of retained content to clear if the connection is lost without stop() (e.g., the process crashed)
+        buffer_size:         maximum number of messages to keep while offline
+        buffer_ttl_sec:      time to keep a message while offline (no limit if 0)
+        min_backoff_sec:     wait before the first reconnection attempt
+        max_backoff_sec:     maximum wait between reconnection attempts
+        """
+        self.connection_settings = connection_settings
+        self.subscriptions = subscriptions
+        self.on_connected = on_connected
+        self.buffer_ttl_sec = buffer_ttl_sec
+        self.min_backoff_sec = min_backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+
+        # health status
+        self.connected = False
+        self.disconnected_since = time.monotonic()
+        self.reconnect_count = 0
+
+        self._buffer: collections.deque = collections.deque(maxlen=buffer_size)  # (buffered_time, topic, payload, qos, retain)
+        self._buffer_lock = threading.Lock()
+        self._stopping = False
+        self._ever_connected = False
+
+        self.mqtt_client = load_mqtt_config.create_mqtt_client(connection_settings)
+        if cleared_on_loss != "": self.mqtt_client.will_set(cleared_on_loss, b"", qos=1, retain=True)  # last will, an empty retained message clears the topic
+        self.mqtt_client.on_connect = self.on_connect
+        self.mqtt_client.on_publish = self.on_publish
+        self.mqtt_client.on_subscribe = self.on_subscribe
+        self.mqtt_client.on_message = on_message
+        self.mqtt_client.on_disconnect = self.on_disconnect
+
+        self._network_thread = threading.Thread(target=self._networkLoop, daemon=True)
+
+    def start(self, wait_sec: float=5.) -> bool:
+        """
+        Start the network loop and wait for the first connection.
+        wait_sec: time to wait for the connection
+
+        return: whether connected (if not, the session keeps retrying in the background)
+        """
+        self._network_thread.start()
+        elapsed = 0.
+        while not self.connected and elapsed < wait_sec:
+            time.sleep(.1)
+            elapsed += .1
+        if not self.connected: print("mqtt warning: not connected yet, retrying in the background (messages are buffered)")
+        return self.connected
+
+    def stop(self):
+        self._stopping = True
+        self.mqtt_client.disconnect()
+
+    def clearRetained(self, topic: str, wait_sec: float=2.) -> bool:
+        """
+        Clear the retained content of the topic and wait until the broker received it (e.g., before stop()).
+        wait_sec: maximum time to wait
+
+        return: whether cleared (if offline, the broker already published the last will if set)
+        """
+        with self._buffer_lock:
+            if not self.connected: return False
+            info = self.mqtt_client.publish(topic, b"", qos=1, retain=True)
+        try: info.wait_for_publish(wait_sec)
+        except (RuntimeError, ValueError) as e: print("mqtt warning: could not clear %s: %s" % (topic, e))
+        return info.is_published()
+
+    def publish(self, topic: str, payload, qos: int=1, retain: bool=False, buffered: bool=True) -> bool:
+        """
+        buffered: keep the message while offline (set False for messages only valid now, e.g., telemetry or robot commands)
+
+        return: whether the message was handed to the client (False if buffered or dropped)
+        """
+        with self._buffer_lock:
+            if self.connected:
+                info = self.mqtt_client.publish(topic, payload, qos=qos, retain=retain)
+                if info.rc == mqtt.MQTT_ERR_SUCCESS: return True
+            if not buffered: return False
+            if len(self._buffer) == self._buffer.maxlen: print("mqtt warning: offline buffer full, dropped oldest message")
+            self._buffer.append((time.monotonic(), topic, payload, qos, retain))
+            return False
+
+    def health(self) -> dict:
+        return {
+            "connected": self.connected,
+            "offline_sec": 0. if self.connected else time.monotonic() - self.disconnected_since,
+            "buffered_messages": len(self._buffer),
+            "reconnect_count": self.reconnect_count
+        }
+
+    def on_connect(self, _client, _userdata, _flags, rc):
+        if rc != mqtt.MQTT_ERR_SUCCESS:
+            print("mqtt connection refused: %s" % mqtt.connack_string(rc))
+            return
+        if self._ever_connected: self.reconnect_count += 1
+        self._ever_connected = True
+        for topic in self.subscriptions: self.mqtt_client.subscribe(topic, qos=1)
+        if self.on_connected is not None: self.on_connected()
+        with self._buffer_lock:
+            self.connected = True
+            expire_before = time.monotonic() - self.buffer_ttl_sec
+            expired = 0
+            if len(self._buffer) > 0: print("mqtt info: replaying %d buffered messages" % len(self._buffer))
+            while len(self._buffer) > 0:
+                buffered_time, topic, payload, qos, retain = self._buffer.popleft()
+                if self.buffer_ttl_sec > 0 and buffered_time < expire_before:
+                    expired += 1
+                    continue
+                self.mqtt_client.publish(topic, payload, qos=qos, retain=retain)
+            if expired > 0: print("mqtt warning: dropped %d buffered messages older than %.0f sec" % (expired, self.buffer_ttl_sec))
+    def on_publish(self, _client, _userdata, mid):
+        print(f"Sent publish with message id {mid}")
+    def on_subscribe(self, _client, _userdata, mid, _granted_qos):
+        print(f"Subscribe for message id {mid} acknowledged by MQTT broker")
+    def on_disconnect(self, _client, _userdata, rc):
+        print("Received disconnect with error='{}'".format(mqtt.error_string(rc)))
+        with self._buffer_lock:
+            if self.connected: self.disconnected_since = time.monotonic()
+            self.connected = False
+
+    def _networkLoop(self):
+        attempt = 0
+        first_connection = True
+        while not self._stopping:
+            try:
+                if first_connection:
+                    self.mqtt_client.connect(self.connection_settings['MQTT_HOST_NAME'], self.connection_settings['MQTT_TCP_PORT'],
+                                             keepalive=self.connection_settings["MQTT_KEEP_ALIVE_IN_SECONDS"])
+                    first_connection = False
+                else: self.mqtt_client.reconnect()
+                rc = mqtt.MQTT_ERR_SUCCESS
+                while rc == mqtt.MQTT_ERR_SUCCESS and not self._stopping:
+                    rc = self.mqtt_client.loop(timeout=1.)
+                    if self.connected: attempt = 0
+            except (OSError, ValueError) as e:  # socket/TLS errors, host not reachable, etc.
+                print("mqtt warning: connection failed: %s" % e)
+            if self._stopping: break
+
+            # exponential backoff with jitter
+            backoff = min(self.max_backoff_sec, self.min_backoff_sec * (2 ** attempt))
+            time.sleep(random.uniform(.5, 1.) * backoff)
+            attempt += 1
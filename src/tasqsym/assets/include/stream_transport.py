@@ -0,0 +1,80 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import json
+import struct
+import typing
+import asyncio
+import dotenv
+
+
+"""
+Length-prefixed message frames over a Unix domain socket or a TCP (loopback) stream.
+Used instead of an MQTT broker when the server and the core run on the same machine.
+"""
+
+FRAME_LENGTH = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024  # bytes, larger frames close the connection
+
+
+class FrameSizeError(ConnectionError):
+    """The peer announced a frame larger than allowed, the stream cannot be read further."""
+
+socket_setting_names: list[str] = [
+    'TASQSYM_SOCKET_ADDRESS',
+    'TASQSYM_WIRE_CODECS'
+]
+
+def get_socket_settings(env_filename: str) -> dict:
+    """
+    TASQSYM_SOCKET_ADDRESS: "unix:<path>" or "tcp:<host>:<port>"
+    TASQSYM_WIRE_CODECS:    codecs to limit to (see wire_codec.WireCodec)
+    """
+    env_file_dict = dotenv.dotenv_values(env_filename) if env_filename is not None else {}
+    envfile_values = {k: v for k, v in env_file_dict.items() if k in socket_setting_names}
+    envvar_values = {k: v for k, v in os.environ.items() if k in socket_setting_names}
+    default_values = {
+        'TASQSYM_SOCKET_ADDRESS': 'tcp:127.0.0.1:9110',
+        'TASQSYM_WIRE_CODECS': ''
+    }
+    return {**default_values, **envvar_values, **envfile_values}
+
+def _parseAddress(address: str) -> tuple[str, str, int]:
+    if address.startswith("unix:"): return ("unix", address[len("unix:"):], 0)
+    if address.startswith("tcp:"):
+        host, port = address[len("tcp:"):].rsplit(':', 1)
+        return ("tcp", host, int(port))
+    raise ValueError("unknown socket address %s (should start with unix: or tcp:)" % address)
+
+async def open_connection(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    family, host_or_path, port = _parseAddress(address)
+    if family == "unix": return await asyncio.open_unix_connection(host_or_path)
+    return await asyncio.open_connection(host_or_path, port)
+
+async def start_server(client_connected_cb: typing.Callable, address: str) -> asyncio.AbstractServer:
+    family, host_or_path, port = _parseAddress(address)
+    if family == "unix":
+        if os.path.exists(host_or_path): os.remove(host_or_path)  # stale socket from a previous run
+        return await asyncio.start_unix_server(client_connected_cb, host_or_path)
+    return await asyncio.start_server(client_connected_cb, host_or_path, port)
+
+def pack_frame(payload: typing.Union[bytes, str]) -> bytes:
+    if isinstance(payload, str): payload = payload.encode("utf-8")
+    return FRAME_LENGTH.pack(len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int=MAX_FRAME_SIZE) -> bytes:
+    """
+    Raises asyncio.IncompleteReadError once the peer closed the connection,
+    and FrameSizeError if the frame is larger than max_size bytes (before reading it).
+    """
+    header = await reader.readexactly(FRAME_LENGTH.size)
+    size = FRAME_LENGTH.unpack(header)[0]
+    if size > max_size: raise FrameSizeError("frame of %d bytes exceeds the maximum of %d bytes" % (size, max_size))
+    return await reader.readexactly(size)
+
+def hello_frame(capabilities: dict) -> bytes:
+    """First frame sent by both peers to negotiate the wire codec (always plain json)."""
+    return pack_frame(json.dumps({"wire_codecs": capabilities}))
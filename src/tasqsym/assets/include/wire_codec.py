@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import enum
+import json
+import zlib
+import typing
+
+# optional packages, the codec falls back to json / zlib if not installed
+try: import msgpack
+except ImportError: msgpack = None
+try: import cbor2
+except ImportError: cbor2 = None
+try: import zstandard
+except ImportError: zstandard = None
+
+
+# Wire format of the messages between the core and the encoder.
+# A binary frame is FRAME_MAGIC + <serializer id> + <compressor id> + <body>.
+# Any payload not starting with FRAME_MAGIC is a plain json message, so that peers without the codec
+# (and messages sent before the codecs are negotiated) are still understood.
+
+FRAME_MAGIC = b"TQ\x01"
+
+SERIALIZER_IDS = {"json": 0, "msgpack": 1, "cbor": 2}
+COMPRESSOR_IDS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def _toBuiltin(value):
+    """Messages may hold numpy arrays or enums which the serializers do not support as-is."""
+    if hasattr(value, "tolist"): return value.tolist()
+    if isinstance(value, enum.Enum): return value.name
+    raise TypeError("Object of type %s is not serializable" % type(value).__name__)
+
+
+def availableSerializers() -> list[str]:
+    """Serializers installed in this environment in order of preference."""
+    serializers = []
+    if msgpack is not None: serializers.append("msgpack")
+    if cbor2 is not None: serializers.append("cbor")
+    serializers.append("json")
+    return serializers
+
+
+def availableCompressors() -> list[str]:
+    """Compressors installed in this environment in order of preference."""
+    compressors = []
+    if zstandard is not None: compressors.append("zstd")
+    compressors.append("zlib")
+    compressors.append("none")
+    return compressors
+
+
+class WireCodec:
+    """
+    Encodes/decodes messages using the best serializer and compressor supported by both peers.
+    Decoding does not depend on the negotiation result as each frame describes its own format.
+    """
+
+    def __init__(self, preferred: str="", compress_threshold: int=1024):
+        """
+        preferred:          comma separated serializer/compressor names to limit the codecs to (e.g., "msgpack,zlib"),
+                            all installed codecs are used if empty, "json" alone keeps the plain json messages
+        compress_threshold: minimum size in bytes of a serialized message to compress
+        """
+        names = [n.strip() for n in preferred.split(',') if n.strip() != ""]
+        self.serializers = [s for s in availableSerializers() if len(names) == 0 or s in names or s == "json"]
+        self.compressors = [c for c in availableCompressors() if len(names) == 0 or c in names or c == "none"]
+        self.compress_threshold = compress_threshold
+
+        # start with plain json until the capabilities of the peer are known
+        self.serializer = "json"
+        self.compressor = "none"
+
+        self._zstd_compressor = zstandard.ZstdCompressor() if zstandard is not None else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def capabilities(self) -> dict:
+        """Content to announce to the peer."""
+        return {"serializers": self.serializers, "compressors": self.compressors}
+
+    def negotiate(self, peer_capabilities: dict):
+        """
+        Select the codec to send with based on the announced capabilities of the peer.
+        peer_capabilities: the capabilities() of the peer
+        """
+        peer_serializers = peer_capabilities.get("serializers", ["json"])
+        peer_compressors = peer_capabilities.get("compressors", ["none"])
+        self.serializer = next((s for s in self.serializers if s in peer_serializers), "json")
+        self.compressor = next((c for c in self.compressors if c in peer_compressors), "none")
+        print("wire codec set to %s/%s" % (self.serializer, self.compressor))
+
+    def reset(self):
+        """Fall back to plain json (e.g., when the peer is gone)."""
+        self.serializer = "json"
+        self.compressor = "none"
+
+    def encode(self, data: dict) -> typing.Union[bytes, str]:
+        if self.serializer == "json" and self.compressor == "none":
+            return json.dumps(data, default=_toBuiltin)
+
+        if self.serializer == "msgpack": body = msgpack.packb(data, default=_toBuiltin, use_bin_type=True)
+        elif self.serializer == "cbor": body = cbor2.dumps(data, default=lambda _encoder, value: _encoder.encode(_toBuiltin(value)))
+        else: body = json.dumps(data, default=_toBuiltin).encode("utf-8")
+
+        compressor = self.compressor if len(body) >= self.compress_threshold else "none"
+        if compressor == "zstd": body = self._zstd_compressor.compress(body)
+        elif compressor == "zlib": body = zlib.compress(body)
+
+        return FRAME_MAGIC + bytes([SERIALIZER_IDS[self.serializer], COMPRESSOR_IDS[compressor]]) + body
+
+    def decode(self, payload: typing.Union[bytes, str]) -> dict:
+        if isinstance(payload, str) or not payload.startswith(FRAME_MAGIC):
+            return json.loads(payload)
+
+        header_size = len(FRAME_MAGIC)
+        serializer_id, compressor_id = payload[header_size], payload[header_size + 1]
+        body = payload[header_size + 2:]
+
+        if compressor_id == COMPRESSOR_IDS["zstd"]:
+            if self._zstd_decompressor is None: raise ValueError("received zstd frame but zstandard is not installed")
+            body = self._zstd_decompressor.decompress(body)
+        elif compressor_id == COMPRESSOR_IDS["zlib"]: body = zlib.decompress(body)
+        elif compressor_id != COMPRESSOR_IDS["none"]: raise ValueError("unknown compressor id %d" % compressor_id)
+
+        if serializer_id == SERIALIZER_IDS["msgpack"]:
+            if msgpack is None: raise ValueError("received msgpack frame but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        elif serializer_id == SERIALIZER_IDS["cbor"]:
+            if cbor2 is None: raise ValueError("received cbor frame but cbor2 is not installed")
+            return cbor2.loads(body)
+        elif serializer_id == SERIALIZER_IDS["json"]: return json.loads(body)
+        raise ValueError("unknown serializer id %d" % serializer_id)
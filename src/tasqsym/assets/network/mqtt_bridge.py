@@ -3,57 +3,62 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------------------------
 
-import sys
 import json
-import time
-import paho.mqtt.client as mqtt
 import tasqsym.assets.include.load_mqtt_config as load_mqtt_config
+import tasqsym.assets.include.wire_codec as wire_codec
+import tasqsym.assets.include.mqtt_session as mqtt_session
 
 
 class MQTTBridgeOnCore:
 
     def __init__(self, mqtt_envfile: str):
-        self.connected = False
         self.queue = {"run": [], "abort": [], "setup": []}
 
-        self.topic_c2d_command = "tasqsym/c2d/command"
-        self.topic_d2c_feedback = "tasqsym/d2c/feedback"
-
         connection_settings = load_mqtt_config.get_connection_settings(mqtt_envfile)
-        self.mqtt_client = load_mqtt_config.create_mqtt_client(connection_settings)
-
-        self.mqtt_client.on_connect = self.on_connect
-        self.mqtt_client.on_publish = self.on_publish
-        self.mqtt_client.on_subscribe = self.on_subscribe
-        self.mqtt_client.on_message = self.on_message
-        self.mqtt_client.on_disconnect = self.on_disconnect
-        self.mqtt_client.connect(connection_settings['MQTT_HOST_NAME'], connection_settings['MQTT_TCP_PORT'], keepalive=connection_settings["MQTT_KEEP_ALIVE_IN_SECONDS"])
-        self.mqtt_client.loop_start()
-
-        elapsed = 0
-        while not self.connected and elapsed < 5:
-            time.sleep(1.)
-            elapsed += 1
-        if elapsed == 5:
-            print('failed connection timeout')
-            sys.exit(0)
-
-        (_subscribe_result, subscribe_mid) = self.mqtt_client.subscribe(self.topic_c2d_command)
-    def on_connect(self, _client, _userdata, _flags, rc):
-        self.connected = (rc == mqtt.MQTT_ERR_SUCCESS)
-    def on_publish(self, _client, _userdata, mid):
-        print(f"Sent publish with message id {mid}")
-    def on_subscribe(self, _client, _userdata, mid, _granted_qos):
-        print(f"Subscribe for message id {mid} acknowledged by MQTT broker")
+
+        # only receives the commands for this device (MQTT_DEVICE_ID)
+        self.device_id = connection_settings["MQTT_DEVICE_ID"]
+        self.topic_c2d_command = load_mqtt_config.device_topic(self.device_id, "c2d", "command")
+        self.topic_d2c_feedback = load_mqtt_config.device_topic(self.device_id, "d2c", "feedback")
+        self.topic_d2c_telemetry = load_mqtt_config.device_topic(self.device_id, "d2c", "telemetry")
+
+        # capabilities are published as retained messages so that a peer connecting later still receives them
+        self.topic_codecs = load_mqtt_config.device_topic(self.device_id, "d2c", "codecs")
+        self.topic_peer_codecs = "tasqsym/c2d/codecs"  # the server capabilities are shared by all devices
+
+        self.codec = wire_codec.WireCodec(connection_settings["MQTT_WIRE_CODECS"])
+
+        # reconnects and buffers the feedback on broker/network outages instead of exiting
+        self.session = mqtt_session.MQTTSession(
+            connection_settings, [self.topic_c2d_command, self.topic_peer_codecs], self.on_message, self.on_connected,
+            cleared_on_loss=self.topic_codecs)  # so that a crashed core does not leave outdated capabilities
+        self.mqtt_client = self.session.mqtt_client
+        self.session.start()
+
+    @property
+    def connected(self) -> bool: return self.session.connected
+    def on_connected(self):
+        self.session.publish(self.topic_codecs, json.dumps(self.codec.capabilities()), retain=True)
     def on_message(self, _client, _userdata, message):
         print(f"Received message on topic {message.topic} with payload {message.payload}")
-        msg = json.loads(message.payload)
+        if message.topic == self.topic_peer_codecs:
+            if len(message.payload) == 0: self.codec.reset()  # retained capabilities cleared
+            else: self.codec.negotiate(json.loads(message.payload))
+            return
+        msg = self.codec.decode(message.payload)
         self.queue[msg["command"]].append(msg)
-    def on_disconnect(self, _client, _userdata, rc):
-        print("Received disconnect with error='{}'".format(mqtt.error_string(rc)))
 
     async def connect(self): pass
 
-    async def send_feedback(self, data: dict): self.mqtt_client.publish(self.topic_d2c_feedback, json.dumps(data))
+    async def send_feedback(self, data: dict): self.session.publish(self.topic_d2c_feedback, self.codec.encode(data))
+
+    async def send_telemetry(self, data: dict) -> bool:
+        if not self.session.connected: return False  # outdated by the time of reconnection, not buffered
+        self.session.publish(self.topic_d2c_telemetry, self.codec.encode(data), qos=0, buffered=False)
+        return True
+
+    def health(self) -> dict: return self.session.health()
 
-    async def disconnect(self): self.mqtt_client.disconnect()
\ No newline at end of file
+    async def disconnect(self):
+        self.session.clearRetained(self.topic_codecs)  # the last will is not sent on a normal disconnection
+        self.session.stop()
\ No newline at end of file
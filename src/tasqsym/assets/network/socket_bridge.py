@@ -0,0 +1,110 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import time
+import asyncio
+import collections
+import tasqsym.assets.include.stream_transport as stream_transport
+import tasqsym.assets.include.wire_codec as wire_codec
+
+
+class SocketBridgeOnCore:
+    """
+    Same interface as MQTTBridgeOnCore but listens on a Unix domain socket or a TCP loopback port.
+    The server connects to the core, only the latest server connection is served.
+    Feedback sent while no server is connected is buffered (bounded, oldest dropped first) and sent on the next connection,
+    feedback older than buffer_ttl_sec is dropped instead.
+    """
+
+    def __init__(self, envfile: str, buffer_size: int=1000, buffer_ttl_sec: float=60.):
+        """
+        buffer_size:    maximum number of feedback messages to keep while no server is connected
+        buffer_ttl_sec: time to keep a feedback message while no server is connected (no limit if 0)
+        """
+        self.queue = {"run": [], "abort": [], "setup": []}
+
+        socket_settings = stream_transport.get_socket_settings(envfile)
+        self.address = socket_settings["TASQSYM_SOCKET_ADDRESS"]
+        self.codec = wire_codec.WireCodec(socket_settings["TASQSYM_WIRE_CODECS"])
+
+        self.socket_server: asyncio.AbstractServer = None
+        self.writer: asyncio.StreamWriter = None
+        self.telemetry_buffer_limit = 65536  # bytes
+
+        self.buffer_ttl_sec = buffer_ttl_sec
+        self._buffer: collections.deque = collections.deque(maxlen=buffer_size)  # (buffered_time, data)
+
+    async def connect(self):
+        self.socket_server = await stream_transport.start_server(self.on_connect, self.address)
+        print("waiting for the server on %s" % self.address)
+
+    async def on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.writer is not None:
+            print("replacing previous server connection")
+            self.writer.close()
+        self.writer = writer
+        self.codec.reset()
+        writer.write(stream_transport.hello_frame(self.codec.capabilities()))
+        self._replayBuffer(writer)
+
+        try:
+            while True:
+                frame = await stream_transport.read_frame(reader)
+                try: msg = self.codec.decode(frame)
+                except ValueError as e:
+                    print("ignored invalid message from the server: %s" % e)
+                    continue
+                if "wire_codecs" in msg:
+                    self.codec.negotiate(msg["wire_codecs"])
+                    continue
+                print("Received message %s" % msg)
+                if msg.get("command") not in self.queue:
+                    print("ignored message with unknown command %s" % msg.get("command"))
+                    continue
+                self.queue[msg["command"]].append(msg)
+        except stream_transport.FrameSizeError as e:
+            print("closing the server connection: %s" % e)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            print("server disconnected")
+        finally:
+            if self.writer is writer: self.writer = None
+            writer.close()
+
+    async def send_feedback(self, data: dict):
+        if self.writer is None:
+            self._bufferFeedback(data)
+            return
+        writer = self.writer
+        writer.write(stream_transport.pack_frame(self.codec.encode(data)))
+        try: await writer.drain()
+        except ConnectionError:  # lost while sending, sent again on the next connection
+            self._bufferFeedback(data)
+
+    def _bufferFeedback(self, data: dict):
+        if len(self._buffer) == self._buffer.maxlen: print("no server connected, buffer full, dropped oldest feedback")
+        else: print("no server connected, buffered feedback %s" % data.get("id"))
+        self._buffer.append((time.monotonic(), data))
+
+    def _replayBuffer(self, writer: asyncio.StreamWriter):
+        expire_before = time.monotonic() - self.buffer_ttl_sec
+        expired = 0
+        if len(self._buffer) > 0: print("sending %d buffered feedback messages" % len(self._buffer))
+        while len(self._buffer) > 0:
+            buffered_time, data = self._buffer.popleft()
+            if self.buffer_ttl_sec > 0 and buffered_time < expire_before:
+                expired += 1
+                continue
+            writer.write(stream_transport.pack_frame(self.codec.encode(data)))
+        if expired > 0: print("dropped %d buffered feedback messages older than %.0f sec" % (expired, self.buffer_ttl_sec))
+
+    async def send_telemetry(self, data: dict) -> bool:
+        # telemetry is dropped instead of waiting if the server does not keep up
+        if self.writer is None or self.writer.transport.get_write_buffer_size() > self.telemetry_buffer_limit: return False
+        self.writer.write(stream_transport.pack_frame(self.codec.encode(data)))
+        return True
+
+    async def disconnect(self):
+        if self.writer is not None: self.writer.close()
+        if self.socket_server is not None: self.socket_server.close()
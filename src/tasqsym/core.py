@@ -11,12 +11,15 @@ import tasqsym.core.common.constants as tss_constants
 import tasqsym.core.common.structs as tss_structs
 import tasqsym.core.interface.config_loader as config_loader
 import tasqsym.core.interface.blackboard as blackboard
+import tasqsym.core.interface.checkpoint_journal as checkpoint_journal
+import tasqsym.core.interface.telemetry_publisher as telemetry_publisher
 import tasqsym.core.interface.envg_interface as envg_interface
 import tasqsym.core.interface.skill_interface as skill_interface
 import tasqsym.core.bt_decoder as bt_decoder
 
 
-async def distribute_mode(default_tssconfig: str, network_client):
+async def distribute_mode(default_tssconfig: str, network_client, journal: checkpoint_journal.CheckpointJournal=None, resume: bool=False,
+                          telemetry_rate: float=0.):
     global run_tree
 
     await network_client.connect()  # if connection is async
@@ -24,7 +27,7 @@ async def distribute_mode(default_tssconfig: str, network_client):
     envg = envg_interface.EngineInterface()
     rsi = skill_interface.SkillInterface()
     board = blackboard.Blackboard()
-    tsd = bt_decoder.TaskSequenceDecoder(network_client)
+    tsd = bt_decoder.TaskSequenceDecoder(network_client, journal)
 
     async def return_status(msgid, msgtype: str, status: tss_structs.Status):
         print(status.message)
@@ -49,6 +52,7 @@ async def distribute_mode(default_tssconfig: str, network_client):
         command: "run"
         content: <behavior_tree_content>
         node_pointer: <start_node_id_if_any>
+        resume_after: <last_finished_node_id_if_resuming_from_checkpoint>
         ---
         id: <id_of_request_message>
         type: "response"
@@ -74,11 +78,13 @@ async def distribute_mode(default_tssconfig: str, network_client):
             network_client.queue[msg_command] = []  # clean queue
             print("got command %s" % msg_command)
 
-            run_tree = asyncio.create_task(tsd.runTree(msg_details["content"], board, rsi, envg, msg_details["node_pointer"]))
+            run_tree = asyncio.create_task(tsd.runTree(msg_details["content"], board, rsi, envg, msg_details["node_pointer"],
+                                                       resume_after_node_id=msg_details.get("resume_after", [])))
 
             status = await run_tree
             await asyncio.sleep(3)  # to avoid message stuck from cancel
             run_tree = None
+            if msg_details["id"] == "": continue  # resumed from a checkpoint, not requested remotely
             data = {
                 "id": msg_details["id"],
                 "type": "response",
@@ -123,7 +129,7 @@ async def distribute_mode(default_tssconfig: str, network_client):
             await return_status(msg_id, "setup", status)
             return
         print("setup load done!")
-        await return_status(msg_id, "setup", tss_structs.Status(tss_constants.StatusFlags.SUCCESS))
+        await return_status(msg_id, "setup", tss_structs.STATUS_SUCCESS)
 
     async def setup_cb():
         """
@@ -197,6 +203,20 @@ async def distribute_mode(default_tssconfig: str, network_client):
         setup_task = asyncio.create_task(load_config("", configs))
         await setup_task  # regardless of success or not, will continue
 
+    if resume and (journal is not None):
+        checkpoint = journal.loadLastCheckpoint()
+        if checkpoint is not None:
+            print("resuming tree %s after node %s" % (checkpoint.tree_hash, checkpoint.last_node_id))
+            board.loadBoard(checkpoint.board)
+            network_client.queue["run"].append({
+                "id": "", "command": "run", "content": checkpoint.tree,
+                "node_pointer": checkpoint.start_from_node_id, "resume_after": checkpoint.last_node_id
+            })
+
+    if telemetry_rate > 0.:
+        telemetry = telemetry_publisher.TelemetryPublisher(network_client, telemetry_rate)
+        telemetry.start(tsd, rsi, envg)
+
     import signal
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
@@ -206,7 +226,7 @@ async def distribute_mode(default_tssconfig: str, network_client):
     await network_client.disconnect()
 
 
-async def standalone_mode(config_url: str, bt_file: str):
+async def standalone_mode(config_url: str, bt_file: str, journal: checkpoint_journal.CheckpointJournal=None, resume: bool=False):
 
     with open(config_url) as f: configs = json.load(f)
 
@@ -234,12 +254,21 @@ async def standalone_mode(config_url: str, bt_file: str):
     if status.status != tss_constants.StatusFlags.SUCCESS:
         raise Exception("standalone_mode: failed to load engine pipeline!")
 
-    tsd = bt_decoder.TaskSequenceDecoder()
-    with open(bt_file) as f: bt = json.load(f)
+    tsd = bt_decoder.TaskSequenceDecoder(journal=journal)
 
-    run_tree = asyncio.create_task(tsd.runTree(bt, board, rsi, envg))
+    checkpoint = journal.loadLastCheckpoint() if (resume and (journal is not None)) else None
+    if checkpoint is not None:
+        print("resuming tree %s after node %s" % (checkpoint.tree_hash, checkpoint.last_node_id))
+        board.loadBoard(checkpoint.board)
+        run_tree = asyncio.create_task(tsd.runTree(checkpoint.tree, board, rsi, envg, checkpoint.start_from_node_id,
+                                                   resume_after_node_id=checkpoint.last_node_id))
+    else:
+        with open(bt_file) as f: bt = json.load(f)
+        run_tree = asyncio.create_task(tsd.runTree(bt, board, rsi, envg))
     await run_tree
 
+    if journal is not None: await journal.close()
+
 
 if __name__ == "__main__":
 
@@ -247,8 +276,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--credentials", help="credentials file")
     parser.add_argument("--config", default="", help="specify if pre-loading any default config file")
-    parser.add_argument("--connection", help="connection style to TSS (mqtt) will not connect to TSS core if empty", default="standalone")
+    parser.add_argument("--connection", help="connection style to TSS (mqtt or socket) will not connect to TSS core if standalone", default="standalone")
     parser.add_argument("--btfile", help="task sequence to test (required only when running without server connections)", default="")
+    parser.add_argument("--journal", help="file to checkpoint execution progress to (no checkpoints if empty)", default="")
+    parser.add_argument("--resume", action="store_true", help="add if resuming an unfinished sequence from the checkpoint in --journal")
+    parser.add_argument("--telemetry_rate", type=float, default=0., help="rate [Hz] to stream the robot states to the server at (no telemetry if 0)")
     pargs, unknown = parser.parse_known_args()
 
     # flags
@@ -266,12 +298,22 @@ if __name__ == "__main__":
         """
         import tasqsym.assets.network.mqtt_bridge as mqtt_bridge
         network_client = mqtt_bridge.MQTTBridgeOnCore(pargs.credentials)
+    elif pargs.connection == "socket":
+        """
+        below optional in credentials file content:
+        TASQSYM_SOCKET_ADDRESS=  # unix:<path> or tcp:<host>:<port> (default tcp:127.0.0.1:9110)
+        """
+        import tasqsym.assets.network.socket_bridge as socket_bridge
+        network_client = socket_bridge.SocketBridgeOnCore(pargs.credentials)
     elif pargs.connection != "standalone":
         raise Exception("unknown connection style %s" % pargs.connection)
 
+    if pargs.resume and pargs.journal == "": raise Exception("journal cannot be empty if resuming from a checkpoint")
+    journal = checkpoint_journal.CheckpointJournal(pargs.journal) if pargs.journal != "" else None
+
     if decode_only_test:
         if pargs.config == "": raise Exception("config cannot be empty if testing without connections")
-        if pargs.btfile == "": raise Exception("btfile cannot be empty if testing without connections")
-        asyncio.run(standalone_mode(pargs.config, pargs.btfile))
+        if pargs.btfile == "" and not pargs.resume: raise Exception("btfile cannot be empty if testing without connections")
+        asyncio.run(standalone_mode(pargs.config, pargs.btfile, journal, pargs.resume))
     else:
-        asyncio.run(distribute_mode(pargs.config, network_client))
\ No newline at end of file
+        asyncio.run(distribute_mode(pargs.config, network_client, journal, pargs.resume, pargs.telemetry_rate))
\ No newline at end of file
@@ -4,28 +4,35 @@
 # --------------------------------------------------------------------------------------------
 
 import asyncio
-import time
 
 import tasqsym.core.common.constants as tss_constants
 import tasqsym.core.common.structs as tss_structs
 import tasqsym.core.interface.blackboard as blackboard
+import tasqsym.core.interface.checkpoint_journal as checkpoint_journal
 import tasqsym.core.interface.envg_interface as envg_interface
+import tasqsym.core.interface.feedback_sender as feedback_sender
 import tasqsym.core.interface.skill_interface as skill_interface
+import tasqsym.assets.include.message_id as message_id
 
 
 class TaskSequenceDecoder:
 
-    def __init__(self, network_client=None):
+    def __init__(self, network_client=None, journal: checkpoint_journal.CheckpointJournal=None):
 
         # logging
         self.log_last_executed_node_name = ""
         self.log_last_executed_node_id = []
 
         self.network_client = network_client
+        self.journal = journal  # checkpoints progress for crash recovery if set
+
+        # node information is sent in the background, off the node execution path
+        self.feedback_sender = feedback_sender.FeedbackSender(network_client) if network_client is not None else None
 
     async def runTree(self, bt: dict,
                       board: blackboard.Blackboard, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface,
-                      start_from_node_id: list[int]=[], escape_at_node_id: list[int]=[]) -> tss_structs.Status:
+                      start_from_node_id: list[int]=[], escape_at_node_id: list[int]=[],
+                      resume_after_node_id: list[int]=[]) -> tss_structs.Status:
 
         self.log_last_executed_node_name = ""
         self.log_last_executed_node_id = []
@@ -33,20 +40,44 @@ class TaskSequenceDecoder:
         # set start/escape settings if continuing from some node or executing a partial part of the tree
         self.start_from_node_id = start_from_node_id
         self.escape_at_node_id = escape_at_node_id
+        # resuming from a checkpoint skips up to and including the last finished node
+        self.resume_after_node_id = resume_after_node_id
+
+        if self.journal is not None:
+            board.popUpdatedVariables()  # the full board is recorded on begin
+            self.journal.begin(bt, start_from_node_id, resume_after_node_id, board.board)
 
         # the top of the tree can be seen as a single node sequence
         nodes = bt["root"]["BehaviorTree"]["Tree"]
         task = asyncio.create_task(self.runSequence(nodes, board, rsi, envg, [0]))
         status = await task
 
+        # the node to resume after was not in the tree (nothing was run)
+        if len(self.resume_after_node_id) > 0:
+            print("BehaviorTreeControl: node to resume after %s not found in the tree" % self.resume_after_node_id)
+            status = tss_structs.Status(tss_constants.StatusFlags.FAILED, message="node to resume after not found in the tree")
+
         rsi.cleanup()
 
+        # make sure node information arrives before the response sent by the caller
+        if self.feedback_sender is not None: await self.feedback_sender.flush()
+
+        if self.journal is not None:
+            self.journal.end(status.status.name)
+            await self.journal.flush()
+
         return status
 
     async def parseControl(self, node: dict,
                            board: blackboard.Blackboard, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface,
                            node_id: list[int]) -> tss_structs.Status:
 
+        # when starting from or resuming after a node, only the subtrees on the path to the node are entered
+        # others come before the node and are skipped (SKIPPED is neither a success nor a failure to the parent)
+        target_node_id = self.resume_after_node_id if len(self.resume_after_node_id) > 0 else self.start_from_node_id
+        if len(target_node_id) > 0 and node_id != target_node_id[:len(node_id)]:
+            return tss_structs.STATUS_SKIPPED
+
         if "Sequence" in node:
             node_id.append(0)
             task = asyncio.create_task(self.runSequence(node["Sequence"], board, rsi, envg, node_id))
@@ -63,10 +94,9 @@ class TaskSequenceDecoder:
         elif "Node" in node:
             task = asyncio.create_task(self.runNode(node, board, rsi, envg, node_id))
             status = await task
-            if status.status == tss_constants.StatusFlags.SKIPPED: status.status = tss_constants.StatusFlags.SUCCESS  # ok
         else:
             print("BehaviorTreeControl: unknown node in Sequence", node)
-            return tss_structs.Status(tss_constants.StatusFlags.UNEXPECTED)
+            return tss_structs.STATUS_UNEXPECTED
 
         return status
 
@@ -79,9 +109,11 @@ class TaskSequenceDecoder:
         for node in nodes:
             control_node = asyncio.create_task(self.parseControl(node, board, rsi, envg, node_id))
             status = await control_node
-            if status.status != tss_constants.StatusFlags.SUCCESS: return status
+            if (status.status != tss_constants.StatusFlags.SUCCESS) \
+                and (status.status != tss_constants.StatusFlags.SKIPPED):
+                return status
             node_id[-1] += 1
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     async def runFallback(self, nodes: list[dict],
                           board: blackboard.Blackboard, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface,
@@ -96,8 +128,8 @@ class TaskSequenceDecoder:
                 or (status.status == tss_constants.StatusFlags.ABORTED) \
                       or (status.status == tss_constants.StatusFlags.ESCAPED):
                 return status
-            node_id[-1] += 1
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+            node_id[-1] += 1  # failed, or skipped as the node failed before the node to start from / resume after
+        return tss_structs.STATUS_SUCCESS
 
     async def runNode(self, node: dict,
                       board: blackboard.Blackboard, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface,
@@ -108,33 +140,43 @@ class TaskSequenceDecoder:
         # if before specified start node id, skip
         if len(self.start_from_node_id) > 0:
             if len(node_id) != len(self.start_from_node_id):
-                return tss_structs.Status(tss_constants.StatusFlags.SKIPPED)
+                return tss_structs.STATUS_SKIPPED
             for n, num in enumerate(node_id):
                 if num != self.start_from_node_id[n]:
-                    return tss_structs.Status(tss_constants.StatusFlags.SKIPPED)
+                    return tss_structs.STATUS_SKIPPED
             self.start_from_node_id = []  # clear id so that continuing nodes will run
 
+        # if before or at the last node finished before a crash, skip
+        if len(self.resume_after_node_id) > 0:
+            if node_id != self.resume_after_node_id: return tss_structs.STATUS_SKIPPED
+            self.resume_after_node_id = []  # clear id so that continuing nodes will run
+            return tss_structs.STATUS_SUCCESS  # finished before the crash
+
         self.log_last_executed_node_id = node_id
         self.log_last_executed_node_name = node["Node"]
 
         # send information about node-at-execution to server if applicable
-        if self.network_client is not None:
+        if self.feedback_sender is not None:
+            health = self.networkHealth()
+            if not health.get("connected", True):
+                print("network warning: offline for %.1f sec, feedback is buffered until reconnection" % health["offline_sec"])
             if "@node_tag" in node: node_tag = node["@node_tag"]
             else: node_tag = ""
-            await self.network_client.send_feedback({
-                "id": int(time.strftime("%Y%m%d%H%M%S", time.localtime())),
+            self.feedback_sender.push({
+                "id": message_id.newMessageId(),
                 "type": "information",
                 "node_tag": node_tag,
-                "node_pointer": node_id
+                "node_pointer": list(node_id)  # node_id is modified while traversing the tree
             })
 
         # if condition node
         if node["Node"] == "CONDITION":
             print('condition', board.getBoardVariable(node["@variable_name"]))
             if board.getBoardVariable(node["@variable_name"]):
-                return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+                self._checkpoint(node, board, node_id)
+                return tss_structs.STATUS_SUCCESS
             else:
-                return tss_structs.Status(tss_constants.StatusFlags.FAILED)
+                return tss_structs.STATUS_FAILED
 
         # otherwise skill node
         skill_name = node["Node"].lower()
@@ -160,6 +202,8 @@ class TaskSequenceDecoder:
             print(status.message)
             return status
 
+        self._checkpoint(node, board, node_id)
+
         # if this is the specified escape node, escape
         if len(self.escape_at_node_id) > 0:
             if len(node_id) == len(self.escape_at_node_id):
@@ -168,10 +212,19 @@ class TaskSequenceDecoder:
                     if num != self.escape_at_node_id[n]:
                         is_escape_node = False
                         break
-                if is_escape_node: return tss_structs.Status(tss_constants.StatusFlags.ESCAPED)
+                if is_escape_node: return tss_structs.STATUS_ESCAPED
 
         return status
 
+    def networkHealth(self) -> dict:
+        """Connection status reported by the network client (empty if not reported)."""
+        if self.network_client is None or not hasattr(self.network_client, "health"): return {}
+        return self.network_client.health()
+
+    def _checkpoint(self, node: dict, board: blackboard.Blackboard, node_id: list[int]):
+        if self.journal is None: return
+        self.journal.recordNode(node_id, node["Node"], board.popUpdatedVariables())
+
     async def retryUntilSuccessful(self, node: dict,
                                    board: blackboard.Blackboard, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface,
                                    node_id: list[int]) -> tss_structs.Status:
@@ -183,6 +236,7 @@ class TaskSequenceDecoder:
             status = await control_node
             if status.status == tss_constants.StatusFlags.SUCCESS: break
             elif (status.status == tss_constants.StatusFlags.ABORTED) \
-                  or (status.status == tss_constants.StatusFlags.ESCAPED):
+                  or (status.status == tss_constants.StatusFlags.ESCAPED) \
+                    or (status.status == tss_constants.StatusFlags.SKIPPED):
                 return status
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
\ No newline at end of file
+        return tss_structs.STATUS_SUCCESS
\ No newline at end of file
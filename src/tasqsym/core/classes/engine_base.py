@@ -364,7 +364,7 @@ class ControllerEngineBase(EngineBase):
             parent_robot_id = self.sensors[sensor_id].parent_id
             if parent_robot_id in self.robots:
                 return self.robots[parent_robot_id].getLinkTransform(self.sensors[sensor_id].sensor_frame)
-        else: return (tss_structs.Status(tss_constants.StatusFlags.FAILED), tss_structs.Pose())
+        else: return (tss_structs.STATUS_FAILED, tss_structs.Pose())
 
     async def reset(self) -> tss_structs.Status:
         """
@@ -408,9 +408,9 @@ class ControllerEngineBase(EngineBase):
 
         return: success status and sensor data
         """
-        if unique_id not in self.sensors: return (tss_structs.Status(tss_constants.StatusFlags.FAILED), None)
+        if unique_id not in self.sensors: return (tss_structs.STATUS_FAILED, None)
         if self.sensors[unique_id].role != tss_constants.SensorRole.FORCE_6D:
-            return (tss_structs.Status(tss_constants.StatusFlags.FAILED), None)
+            return (tss_structs.STATUS_FAILED, None)
         return self.sensors[unique_id].getPhysicsState(cmd, rest)
 
     def getSceneryState(self, unique_id: str, cmd: str, rest: tss_structs.Data) -> tuple[tss_structs.Status, tss_structs.Data]:
@@ -422,9 +422,9 @@ class ControllerEngineBase(EngineBase):
 
         return: success status and sensor data
         """
-        if unique_id not in self.sensors: return (tss_structs.Status(tss_constants.StatusFlags.FAILED), None)
+        if unique_id not in self.sensors: return (tss_structs.STATUS_FAILED, None)
         if self.sensors[unique_id].role != tss_constants.SensorRole.CAMERA_3D:
-            return (tss_structs.Status(tss_constants.StatusFlags.FAILED), None)
+            return (tss_structs.STATUS_FAILED, None)
         return self.sensors[unique_id].getSceneryState(cmd, rest)
 
 
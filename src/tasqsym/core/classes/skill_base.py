@@ -58,7 +58,7 @@ class SkillAbstract(ABC):
 
         Only use this method if anyInitiationAction() is not null AND some initiation calculation is required after the action. Otherwise use init().
         """
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     @abstractmethod
     def appendTaskSpecificStates(self, observation: dict, envg: envg_interface.EngineInterface, training: bool=False) -> dict:
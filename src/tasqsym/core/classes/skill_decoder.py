@@ -41,7 +41,7 @@ class DecoderAbstract(ABC):
         return: success status
         """
         print("skill decoder warning: fillRuntimeParameters not implemented, assuming no runtime parameters")
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     @abstractmethod
     def asConfig(self) -> dict:
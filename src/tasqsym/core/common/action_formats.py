@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import typing
-import copy
 
 import tasqsym.core.common.constants as tss_constants
 import tasqsym.core.common.structs as tss_structs
@@ -12,18 +11,20 @@ import tasqsym.core.common.structs as tss_structs
 
 class FKAction(tss_structs.RobotAction):
     """Structure to specify the desired forward kinematics goal."""
-    def __init__(self, goal: tss_structs.RobotState, configs={}):
+    __slots__ = ("goal",)
+    def __init__(self, goal: tss_structs.RobotState, configs: typing.Optional[dict]=None):
         """
         goal:    the desired command values to send to the robot
         configs: not recommended for usage
         """
-        super().__init__(tss_constants.SolveByType.FORWARD_KINEMATICS, configs)
-        self.goal = copy.deepcopy(goal)
+        super().__init__(tss_constants.SolveByType.FORWARD_KINEMATICS, {} if configs is None else configs)
+        self.goal = goal.copy()  # joint and pose vectors copied as float64 arrays
 
 class IKAction(tss_structs.RobotAction):
     """Structure to specify the desired inverse kinematics goal."""
+    __slots__ = ("goal", "source_links", "fixed_shape", "context", "start_posture", "end_posture", "posture_rate")
     def __init__(self, goal: tss_structs.Pose, source_links: list[str], fixed_shape: typing.Optional[tss_structs.RobotState]=None,
-                 context: str='', start_posture: str='', end_posture: str='', posture_rate=1.0, configs={}):
+                 context: str='', start_posture: str='', end_posture: str='', posture_rate=1.0, configs: typing.Optional[dict]=None):
         """
         The IKAction is tied to the manipulator robot. However, the source links (control links) are defined in the end-effector robot.
         For all skills other than grasping, the source link should be irrelevant to the shape (joint values) of the end-effector.
@@ -37,10 +38,10 @@ class IKAction(tss_structs.RobotAction):
         posture_rate:  how much to blend posture constraint A and B (optional if using Body Role Division IK)
         configs:       not recommended for usage
         """
-        super().__init__(tss_constants.SolveByType.INVERSE_KINEMATICS, configs)
-        self.goal = copy.deepcopy(goal)
+        super().__init__(tss_constants.SolveByType.INVERSE_KINEMATICS, {} if configs is None else configs)
+        self.goal = goal.copy()
         self.source_links = source_links
-        self.fixed_shape = copy.deepcopy(fixed_shape)
+        self.fixed_shape = None if fixed_shape is None else fixed_shape.copy()
         self.context = context
         self.start_posture = start_posture
         self.end_posture = end_posture
@@ -48,8 +49,9 @@ class IKAction(tss_structs.RobotAction):
 
 class Nav3DAction(tss_structs.RobotAction):
     """Structure to specify the desired navigation goal."""
+    __slots__ = ("pose", "relative_pose", "dest_name", "context", "timeout")
     def __init__(self, pose: tss_structs.Pose, relative_pose: tss_structs.Pose, dest_name: str,
-                 context: str, timeout: float=-1, configs={}):
+                 context: str, timeout: float=-1, configs: typing.Optional[dict]=None):
         """
         The same navigation goal is described in multiple ways (pose, relative_pose, dest_name) as the way of commanding may differ for each system.
         pose:          the desired position and orientation (the base's facing forward direction) in the world coordinate
@@ -59,7 +61,7 @@ class Nav3DAction(tss_structs.RobotAction):
         timeout:       abort task if takes longer than specified seconds (negative indicates infinity)
         configs:       not recommended for usage
         """
-        super().__init__(tss_constants.SolveByType.NAVIGATION3D, configs)
+        super().__init__(tss_constants.SolveByType.NAVIGATION3D, {} if configs is None else configs)
         self.pose = pose
         self.relative_pose = relative_pose
         self.dest_name = dest_name
@@ -68,23 +70,25 @@ class Nav3DAction(tss_structs.RobotAction):
 
 class PointToAction(tss_structs.RobotAction):
     """Structure to specify the desired point-to goal."""
-    def __init__(self, point: tss_structs.Point, source_link: str, context: str, configs={}):
+    __slots__ = ("point", "source_link", "context")
+    def __init__(self, point: tss_structs.Point, source_link: str, context: str, configs: typing.Optional[dict]=None):
         """
         A type of IK action which, instead of providing a desired pose, provides a desired target point a link should point to.
         point:        the position in the world coordinate the source_link should point to
         source_link:  the link which points to the target point
         context:      context may be used to define the pose of the links when performing the pointing action
         """
-        super().__init__(tss_constants.SolveByType.POINT_TO_IK, configs)
+        super().__init__(tss_constants.SolveByType.POINT_TO_IK, {} if configs is None else configs)
         self.point = point
         self.source_link = source_link
         self.context = context
 
 class CommandAction(tss_structs.RobotAction):
     """Structure to specify a goal command."""
-    def __init__(self, commands: dict, configs={}):
+    __slots__ = ("commands",)
+    def __init__(self, commands: dict, configs: typing.Optional[dict]=None):
         """
         commands: goal command
         """
-        super().__init__(tss_constants.SolveByType.CONTROL_COMMAND, configs)
+        super().__init__(tss_constants.SolveByType.CONTROL_COMMAND, {} if configs is None else configs)
         self.commands = commands
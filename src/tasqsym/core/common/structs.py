@@ -5,13 +5,16 @@
 
 from __future__ import annotations
 import enum
+import copy
 import typing
+import functools
 import numpy as np
 
 import tasqsym.core.common.constants as tss_constants
 
 
 class Status:
+    __slots__ = ("status", "reason", "message")
     def __init__(self, status: tss_constants.StatusFlags, reason: tss_constants.StatusReason=tss_constants.StatusReason.NONE, message: str=""):
         """
         status:  success or failure pattern used at sequence control level
@@ -22,6 +25,45 @@ class Status:
         self.reason = reason
         self.message = message
 
+class FrozenStatus(Status):
+    """
+    An immutable status shared between return paths instead of allocating a new Status each time (see the STATUS_* instances below).
+    Create a new Status if the status or message must be modified later.
+    """
+    __slots__ = ()
+    def __init__(self, status: tss_constants.StatusFlags, reason: tss_constants.StatusReason=tss_constants.StatusReason.NONE, message: str=""):
+        object.__setattr__(self, "status", status)
+        object.__setattr__(self, "reason", reason)
+        object.__setattr__(self, "message", message)
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenStatus cannot be modified, create a new Status instead")
+    def __delattr__(self, name):
+        raise AttributeError("FrozenStatus cannot be modified, create a new Status instead")
+    def __reduce__(self):
+        return (FrozenStatus, (self.status, self.reason, self.message))
+    def __copy__(self):
+        return self
+    def __deepcopy__(self, memo):
+        return self
+
+STATUS_SUCCESS = FrozenStatus(tss_constants.StatusFlags.SUCCESS)
+STATUS_SUCCESSFUL_TERMINATION = FrozenStatus(tss_constants.StatusFlags.SUCCESS, tss_constants.StatusReason.SUCCESSFUL_TERMINATION)
+STATUS_FAILED = FrozenStatus(tss_constants.StatusFlags.FAILED)
+STATUS_ABORTED = FrozenStatus(tss_constants.StatusFlags.ABORTED)
+STATUS_UNEXPECTED = FrozenStatus(tss_constants.StatusFlags.UNEXPECTED)
+STATUS_SKIPPED = FrozenStatus(tss_constants.StatusFlags.SKIPPED)
+STATUS_ESCAPED = FrozenStatus(tss_constants.StatusFlags.ESCAPED)
+STATUS_UNKNOWN = FrozenStatus(tss_constants.StatusFlags.UNKNOWN)
+
+def asArray(values) -> np.ndarray:
+    """Return joint or position values as a float64 array (no copy if values already is a float64 array)."""
+    return np.asarray(values, dtype=np.float64)
+
+@functools.lru_cache(maxsize=256)
+def jointIndexMap(joint_names: tuple[str, ...]) -> dict[str, int]:
+    """Return the joint name to vector index map (cached as the joint names of a robot rarely change)."""
+    return {name: i for i, name in enumerate(joint_names)}
+
 class Point(typing.NamedTuple):
     x: float
     y: float
@@ -41,6 +83,10 @@ class Pose(typing.NamedTuple):
     position: Point | list | np.ndarray = Point(0., 0., 0.)
     orientation: Quaternion | list = Quaternion(0., 0., 0., 1.)
 
+    def copy(self) -> Pose:
+        """Return a pose not sharing mutable values (list or array values are copied as float64 arrays)."""
+        return Pose(*(v if v is None or isinstance(v, tuple) else np.array(v, dtype=np.float64) for v in self))
+
 class Data:
     """Data can be any structure generated from a dictionary."""
     def __init__(self, dat: dict):
@@ -50,6 +96,7 @@ class Data:
 
 class RobotAction:
     """A base class to define actions returned by the skills."""
+    __slots__ = ("solveby_type", "configs")
     solveby_type: tss_constants.SolveByType
     configs: dict
     def __init__(self, solveby_type: tss_constants.SolveByType, configs: dict):
@@ -62,6 +109,7 @@ class RobotAction:
 
 class CombinedRobotAction:
     """Class to hold the actions of all robots in the combined robot tree."""
+    __slots__ = ("task", "actions")
     task: str
     actions: dict[str, list[RobotAction]]
     def __init__(self, task: str, actions: dict[str, list[RobotAction]]):
@@ -74,7 +122,8 @@ class CombinedRobotAction:
 
 class RobotState:
     """A base class to store the robot state returned by the controller or to store a desired robot state."""
-    def __init__(self, base_state: Pose, status: Status=Status(tss_constants.StatusFlags.SUCCESS), timesec: float=None):
+    __slots__ = ("base_state", "status", "timesec")
+    def __init__(self, base_state: Pose, status: Status=STATUS_SUCCESS, timesec: float=None):
         """
         base_state: the robot's root link pose in the world coordinate
         status:     whether errors occured when obtaining/generating the state
@@ -84,16 +133,56 @@ class RobotState:
         self.status = status
         self.timesec = timesec
 
+    def copy(self) -> RobotState:
+        """Return a copy not sharing mutable values (cheaper than copy.deepcopy(), vectors are copied as float64 arrays)."""
+        copied = copy.copy(self)
+        if isinstance(self.base_state, Pose): copied.base_state = self.base_state.copy()
+        copied.status = copy.copy(self.status)
+        return copied
+
 class JointStates(typing.NamedTuple):
-    positions:  list[float]
-    velocities: typing.Optional[list[float]]=None
-    efforts:    typing.Optional[list[float]]=None
+    """
+    Joint vectors are float64 arrays when created with fromValues() (the default skills always do so).
+    Adapters may still pass lists, and an array can be passed wherever a sequence of floats is expected (use tolist() if a native list is required).
+    """
+    positions:  np.ndarray | list[float]
+    velocities: typing.Optional[np.ndarray | list[float]]=None
+    efforts:    typing.Optional[np.ndarray | list[float]]=None
     # since just a tuple, can add other fields if needed for custom skills/adapters
 
-class ManipulatorState(RobotState):
+    @classmethod
+    def fromValues(cls, positions, velocities=None, efforts=None) -> JointStates:
+        return cls(asArray(positions),
+                   None if velocities is None else asArray(velocities),
+                   None if efforts is None else asArray(efforts))
+
+    def copy(self) -> JointStates:
+        """Return the joint states with the joint vectors copied as float64 arrays (other fields are shared)."""
+        return self._replace(**{field: np.array(getattr(self, field), dtype=np.float64)
+                                for field in ("positions", "velocities", "efforts") if getattr(self, field) is not None})
+
+class JointedRobotState(RobotState):
+    """A base class of the robot states with joints."""
+    __slots__ = ("joint_names", "joint_states")
+    joint_names:  list[str]
+    joint_states: JointStates
+
+    def getJointPositions(self, names: list[str]) -> np.ndarray:
+        """Return the positions of the named joints in the order of names."""
+        index_map = jointIndexMap(tuple(self.joint_names))
+        return asArray(self.joint_states.positions)[[index_map[n] for n in names]]
+
+    def copy(self) -> JointedRobotState:
+        copied = super().copy()
+        copied.joint_names = list(self.joint_names)
+        if isinstance(self.joint_states, JointStates): copied.joint_states = self.joint_states.copy()
+        return copied
+
+class ManipulatorState(JointedRobotState):
     """Robots of roles Manipulator and MobileManipulator should use this class instead of the RobotState class."""
+    __slots__ = ()
     def __init__(self, joint_names: list[str], joint_states: JointStates, base_state: Pose,
-                 status: Status=Status(tss_constants.StatusFlags.SUCCESS), timesec: float=None):
+                 status: Status=STATUS_SUCCESS, timesec: float=None):
         """
         joint_names:  a list of the robot's joints
         joint_states: the state of each joint corresponding to the joint_names
@@ -105,8 +194,9 @@ class ManipulatorState(RobotState):
         self.joint_names = joint_names
         self.joint_states = joint_states
 
-class EndEffectorState(RobotState):
+class EndEffectorState(JointedRobotState):
     """Robots of roles EndEffector should use this class instead of the RobotState class."""
+    __slots__ = ("base_link_name", "contact_link_names", "contact_link_states")
     class ContactAnnotations(enum.Enum):
         CONTACT_CENTER = 0  # should be the default annotation for most skills
         PALM = 1
@@ -116,8 +206,8 @@ class EndEffectorState(RobotState):
         FINGERTIP_3 = 5
         FINGERTIP_4 = 6
     def __init__(self, joint_names: list[str], joint_states: JointStates, base_link_name: str="", base_state: Pose=Pose(), 
-                 contact_link_names: list[str]=[], contact_annotations: list[EndEffectorState.ContactAnnotations]=[], contact_link_states: list[Pose]=[],
-                 status: Status=Status(tss_constants.StatusFlags.SUCCESS), timesec: float=None):
+                 contact_link_names: list[str]=(), contact_annotations: list[EndEffectorState.ContactAnnotations]=(), contact_link_states: list[Pose]=(),
+                 status: Status=STATUS_SUCCESS, timesec: float=None):
         """
         joint_names:         a list of the robot's joints
         joint_states:        the state of each joint corresponding to the joint_names
@@ -143,11 +233,18 @@ class EndEffectorState(RobotState):
         for i, ca in enumerate(contact_annotations):
             self.contact_link_states[ca] = contact_link_states[i]
 
+    def copy(self) -> EndEffectorState:
+        copied = super().copy()
+        copied.contact_link_names = dict(self.contact_link_names)
+        copied.contact_link_states = {ca: pose.copy() for ca, pose in self.contact_link_states.items()}
+        return copied
+
 class CombinedRobotState:
     """Class to hold the states of all robots in the combined robot tree."""
+    __slots__ = ("robot_states", "status")
     robot_states: dict[str, RobotState]
     status:       Status
-    def __init__(self, robot_states: dict[str, RobotState], status: Status=Status(tss_constants.StatusFlags.UNKNOWN)):
+    def __init__(self, robot_states: dict[str, RobotState], status: Status=STATUS_UNKNOWN):
         """
         robot_states: robot ID and its state
         status:       status should be set to success if none of the robots contain any errors
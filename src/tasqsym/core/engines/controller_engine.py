@@ -72,7 +72,7 @@ class ControllerEngine(ControllerEngineBase):
                 status = self.sensors[sensor["unique_id"]].connect(sensor_info, sensor_configs)
                 if status.status != tss_constants.StatusFlags.SUCCESS: return status
                 # sensor cannot have childs
-                return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+                return tss_structs.STATUS_SUCCESS
 
             robot = config[list(config.keys())[0]]
             if "unique_id" not in robot:
@@ -107,7 +107,7 @@ class ControllerEngine(ControllerEngineBase):
                     status = _loadStructure(child_robot, robot["unique_id"])
                     if status.status != tss_constants.StatusFlags.SUCCESS: return status
 
-            return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+            return tss_structs.STATUS_SUCCESS
 
         for rm in models:
             status = _loadStructure(rm, "")
@@ -115,7 +115,7 @@ class ControllerEngine(ControllerEngineBase):
                 self.cleanup()
                 return status
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     async def updateActualRobotStates(self) -> tss_structs.Status:
@@ -130,12 +130,12 @@ class ControllerEngine(ControllerEngineBase):
         update_task = asyncio.gather(*updates, return_exceptions=False)
         robot_states: list[tss_structs.RobotState] = await update_task
 
-        self.latest_robot_state = tss_structs.CombinedRobotState({}, tss_structs.Status(tss_constants.StatusFlags.SUCCESS))
+        self.latest_robot_state = tss_structs.CombinedRobotState({}, tss_structs.STATUS_SUCCESS)
         for k, rs in enumerate(robot_states):
             self.latest_robot_state.robot_states[unique_ids[k]] = rs
             if rs.status.status != tss_constants.StatusFlags.SUCCESS:
                 print(unique_ids[k], rs.status.message)  # print error message
-                self.latest_robot_state.status = tss_structs.Status(tss_constants.StatusFlags.FAILED)
+                self.latest_robot_state.status = tss_structs.STATUS_FAILED
 
         return self.latest_robot_state.status
 
@@ -195,7 +195,7 @@ class ControllerEngine(ControllerEngineBase):
                 # stop handled externally, requires quick finish, return here
                 return world_format.WorldStruct(
                     world_format.CombinedRobotStruct(
-                        self.latest_robot_state, world_state.combined_robot_state.desired_actions, tss_structs.Status(tss_constants.StatusFlags.ABORTED)),
+                        self.latest_robot_state, world_state.combined_robot_state.desired_actions, tss_structs.STATUS_ABORTED),
                     world_state.component_states)
 
             # aborts should be setup here to avoid 'coroutine never awaited' warnings
@@ -231,4 +231,4 @@ class ControllerEngine(ControllerEngineBase):
 
         self.cleanup()
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
\ No newline at end of file
+        return tss_structs.STATUS_SUCCESS
\ No newline at end of file
@@ -30,11 +30,11 @@ class DataEngine(DataEngineBase):
         else: data = engine_config
 
         for data_name, data_content in data.items(): self.stored_data[data_name] = data_content
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getData(self, cmd: str) -> tuple[tss_structs.Status, dict]:
         if cmd in self.stored_data:
-            return (tss_structs.Status(tss_constants.StatusFlags.SUCCESS), self.stored_data[cmd])
+            return (tss_structs.STATUS_SUCCESS, self.stored_data[cmd])
         else:
             msg = "DataEngine: unknown command %s" % cmd
             return (tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg), {})
@@ -42,7 +42,7 @@ class DataEngine(DataEngineBase):
     def updateData(self, cmd: str, data: dict) -> tss_structs.Status:
         if cmd not in self.stored_data: print("DataEngine warning: storing new data %s" % cmd)
         self.stored_data[cmd] = data
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def save(self) -> tuple[tss_structs.Status, dict]:
         if "export_path" in self.stored_data:
@@ -50,8 +50,8 @@ class DataEngine(DataEngineBase):
                 json.dump(self.stored_data, f, ensure_ascii=False, indent=4)
         else:
             print("DataEngine warning: to save to file, please specify an 'export_path' in the data file.")
-        return (tss_structs.Status(tss_constants.StatusFlags.SUCCESS), self.stored_data)
+        return (tss_structs.STATUS_SUCCESS, self.stored_data)
 
     async def close(self) -> tss_structs.Status:
         # nothing to do
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
\ No newline at end of file
+        return tss_structs.STATUS_SUCCESS
\ No newline at end of file
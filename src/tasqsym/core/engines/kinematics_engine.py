@@ -67,7 +67,7 @@ class KinematicsEngine(KinematicsEngineBase):
                     "sensor_frame": sensor["sensor_frame"]
                 }
                 # sensor cannot have childs
-                return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+                return tss_structs.STATUS_SUCCESS
 
             model_info = {}
 
@@ -133,7 +133,7 @@ class KinematicsEngine(KinematicsEngineBase):
                     status = _loadStructure(child_robot, robot["unique_id"])
                     if status.status != tss_constants.StatusFlags.SUCCESS: return status
 
-            return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+            return tss_structs.STATUS_SUCCESS
 
         for rm in models:
             status = _loadStructure(rm, "")
@@ -141,7 +141,7 @@ class KinematicsEngine(KinematicsEngineBase):
                 self.cleanup()
                 return status
             
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     async def update(self, world_state: world_format.WorldStruct) -> world_format.WorldStruct:
@@ -225,7 +225,7 @@ class KinematicsEngine(KinematicsEngineBase):
                 self.robot_models[unique_id].desired_actions_log[action_type] = latest_commands[unique_id][action_type]
 
         return world_format.WorldStruct(
-            world_format.CombinedRobotStruct(latest_state, desired_actions, tss_structs.Status(tss_constants.StatusFlags.SUCCESS)),
+            world_format.CombinedRobotStruct(latest_state, desired_actions, tss_structs.STATUS_SUCCESS),
             world_state.component_states)
 
 
@@ -233,4 +233,4 @@ class KinematicsEngine(KinematicsEngineBase):
 
         self.cleanup()
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
\ No newline at end of file
+        return tss_structs.STATUS_SUCCESS
\ No newline at end of file
@@ -8,18 +8,30 @@ class Blackboard:
 
     def __init__(self):
         self.board = {}
+        self.updated_keys: set[str] = set()  # variables updated since the last popUpdatedVariables() call
 
     def clearBoard(self):
         self.board = {}
+        self.updated_keys = set()
+
+    def loadBoard(self, values: dict):
+        """Restore variables (e.g., from a checkpoint), restored values are not reported as updates."""
+        self.board.update(values)
 
     def setBoardVariable(self, key: str, value):
         if key == "":
             print("Blackboard: ignoring key as empty string")
             return
         self.board[key] = value
+        self.updated_keys.add(key)
 
     def getBoardVariable(self, key: str):
         if key in self.board: return self.board[key]
         else:
             print("Blackborad: get on unknown variable %s" % key)
-            return None
\ No newline at end of file
+            return None
+
+    def popUpdatedVariables(self) -> dict:
+        updates = {key: self.board[key] for key in self.updated_keys}
+        self.updated_keys = set()
+        return updates
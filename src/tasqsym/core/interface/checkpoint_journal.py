@@ -0,0 +1,161 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import enum
+import json
+import typing
+import asyncio
+import hashlib
+
+
+class Checkpoint(typing.NamedTuple):
+    tree_hash: str
+    tree: dict
+    start_from_node_id: list[int]
+    last_node_id: list[int]  # last node which successfully finished (empty if none)
+    board: dict
+
+
+def _jsonDefault(value):
+    """Blackboard values may hold numpy arrays or custom structs which are not json serializable as-is."""
+    if hasattr(value, "tolist"): return value.tolist()
+    if isinstance(value, enum.Enum): return value.name
+    if hasattr(value, "__dict__"): return value.__dict__
+    if hasattr(value, "__slots__"):
+        return {k: getattr(value, k) for c in type(value).__mro__ for k in getattr(c, "__slots__", ()) if hasattr(value, k)}
+    return repr(value)
+
+
+class CheckpointJournal:
+    """
+    Append-only local journal of the execution progress (node pointer and blackboard changes).
+    Used to resume a behavior tree after the core process dies in the middle of a sequence.
+
+    Records are only queued by the decoder and written to file in batches by a background task,
+    so that file access does not delay the node execution.
+
+    {"event": "begin", "tree_hash": <hash>, "tree": <behavior_tree>, "start_from": <node_id>, "resume_after": <node_id>, "board": <full_board>}
+    {"event": "node", "tree_hash": <hash>, "node_id": <node_id>, "node_name": <name>, "board": <board_delta>}
+    {"event": "end", "tree_hash": <hash>, "status": <code_in_StatusFlags>}
+    """
+
+    def __init__(self, journal_file: str, batch_interval_sec: float=0.05):
+        """
+        journal_file:       file to append the records to
+        batch_interval_sec: time to wait for more records before writing to file
+        """
+        self.journal_file = journal_file
+        self.batch_interval_sec = batch_interval_sec
+
+        self.tree_hash = ""
+
+        self._pending: list[str] = []
+        self._truncate_pending = False
+        self._has_pending: asyncio.Event = None
+        self._idle: asyncio.Event = None
+        self._writer_task: asyncio.Task = None
+
+    @staticmethod
+    def hashTree(bt: dict) -> str:
+        return hashlib.sha256(json.dumps(bt, sort_keys=True, default=_jsonDefault).encode("utf-8")).hexdigest()
+
+    def begin(self, bt: dict, start_from_node_id: list[int], resume_after_node_id: list[int], board: dict):
+        """
+        Start journaling a new tree. Records of any previous tree are dropped as they can no longer be resumed.
+        bt:                   the behavior tree to execute
+        start_from_node_id:   node to start the tree from if any
+        resume_after_node_id: last finished node if resuming from a checkpoint
+        board:                blackboard content at the start of the tree
+        """
+        self.tree_hash = self.hashTree(bt)
+        self._pending = []
+        self._truncate_pending = True
+        self._push({
+            "event": "begin", "tree_hash": self.tree_hash, "tree": bt,
+            "start_from": list(start_from_node_id), "resume_after": list(resume_after_node_id), "board": board
+        })
+
+    def recordNode(self, node_id: list[int], node_name: str, board_delta: dict):
+        """
+        Queue a checkpoint after a node has finished successfully.
+        node_id:     pointer of the finished node
+        node_name:   name of the finished node
+        board_delta: blackboard variables updated since the previous checkpoint
+        """
+        self._push({
+            "event": "node", "tree_hash": self.tree_hash,
+            "node_id": list(node_id), "node_name": node_name, "board": board_delta
+        })
+
+    def end(self, status_name: str):
+        """
+        Mark the tree as finished (finished trees are not resumed).
+        status_name: the final status of the tree
+        """
+        self._push({"event": "end", "tree_hash": self.tree_hash, "status": status_name})
+
+    async def flush(self):
+        """Wait until all queued records are written to file."""
+        if self._writer_task is None: return
+        await self._idle.wait()
+
+    async def close(self):
+        await self.flush()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+
+    def loadLastCheckpoint(self) -> typing.Optional[Checkpoint]:
+        """
+        Read the journal and return the checkpoint of the last tree if it did not finish.
+
+        return: checkpoint or None if there is nothing to resume
+        """
+        if not os.path.exists(self.journal_file): return None
+
+        checkpoint = None
+        with open(self.journal_file, encoding="utf-8") as f:
+            for line in f:
+                try: record = json.loads(line)
+                except json.JSONDecodeError:  # incomplete line if the process died while writing
+                    continue
+                if record["event"] == "begin":
+                    checkpoint = Checkpoint(record["tree_hash"], record["tree"],
+                                            record["start_from"], record["resume_after"], dict(record["board"]))
+                elif checkpoint is None or record["tree_hash"] != checkpoint.tree_hash:
+                    continue
+                elif record["event"] == "node":
+                    checkpoint.board.update(record["board"])
+                    checkpoint = checkpoint._replace(last_node_id=record["node_id"])
+                elif record["event"] == "end":
+                    checkpoint = None
+
+        return checkpoint
+
+    def _push(self, record: dict):
+        if self._writer_task is None:
+            self._has_pending = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._writer_task = asyncio.create_task(self._writerLoop())
+        self._pending.append(json.dumps(record, default=_jsonDefault))
+        self._idle.clear()
+        self._has_pending.set()
+
+    async def _writerLoop(self):
+        while True:
+            await self._has_pending.wait()
+            await asyncio.sleep(self.batch_interval_sec)  # gather records arriving close to each other
+            self._has_pending.clear()
+            lines, truncate = self._pending, self._truncate_pending
+            self._pending, self._truncate_pending = [], False
+            await asyncio.to_thread(self._write, lines, truncate)
+            if len(self._pending) == 0: self._idle.set()
+
+    def _write(self, lines: list[str], truncate: bool):
+        with open(self.journal_file, 'w' if truncate else 'a', encoding="utf-8") as f:
+            for line in lines: f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
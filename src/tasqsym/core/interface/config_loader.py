@@ -43,7 +43,7 @@ class ConfigLoader:
         with open(filename) as f:
             self.robot_structure_config = json.load(f)["robot_structure"]
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def expandSkillLibraryConfig(self, configs: dict) -> tss_structs.Status:
         """
@@ -60,7 +60,7 @@ class ConfigLoader:
         library_module = importlib.import_module(libary_list_module_name)
         self.skill_library_config = library_module.library
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def loadDataEngine(self, configs: dict) -> tss_structs.Status:
         """
@@ -92,7 +92,7 @@ class ConfigLoader:
         self.data_engine: engine_base.DataEngineBase = getattr(engine_module, engine_class)(class_id)
         self.data_engine.load(None, self.robot_structure_config, data_engine_config.get("config", {}))
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def saveUpdateDataEngineSettings(self) -> tss_structs.Status:
         """
@@ -107,7 +107,7 @@ class ConfigLoader:
         if status != tss_constants.StatusFlags.SUCCESS: return status
 
         self.envg_config["data"] = update_settings
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def loadConfigs(self, configs: dict) -> tss_structs.Status:
         """
@@ -148,4 +148,4 @@ class ConfigLoader:
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
         self.envg_config = configs["engines"]
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
\ No newline at end of file
+        return tss_structs.STATUS_SUCCESS
\ No newline at end of file
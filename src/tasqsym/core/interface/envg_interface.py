@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 import copy
+import time
 import importlib
 import asyncio
 
@@ -34,6 +35,8 @@ class EngineInterface:
     physics_sim: engine_base.SimulationEngineBase = None
     rendering_sim: engine_base.SimulationEngineBase = None
 
+    last_update_pipeline_sec: float = 0.  # duration of the last successful update pipeline (for monitoring)
+
 
     def __init__(self):
         pass
@@ -134,7 +137,7 @@ class EngineInterface:
 
 
     def _getEngine(self, ename: str, engine_details: dict) -> tuple[tss_structs.Status, engine_base.EngineBase]:
-        if engine_details is None: return (tss_structs.Status(tss_constants.StatusFlags.SUCCESS), None)
+        if engine_details is None: return (tss_structs.STATUS_SUCCESS, None)
 
         if "engine" not in engine_details:
             msg = "envg config error: 'engines/%s/engine' field required, specify the path.class string" % ename
@@ -151,7 +154,7 @@ class EngineInterface:
         engine_module = importlib.import_module(engine_module)
         engine: engine_base.EngineBase = getattr(engine_module, engine_class)(class_id)
 
-        return (tss_structs.Status(tss_constants.StatusFlags.SUCCESS), engine)
+        return (tss_structs.STATUS_SUCCESS, engine)
 
 
     async def callEnvironmentLoadPipeline(self, world_construct_params: dict={}) -> tss_structs.Status:
@@ -234,7 +237,7 @@ class EngineInterface:
                 if s.status != tss_constants.StatusFlags.SUCCESS:
                     return s
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     async def callEnvironmentUpdatePipeline(self, input_actions: tss_structs.CombinedRobotAction) -> tss_structs.Status:
@@ -245,12 +248,13 @@ class EngineInterface:
         return: success or errors if any
         """
         print("callEnvironmentUpdatePipeline")
+        pipeline_start = time.perf_counter()
 
         world_state = world_format.WorldStruct(
             world_format.CombinedRobotStruct(
                 self.controller_env.getLatestRobotStates(),
                 input_actions,
-                tss_structs.Status(tss_constants.StatusFlags.UNKNOWN)
+                tss_structs.STATUS_UNKNOWN
             ),
             self.latest_component_states)
 
@@ -294,4 +298,5 @@ class EngineInterface:
                 return updated_state.status
 
         self.latest_component_states = copy.deepcopy(updated_state.component_states)
+        self.last_update_pipeline_sec = time.perf_counter() - pipeline_start
         return updated_state.status
@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+import collections
+
+
+class FeedbackSender:
+    """
+    Outbound queue of feedback messages drained by a background task, so that sending never delays the node execution.
+
+    Consecutive "information" messages (node pointer updates) not yet sent are coalesced into the latest one.
+    If the queue is full (e.g., the network is slower than the node execution), the oldest "information" message is dropped.
+    Other messages are never dropped, the queue grows beyond its size if only such messages are waiting.
+    """
+
+    def __init__(self, network_client, max_queue_size: int=64):
+        """
+        network_client: bridge with a send_feedback(data) method
+        max_queue_size: maximum number of messages waiting to be sent
+        """
+        self.network_client = network_client
+        self.max_queue_size = max_queue_size
+
+        self._pending: collections.deque = collections.deque()
+        self._has_pending: asyncio.Event = None
+        self._idle: asyncio.Event = None
+        self._sender_task: asyncio.Task = None
+
+    def push(self, data: dict):
+        """Queue a message to send (does not wait)."""
+        if self._sender_task is None:
+            self._has_pending = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._sender_task = asyncio.create_task(self._senderLoop())
+
+        if data.get("type") == "information" and len(self._pending) > 0 and self._pending[-1].get("type") == "information":
+            self._pending[-1] = data
+        else:
+            if len(self._pending) >= self.max_queue_size: self._dropOldestInformation()
+            self._pending.append(data)
+
+        self._idle.clear()
+        self._has_pending.set()
+
+    def _dropOldestInformation(self):
+        for i, pending in enumerate(self._pending):
+            if pending.get("type") != "information": continue
+            del self._pending[i]
+            print("feedback sender warning: queue full, dropped feedback %s" % pending.get("id"))
+            return
+        print("feedback sender warning: queue full, %d messages waiting" % len(self._pending))
+
+    async def flush(self):
+        """Wait until all queued messages are sent."""
+        if self._sender_task is None: return
+        await self._idle.wait()
+
+    async def close(self):
+        await self.flush()
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            self._sender_task = None
+
+    async def _senderLoop(self):
+        while True:
+            await self._has_pending.wait()
+            self._has_pending.clear()
+            while len(self._pending) > 0:  # send everything queued so far in one go
+                data = self._pending.popleft()
+                try: await self.network_client.send_feedback(data)
+                except Exception as e:  # network errors must not stop later feedback
+                    print("feedback sender warning: failed to send feedback %s: %s" % (data.get("id"), e))
+            if len(self._pending) == 0: self._idle.set()
@@ -26,6 +26,7 @@ class SkillInterface:
     library: dict = None
 
     interrupt_pending: bool = False   # used when skill cannot be interrupted immediately
+    pt: int = 0  # timestep of the running skill
 
     def __init__(self):
         pass
@@ -38,7 +39,7 @@ class SkillInterface:
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
 
         self.library = library
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     def setDecoder(self, skill_name: str) -> tss_structs.Status:
@@ -63,7 +64,7 @@ class SkillInterface:
         decoder_module = importlib.import_module(decoder_path)
         self.decoder = getattr(decoder_module, decoder_class)(configs)
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     def setTask(self, skill_name: str) -> tss_structs.Status:
@@ -86,7 +87,7 @@ class SkillInterface:
         skill_module = importlib.import_module(skill_path)
         self.task = getattr(skill_module, skill_class)(configs)
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
     
 
     def runDecoder(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
@@ -137,7 +138,7 @@ class SkillInterface:
         """
         if self.interrupt_pending:
             self.interrupt_pending = False
-            return tss_structs.Status(tss_constants.StatusFlags.ABORTED)
+            return tss_structs.STATUS_ABORTED
 
         return status
 
@@ -213,9 +214,7 @@ class SkillInterface:
             A skill may explicitly perform a termination action if needed by returning actions using onFinish().
             However, the main purpose of onFinish() is to save 'flags' to the blackboard for continuing tasks.
             """
-            return tss_structs.Status(
-                tss_constants.StatusFlags.SUCCESS, tss_constants.StatusReason.SUCCESSFUL_TERMINATION
-            )
+            return tss_structs.STATUS_SUCCESSFUL_TERMINATION
 
         action_ = self.task.formatAction(action)
 
@@ -234,7 +233,7 @@ class SkillInterface:
             status = await run_action
             return status
         
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
 
     def _getStateVector(self, envg: envg_interface.EngineInterface) -> dict:
@@ -0,0 +1,132 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import time
+import asyncio
+
+import tasqsym.core.common.structs as tss_structs
+import tasqsym.core.interface.envg_interface as envg_interface
+import tasqsym.core.interface.skill_interface as skill_interface
+
+
+def _rounded(values, digits: int) -> list:
+    return [round(float(v), digits) for v in values]
+
+
+def flattenRobotStates(states: tss_structs.CombinedRobotState, digits: int=4) -> dict:
+    """
+    Convert the robot states to flat json-compatible values.
+    Values are rounded so that sensor noise below the precision does not count as a change.
+    """
+    values = {}
+    if states is None: return values
+    for robot_id, state in states.robot_states.items():
+        if state is None: continue
+        if state.base_state is not None:
+            values["robots.%s.base_position" % robot_id] = _rounded(state.base_state.position, digits)
+            values["robots.%s.base_orientation" % robot_id] = _rounded(state.base_state.orientation, digits)
+        if isinstance(state, (tss_structs.ManipulatorState, tss_structs.EndEffectorState)):
+            values["robots.%s.joint_names" % robot_id] = list(state.joint_names)
+            values["robots.%s.joint_positions" % robot_id] = _rounded(state.joint_states.positions, digits)
+    return values
+
+
+def mergeTelemetry(latest: dict, msg: dict) -> dict:
+    """
+    Apply a received telemetry message to the latest known values (for the receiving side).
+    latest: the values merged so far (empty if none)
+    msg:    the telemetry message
+
+    return: the merged values
+    """
+    if msg["keyframe"]: latest = {}
+    latest.update(msg["values"])
+    for key in msg.get("removed", []): latest.pop(key, None)
+    return latest
+
+
+class TelemetryPublisher:
+    """
+    Publishes the live state of the core at a fixed rate, independent from the control loop.
+
+    The values are sampled by a background task (the control loop is never awaited nor slowed down),
+    and only values which changed since the previous message are sent (delta).
+    A keyframe with all values is sent periodically (also when idle) so that late subscribers can catch up.
+    If sending takes longer than the period (e.g., a slow network), samples are skipped instead of queued.
+
+    {"type": "telemetry", "seq": <count>, "time": <unix_time>, "keyframe": true/false, "values": {<key>: <value>}, "removed": [<key>]}
+    keys: node_pointer, skill_timestep, tick_latency_ms, robots.<robot_id>.<base_position|base_orientation|joint_names|joint_positions>
+    """
+
+    def __init__(self, network_client, rate_hz: float=5., keyframe_interval: int=50):
+        """
+        network_client:    bridge with a send_telemetry(data) method (returns False if the message was dropped)
+        rate_hz:           maximum number of messages per second
+        keyframe_interval: send all values every this number of periods
+        """
+        self.network_client = network_client
+        self.period_sec = 1. / rate_hz
+        self.keyframe_interval = keyframe_interval
+
+        self.seq = 0
+        self.periods = 0
+        self.keyframe_pending = False  # the last message was dropped, receivers need all values again
+        self.last_sent: dict = {}
+        self._task: asyncio.Task = None
+
+    def start(self, tsd, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface):
+        """
+        tsd: the TaskSequenceDecoder to observe the node pointer from
+        """
+        if self._task is None: self._task = asyncio.create_task(self._publishLoop(tsd, rsi, envg))
+
+    def stop(self):
+        if self._task is not None: self._task.cancel()
+        self._task = None
+
+    def sample(self, tsd, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface) -> dict:
+        values = {
+            "node_pointer": list(tsd.log_last_executed_node_id),
+            "skill_timestep": rsi.pt if rsi.task is not None else -1,
+            "tick_latency_ms": round(envg.last_update_pipeline_sec * 1000., 1)
+        }
+        if envg.controller_env is not None:
+            values.update(flattenRobotStates(envg.controller_env.getLatestRobotStates()))
+        return values
+
+    def createMessage(self, values: dict) -> dict:
+        """Create the message from the sampled values (None if nothing changed)."""
+        keyframe = (self.periods % self.keyframe_interval == 0) or self.keyframe_pending
+        self.periods += 1
+        if keyframe:
+            delta = values
+            removed = []
+        else:
+            delta = {k: v for k, v in values.items() if self.last_sent.get(k) != v}
+            removed = [k for k in self.last_sent if k not in values]
+            if len(delta) == 0 and len(removed) == 0: return None
+
+        msg = {"type": "telemetry", "seq": self.seq, "time": time.time(), "keyframe": keyframe, "values": delta}
+        if len(removed) > 0: msg["removed"] = removed
+        self.seq += 1
+        self.last_sent = values
+        return msg
+
+    async def _publishLoop(self, tsd, rsi: skill_interface.SkillInterface, envg: envg_interface.EngineInterface):
+        next_time = time.monotonic()
+        while True:
+            try:
+                msg = self.createMessage(self.sample(tsd, rsi, envg))
+                if msg is not None:
+                    delivered = await self.network_client.send_telemetry(msg)
+                    self.keyframe_pending = (delivered is False)
+            except asyncio.CancelledError: raise
+            except Exception as e:  # telemetry must never stop the core
+                print("telemetry warning: %s" % e)
+
+            next_time += self.period_sec
+            now = time.monotonic()
+            if next_time < now: next_time = now + self.period_sec  # sending was slow, skip the missed periods
+            await asyncio.sleep(next_time - now)
@@ -58,12 +58,12 @@ class BringDecoder(skill_decoder.Decoder):
             msg = "bring skill error: @destination parameter in wrong format! please check bring.md for details."
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def fillRuntimeParameters(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
         if self.bring_type != BringDecoder.BringType.COORDINATE_DESTINATION:
             self.decoded = True
-            return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+            return tss_structs.STATUS_SUCCESS
 
         latest_state = envg.controller_env.getLatestRobotStates()
         base_id = envg.kinematics_env.getBaseRobotId()
@@ -107,7 +107,7 @@ class BringDecoder(skill_decoder.Decoder):
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
 
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         """null explicitly indicates no orientation goal, whereas, orientation none just means no goal was set (=use default settings)"""
@@ -145,7 +145,7 @@ class Bring(skill_base.Skill):
 
             # get current end-effector position
             self.source_links, eef_state = tss_utils.getEndEffectorPoseToMaintain(tss_utils.ContactAnnotations.CONTACT_CENTER, envg)
-            pos = np.array(eef_state.position)
+            pos = tss_structs.asArray(eef_state.position)
 
             self.null_orientation_goal = skill_params["null_orientation_goal"]
 
@@ -173,22 +173,20 @@ class Bring(skill_base.Skill):
             rt = [rot, rot]
             div = [self.configs.get("num_segments", int(np.linalg.norm(p_goal - pos) / 0.05) + 1)]
 
-            self.translation_trajectory = []
+            translations = []
             self.rotation_trajectory = []
             for k in range(len(tt) - 1):
-                for i in range(div[k]):
-                    t = float(i+1)/div[k]
-                    tv = [(1-t)*tt[k][0]+t*tt[k+1][0], (1-t)*tt[k][1]+t*tt[k+1][1], (1-t)*tt[k][2]+t*tt[k+1][2]]
-                    self.translation_trajectory.append(copy.deepcopy(tv))
-                    if np.linalg.norm(np.array(rt[k]) - np.array(rt[k+1])) > 0.00001:
-                        rv = tss_math.quaternion_slerp(rt[k], rt[k+1], t)
-                    else:
-                        rv = copy.deepcopy(rt[k+1])
-                    self.rotation_trajectory.append(copy.deepcopy(rv))
+                t = (np.arange(div[k]) + 1.)[:, np.newaxis] / div[k]
+                translations.append((1-t)*tt[k] + t*tt[k+1])
+                if np.linalg.norm(tss_structs.asArray(rt[k]) - tss_structs.asArray(rt[k+1])) > 0.00001:
+                    self.rotation_trajectory += [tss_math.quaternion_slerp(rt[k], rt[k+1], t_) for t_ in t[:, 0]]
+                else:
+                    self.rotation_trajectory += [copy.deepcopy(rt[k+1]) for _ in range(div[k])]
+            self.translation_trajectory = np.concatenate(translations)  # each row is the goal of one timestep
 
         self.context = skill_params["context"]  # for IK hints
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         if self.pose_for_bring is not None:
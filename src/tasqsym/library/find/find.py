@@ -37,7 +37,7 @@ class FindDecoder(skill_decoder.Decoder):
         if "@context" in encoded_params: self.context = encoded_params["@context"]
 
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -67,7 +67,7 @@ class Find(skill_base.Skill):
         if self.pose_for_recognition.status.status != tss_constants.StatusFlags.SUCCESS:
             return self.pose_for_recognition.status.status
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         """
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import typing
-import copy
 import numpy as np
 
 import tasqsym.core.common.constants as tss_constants
@@ -64,7 +63,7 @@ class GraspDecoder(skill_decoder.Decoder):
         """@context could be used as a hint for solving IK, if running recognition method, etc."""
         if "@context" in encoded_params: self.context = encoded_params["@context"]
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def fillRuntimeParameters(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
 
@@ -117,10 +116,10 @@ class GraspDecoder(skill_decoder.Decoder):
         self.goal_position = target_details["position"]
         self.goal_orientation = target_details["orientation"]
 
-        self.expected_start_position = np.array(self.goal_position) - 0.15*np.array(approach_direction)
+        self.expected_start_position = tss_structs.asArray(self.goal_position) - 0.15*tss_structs.asArray(approach_direction)
 
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -150,13 +149,13 @@ class Grasp(skill_base.Skill):
         self.joint_preshape: tss_structs.EndEffectorState = envg.kinematics_env.getConfigurationForTask(self.eef_id, "release", skill_params, eef_state)
         if (self.joint_preshape is None):
             print("grasp skill error: could not find end-effector robot of name %s" % self.eef_id)
-            return tss_structs.Status(tss_constants.StatusFlags.FAILED)
+            return tss_structs.STATUS_FAILED
         self.joint_shape: tss_structs.EndEffectorState = envg.kinematics_env.getConfigurationForTask(self.eef_id, "grasp", skill_params, eef_state)
 
         # specify name of grasp origin
         self.source_links = [eef_state.contact_link_names[ContactAnnotations.CONTACT_CENTER]]
         goal_pose: tss_structs.Pose = skill_params["target_pose"]
-        self.p_robot2goal = np.array(goal_pose.position)
+        self.p_robot2goal = tss_structs.asArray(goal_pose.position)
         # get orientation in robot-specific description
         envg.kinematics_env.generateOrientationTransformPair(self.eef_id, skill_params)  # values may depend on grasp type
         self.q_robot2goal = envg.kinematics_env.getOrientationTransform(
@@ -166,7 +165,7 @@ class Grasp(skill_base.Skill):
 
         self.context = skill_params["context"]  # for IK hints
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def anyInitiationAction(self, envg: envg_interface.EngineInterface) -> typing.Optional[tss_structs.CombinedRobotAction]:
         robot_state = envg.controller_env.getLatestRobotStates()
@@ -193,45 +192,30 @@ class Grasp(skill_base.Skill):
         rot = eef_state.contact_link_states[ContactAnnotations.CONTACT_CENTER].orientation
 
         # values used for creating the reference motion
-        js = [self.joint_preshape.joint_states.positions, self.joint_shape.joint_states.positions]  # preshape and grasp finger configuration
+        js = [tss_structs.asArray(self.joint_preshape.joint_states.positions), tss_structs.asArray(self.joint_shape.joint_states.positions)]  # preshape and grasp finger configuration
         # hand translation
-        ts = [pos, self.p_robot2goal]
+        ts = [tss_structs.asArray(pos), self.p_robot2goal]
 
-        # interpolate between pregrasp and grasp
+        # interpolate between pregrasp and grasp (each row of a trajectory is the goal of one timestep)
         _div = self.configs.get("num_approach_segments", 5)
         _post_iters = self.configs.get("num_grasp_segments", 10)
-        joint_vector_size = len(self.joint_preshape.joint_states.positions)
-        self.joint_trajectory = []
-        self.translation_trajectory = []
-        self.rotation_trajectory = []
-        for i in range(_div):
-            t = float(i+1)/_div
-            jv = [None for x in range(joint_vector_size)]
-            if _div == 1:  # do not close during approach if a single-step approach
-                jv = copy.deepcopy(js[0])
-            else:
-                for j in range(joint_vector_size):
-                    jv[j] = (1-t)*js[0][j] + t*js[1][j]
-            self.joint_trajectory.append(copy.deepcopy(jv))
-            tv = [(1-t)*ts[0][0]+t*ts[1][0], (1-t)*ts[0][1]+t*ts[1][1], (1-t)*ts[0][2]+t*ts[1][2]]
-            self.translation_trajectory.append(copy.deepcopy(tv))
-            rv = copy.deepcopy(rot)
-            self.rotation_trajectory.append(copy.deepcopy(rv))
+        t = (np.arange(_div) + 1.)[:, np.newaxis] / _div
+        if _div == 1:  # do not close during approach if a single-step approach
+            approach_joints = js[0][np.newaxis, :]
+        else:
+            approach_joints = (1-t)*js[0] + t*js[1]
+        approach_translations = (1-t)*ts[0] + t*ts[1]
         # continue grasp for a while
-        for i in range(_post_iters):
-            t = float(i+1)/_post_iters
-            if _div == 1:  # begin grasp here if a single-step approach
-                for j in range(joint_vector_size):
-                    jv[j] = (1-t)*js[0][j] + t*js[1][j]
-            else:
-                jv = self.joint_trajectory[-1]
-            tv = copy.deepcopy(self.translation_trajectory[-1])
-            rv = copy.deepcopy(self.rotation_trajectory[-1])
-            self.joint_trajectory.append(copy.deepcopy(jv))
-            self.translation_trajectory.append(copy.deepcopy(tv))
-            self.rotation_trajectory.append(copy.deepcopy(rv))
-
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        t = (np.arange(_post_iters) + 1.)[:, np.newaxis] / _post_iters
+        if _div == 1:  # begin grasp here if a single-step approach
+            grasp_joints = (1-t)*js[0] + t*js[1]
+        else:
+            grasp_joints = np.repeat(approach_joints[-1:], _post_iters, axis=0)
+        self.joint_trajectory = np.concatenate((approach_joints, grasp_joints))
+        self.translation_trajectory = np.concatenate((approach_translations, np.repeat(approach_translations[-1:], _post_iters, axis=0)))
+        self.rotation_trajectory = [rot for _ in range(len(self.joint_trajectory))]  # rotation is kept the same
+
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {
@@ -243,7 +227,7 @@ class Grasp(skill_base.Skill):
         pt = action["timestep"]
         shape = tss_structs.EndEffectorState(
             self.joint_preshape.joint_names,
-            tss_structs.JointStates(self.joint_trajectory[pt])
+            tss_structs.JointStates(self.joint_trajectory[pt])  # row view of the trajectory (copied by the action)
         )
         return tss_structs.CombinedRobotAction(
             "grasp",
@@ -53,7 +53,7 @@ class LookDecoder(skill_decoder.Decoder):
         if "@context" in encoded_params: self.context = encoded_params["@context"]
 
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -77,7 +77,7 @@ class Look(skill_base.Skill):
 
         self.robot_id = envg.kinematics_env.getFocusSensorParentId(tss_constants.SensorRole.CAMERA_3D)
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {"terminate": (observation["observable_timestep"] == 1)}
@@ -95,7 +95,7 @@ class NavigationDecoder(skill_decoder.Decoder):
 
         self.decoded = True
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -142,11 +142,11 @@ class Navigation(skill_base.Skill):
         elif goal_type == NavigationDecoder.GoalType.RELATIVE_MOVEMENT:
             self.desired_local_movement = tss_structs.Pose(skill_params["destination"], skill_params["orientation"])
             """Calculate the absolute movement command representation in case the controller does not support relative movements."""
-            world_position = np.array(current_base_state.base_state.position) \
-                + tss_math.quat_mul_vec(current_base_state.base_state.orientation, np.array(skill_params["destination"]))
+            world_position = tss_structs.asArray(current_base_state.base_state.position) \
+                + tss_math.quat_mul_vec(current_base_state.base_state.orientation, tss_structs.asArray(skill_params["destination"]))
             world_orientation = tss_math.quaternion_multiply(current_base_state.base_state.orientation, skill_params["orientation"])
             self.desired_world_pose = tss_structs.Pose(world_position, world_orientation)
-            return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)  # always move, no stay check
+            return tss_structs.STATUS_SUCCESS  # always move, no stay check
 
         elif goal_type == NavigationDecoder.GoalType.ABSOLUTE_MOVEMENT:
             if skill_params["orientation"] is None: skill_params["orientation"] = current_base_state.base_state.orientation
@@ -154,7 +154,7 @@ class Navigation(skill_base.Skill):
             """Calculate the relative movement command representation in case the controller does not support absolute movements."""
             relative_position = tss_math.quat_mul_vec(
                 tss_math.quaternion_conjugate(current_base_state.base_state.orientation),
-                np.array(skill_params["destination"]) - np.array(current_base_state.base_state.position))
+                tss_structs.asArray(skill_params["destination"]) - tss_structs.asArray(current_base_state.base_state.position))
             relative_orientation = tss_math.quaternion_multiply(
                 tss_math.quaternion_conjugate(current_base_state.base_state.orientation), skill_params["orientation"])
             self.desired_local_movement = tss_structs.Pose(relative_position, relative_orientation)
@@ -163,10 +163,10 @@ class Navigation(skill_base.Skill):
             self.desired_location_name = skill_params["context"]  # assumes desired location name can be obtained through context
             self.desired_world_pose = None  # not used
             self.desired_local_movement = None  # not used
-            return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+            return tss_structs.STATUS_SUCCESS
 
         # determine whether stay flag should be True
-        p_diff = np.array(self.desired_world_pose.position) - np.array(current_robot_states.robot_states[self.base_robot_id].base_state.position)
+        p_diff = tss_structs.asArray(self.desired_world_pose.position) - tss_structs.asArray(current_robot_states.robot_states[self.base_robot_id].base_state.position)
         if self.navigation_2d: p_diff[2] = 0.0
         p_diff = np.linalg.norm(p_diff)
         q_diff = tss_math.quaternion_multiply(
@@ -175,7 +175,7 @@ class Navigation(skill_base.Skill):
         q_diff = 2*np.arccos(max(min(q_diff[3], 1.0), -1.0))  # avoid float error
         self.stay = (p_diff < self.stay_position_tolerance) and (q_diff < self.stay_orientation_tolerance)
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import typing
-import copy
 import numpy as np
 
 import tasqsym.core.common.constants as tss_constants
@@ -33,7 +32,7 @@ class PickDecoder(skill_decoder.Decoder):
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
         self.detach_direction = encoded_params["@detach_direction"]
         if "@context" in encoded_params: self.context = encoded_params["@context"]
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def fillRuntimeParameters(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
         # detach direction is a runtime parameter as detach direction is w.r.t. current body orientation
@@ -43,7 +42,7 @@ class PickDecoder(skill_decoder.Decoder):
         root_orientation = body_state.base_state.orientation
         self.detach_direction = tss_math.quat_mul_vec(root_orientation, self.detach_direction)
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -65,23 +64,20 @@ class Pick(skill_base.Skill):
         self.robot_id = envg.kinematics_env.getFocusEndEffectorParentId()
         if self.robot_id == "":
             print("pick skill error: tried to trigger skill but no target end-effector set!")
-            return tss_structs.Status(tss_constants.StatusFlags.FAILED)
+            return tss_structs.STATUS_FAILED
 
         self.source_links, eef_state = tss_utils.getEndEffectorPoseToMaintain(tss_utils.ContactAnnotations.CONTACT_CENTER, envg)
         self.eef_rot = eef_state.orientation
         pos = eef_state.position
 
         _div = self.configs.get("num_segments", int(distance/0.05) + 1)
-        ts = [np.array(pos), np.array(pos) + np.array(detach_direction)]
-        self.translation_trajectory = []
-        for i in range(_div):
-            t = float(i+1)/_div
-            tv = [(1-t)*ts[0][0]+t*ts[1][0], (1-t)*ts[0][1]+t*ts[1][1], (1-t)*ts[0][2]+t*ts[1][2]]
-            self.translation_trajectory.append(copy.deepcopy(tv))
+        ts = [tss_structs.asArray(pos), tss_structs.asArray(pos) + tss_structs.asArray(detach_direction)]
+        t = (np.arange(_div) + 1.)[:, np.newaxis] / _div
+        self.translation_trajectory = (1-t)*ts[0] + t*ts[1]  # each row is the goal of one timestep
 
         self.context = skill_params["context"]  # for IK hints
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import typing
-import copy
 import numpy as np
 
 import tasqsym.core.common.constants as tss_constants
@@ -33,7 +32,7 @@ class PlaceDecoder(skill_decoder.Decoder):
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
         self.attach_direction = encoded_params["@attach_direction"]
         if "@context" in encoded_params: self.context = encoded_params["@context"]
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def fillRuntimeParameters(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
         # attach direction is a runtime parameter as detach direction is w.r.t. current body orientation
@@ -43,7 +42,7 @@ class PlaceDecoder(skill_decoder.Decoder):
         root_orientation = body_state.base_state.orientation
         self.attach_direction = tss_math.quat_mul_vec(root_orientation, self.attach_direction)
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -71,7 +70,7 @@ class Place(skill_base.Skill):
         self.robot_id = envg.kinematics_env.getFocusEndEffectorParentId()
         if self.robot_id == "":
             print("place skill error: tried to trigger skill but no target end-effector set!")
-            return tss_structs.Status(tss_constants.StatusFlags.FAILED)
+            return tss_structs.STATUS_FAILED
 
         envg.kinematics_env.setSensor(tss_constants.SensorRole.FORCE_6D, "place", skill_params)
         self.sensor_id = envg.kinematics_env.getFocusSensorId(tss_constants.SensorRole.FORCE_6D)
@@ -81,35 +80,28 @@ class Place(skill_base.Skill):
         self.eef_rot = eef_state.orientation
         pos = eef_state.position
 
-        p_preplace = np.array(pos) + v_approach
-        ts = [np.array(pos), p_preplace, p_preplace]
-        # interpolate between preplace and place
-        self.raw_translation = []
-        for i in range(div):
-            t = float(i+1)/div
-            if np.linalg.norm(v_approach) < 0.02:
-                tv = [ts[0][0], ts[0][1], ts[0][2]]
-            elif i < div-1:
-                tv = [(1-t)*ts[0][0]+t*ts[1][0], (1-t)*ts[0][1]+t*ts[1][1], (1-t)*ts[0][2]+t*ts[1][2]]
-            else:
-                tv = [ts[1][0], ts[1][1], ts[1][2]]
-            self.raw_translation.append(tv)
+        p_preplace = tss_structs.asArray(pos) + v_approach
+        ts = [tss_structs.asArray(pos), p_preplace, p_preplace]
+        # interpolate between preplace and place (each row is the goal of one timestep)
+        if np.linalg.norm(v_approach) < 0.02:
+            approach = np.repeat(ts[0][np.newaxis, :], div, axis=0)
+        else:
+            t = (np.arange(div) + 1.)[:, np.newaxis] / div
+            approach = (1-t)*ts[0] + t*ts[1]
 
         # place
         post_iters = 100  # number of max iterations to try to detect a "placed" feedback
-        for i in range(post_iters+1):
-            tv = copy.deepcopy(self.raw_translation[-1])
-            self.raw_translation.append(tv)
+        self.raw_translation = np.concatenate((approach, np.repeat(approach[-1:], post_iters+1, axis=0)))
 
         self.context = skill_params["context"]  # for IK hints
 
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def anyInitiationAction(self, envg: envg_interface.EngineInterface) -> typing.Optional[tss_structs.CombinedRobotAction]:
         return None
 
     def anyPostInitation(self, envg: envg_interface.EngineInterface) -> tss_structs.Status:
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def appendTaskSpecificStates(self, observation: dict, envg: envg_interface.EngineInterface, training: bool=False) -> dict:
         sensor_definitions = tss_structs.Data({})  # no parameters as highly-dependent on each sensor
@@ -140,7 +132,7 @@ class Place(skill_base.Skill):
             If used relative goals, there is a chance that the arm position oscillates at a position (due to poor control on small movement),
             thus, never getting close to the target plane.
             """
-            tv = np.array(tv) + action["velocity_direction_deviation"]*self.velocity_direction  # move closer toward plane
+            tv = tv + action["velocity_direction_deviation"]*self.velocity_direction  # move closer toward plane
         print(tv)
         return tss_structs.CombinedRobotAction(
             "place",
@@ -19,7 +19,7 @@ class PrepareDecoder(skill_decoder.Decoder):
 
     def decode(self, encoded_params: dict, board: blackboard.Blackboard) -> tss_structs.Status:
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {}  # no configs returned
@@ -33,7 +33,7 @@ class Prepare(skill_base.Skill):
     def init(self, envg: envg_interface.EngineInterface, skill_params: dict) -> tss_structs.Status:
         rs = envg.controller_env.getLatestRobotStates()
         self.robot_ids = rs.robot_states.keys()
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import typing
-import copy
 import numpy as np
 
 import tasqsym.core.common.constants as tss_constants
@@ -36,7 +35,7 @@ class ReleaseDecoder(skill_decoder.Decoder):
             msg = "release skill error: @depart_direction parameter cannot be of size 0 or smaller than 1[mm]!"
             return tss_structs.Status(tss_constants.StatusFlags.FAILED, message=msg)
         if "@context" in encoded_params: self.context = encoded_params["@context"]
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def fillRuntimeParameters(self, encoded_params: dict, board: blackboard.Blackboard, envg: envg_interface.EngineInterface) -> tss_structs.Status:
         base_robot_id = envg.kinematics_env.getBaseRobotId()
@@ -45,7 +44,7 @@ class ReleaseDecoder(skill_decoder.Decoder):
         root_orientation = body_state.base_state.orientation
         self.depart_direction = tss_math.quat_mul_vec(root_orientation, self.depart_direction)
         self.decoded = True
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def asConfig(self) -> dict:
         return {
@@ -64,7 +63,7 @@ class Release(skill_base.Skill):
         depart_direction = skill_params["depart_direction"]
 
         d = 0.15  # constant distance to avoid finger-object collision
-        depart_direction = d/np.linalg.norm(depart_direction) * np.array(depart_direction)
+        depart_direction = d/np.linalg.norm(depart_direction) * tss_structs.asArray(depart_direction)
 
         self.eef_id = envg.kinematics_env.getFocusEndEffectorRobotId()
         if self.eef_id == "":
@@ -79,37 +78,27 @@ class Release(skill_base.Skill):
         joint_postshape: tss_structs.EndEffectorState = envg.kinematics_env.getConfigurationForTask(self.eef_id, "release", skill_params, eef_state)
         if (joint_postshape is None):
             print("release skill error: could not find end-effector robot of name %s" % self.eef_id)
-            return tss_structs.Status(tss_constants.StatusFlags.FAILED)
+            return tss_structs.STATUS_FAILED
         latest_state = envg.controller_env.getLatestRobotStates()
         current_eef_state: tss_structs.EndEffectorState = latest_state.robot_states[self.eef_id]
         self.joint_shape = current_eef_state
 
         # note, joint_shape will usually loosen the gripper a bit as looser than commanded joints
-        js = [self.joint_shape.joint_states.positions, joint_postshape.joint_states.positions]
-        ts = [np.array(pos), np.array(pos) + depart_direction]
+        js = [tss_structs.asArray(self.joint_shape.joint_states.positions), tss_structs.asArray(joint_postshape.joint_states.positions)]
+        ts = [tss_structs.asArray(pos), tss_structs.asArray(pos) + depart_direction]
 
+        # release then depart (each row of a trajectory is the goal of one timestep)
         _div1 = self.configs.get("num_release_segments", 3)
         _div2 = self.configs.get("num_depart_segments", 3)
-        joint_vector_size = len(self.joint_shape.joint_states.positions)
-        self.joint_trajectory = []
-        self.translation_trajectory = []
-        for i in range(_div1):
-            t = float(i+1)/_div1
-            jv = [None for x in range(joint_vector_size)]
-            for j in range(joint_vector_size):
-                jv[j] = (1-t)*js[0][j] + t*js[1][j]
-            self.joint_trajectory.append(copy.deepcopy(jv))
-            tv = copy.deepcopy(ts[0])
-            self.translation_trajectory.append(copy.deepcopy(tv))
-        for i in range(_div2):
-            self.joint_trajectory.append(copy.deepcopy(self.joint_trajectory[-1]))
-            t = float(i+1)/_div2
-            tv = [(1-t)*ts[0][0]+t*ts[1][0], (1-t)*ts[0][1]+t*ts[1][1], (1-t)*ts[0][2]+t*ts[1][2]]
-            self.translation_trajectory.append(copy.deepcopy(tv))
+        t = (np.arange(_div1) + 1.)[:, np.newaxis] / _div1
+        release_joints = (1-t)*js[0] + t*js[1]
+        t = (np.arange(_div2) + 1.)[:, np.newaxis] / _div2
+        self.joint_trajectory = np.concatenate((release_joints, np.repeat(release_joints[-1:], _div2, axis=0)))
+        self.translation_trajectory = np.concatenate((np.repeat(ts[0][np.newaxis, :], _div1, axis=0), (1-t)*ts[0] + t*ts[1]))
 
         self.context = skill_params["context"]  # for IK hints
         
-        return tss_structs.Status(tss_constants.StatusFlags.SUCCESS)
+        return tss_structs.STATUS_SUCCESS
 
     def getAction(self, observation: dict) -> dict:
         return {
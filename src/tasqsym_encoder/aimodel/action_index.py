@@ -0,0 +1,129 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Action definitions compiled to an index for mapping the DSL node arguments.
+
+The arguments of an action/condition are either listed by name (int if the value reads as one, otherwise a string):
+    "Arguments": ["@target", "@side"]
+or mapped to a type (auto, str, int, float, bool or list, auto infers int, float or bool from the values):
+    "Arguments": {"@target": "str", "@distance": "float", "@waypoints": "list"}
+"""
+
+import json
+import typing
+import warnings
+
+
+def _unquote(raw: str) -> str:
+    return raw.strip('"')
+
+
+def coerce_auto(raw: str):
+    """Quoted values are strings, otherwise int, float or bool if the value reads as one."""
+    if raw.startswith('"'): return _unquote(raw)
+    for convert in (int, float):
+        try: return convert(raw)
+        except ValueError: pass
+    if raw.lower() in ("true", "false"): return raw.lower() == "true"
+    return raw
+
+
+def coerce_untyped(raw: str):
+    """Arguments listed without types: int if the value reads as one, otherwise the unquoted string."""
+    try: return int(raw)
+    except ValueError: return _unquote(raw)
+
+
+def coerce_str(raw: str) -> str: return _unquote(raw)
+
+def coerce_int(raw: str) -> int: return int(_unquote(raw))
+
+def coerce_float(raw: str) -> float: return float(_unquote(raw))
+
+def coerce_bool(raw: str) -> bool:
+    value = _unquote(raw).strip().lower()
+    if value in ("true", "yes", "1"): return True
+    if value in ("false", "no", "0"): return False
+    raise ValueError("not a boolean: %s" % raw)
+
+def coerce_list(raw: str) -> list:
+    """A json list or comma separated values (e.g., "[0.1, 0.2]" or "a, b")."""
+    value = _unquote(raw).strip()
+    if value.startswith('['): return json.loads(value)
+    return [coerce_auto(item.strip()) for item in value.split(',') if item.strip() != ""]
+
+
+COERCERS: dict[str, typing.Callable] = {
+    "auto": coerce_auto,
+    "str": coerce_str,
+    "int": coerce_int,
+    "float": coerce_float,
+    "bool": coerce_bool,
+    "list": coerce_list
+}
+
+
+class ActionIndex:
+    """(node type, name) -> ordered list of (argument name, argument type, coercer)."""
+
+    def __init__(self, action_definitions: dict):
+        self.signatures: dict[tuple[str, str], list[tuple[str, str, typing.Callable]]] = {}
+        for node_type, definitions_key in (("action", "Actions"), ("condition", "Conditions")):
+            for definition in action_definitions.get(definitions_key, []):
+                key = (node_type, definition["Name"])
+                if key in self.signatures: continue  # first definition wins
+                arguments = definition.get("Arguments", [])
+                if not isinstance(arguments, dict):
+                    self.signatures[key] = [(arg_name, "untyped", coerce_untyped) for arg_name in arguments]
+                    continue
+                signature = []
+                for arg_name, arg_type in arguments.items():
+                    if arg_type not in COERCERS:
+                        warnings.warn("unknown type %s of %s in %s, inferring from the values" % (arg_type, arg_name, definition["Name"]))
+                        arg_type = "auto"
+                    signature.append((arg_name, arg_type, COERCERS[arg_type]))
+                self.signatures[key] = signature
+
+    def get(self, node_type: str, name: str) -> list[tuple[str, str, typing.Callable]]:
+        """return: the arguments of the action/condition, None if not defined"""
+        return self.signatures.get((node_type, name))
+
+    def map_arguments(self, node_type: str, name: str, raw_args: list[str]) -> dict:
+        """
+        node_type: action or condition
+        name:      action/condition name
+        raw_args:  argument values as written in the DSL (strings may be quoted)
+
+        return: argument name -> coerced value, None if the action/condition is not defined
+        """
+        signature = self.get(node_type, name)
+        if signature is None: return None
+        if len(raw_args) > len(signature):
+            warnings.warn("%s %s takes %d arguments, ignored the extra %d" % (node_type, name, len(signature), len(raw_args) - len(signature)))
+        mapped = {}
+        for (arg_name, arg_type, coerce), raw in zip(signature, raw_args):
+            raw = raw.strip()
+            try: mapped[arg_name] = coerce(raw)
+            except ValueError:
+                warnings.warn("%s of %s is not a valid %s: %s" % (arg_name, name, arg_type, raw))
+                mapped[arg_name] = _unquote(raw)
+        return mapped
+
+
+_indices: dict[int, tuple[dict, ActionIndex]] = {}  # id of the definitions -> (definitions, index)
+
+
+def get_index(action_definitions: dict) -> ActionIndex:
+    """
+    Index of the action definitions, compiled once per definitions object.
+    The definitions are expected not to be modified after the first call (e.g., shared from prompt_assets).
+    """
+    entry = _indices.get(id(action_definitions))
+    if entry is not None and entry[0] is action_definitions: return entry[1]
+    if len(_indices) >= 16: _indices.pop(next(iter(_indices)))  # remove the oldest
+    index = ActionIndex(action_definitions)
+    _indices[id(action_definitions)] = (action_definitions, index)  # keeping the reference also keeps the id unique
+    return index
@@ -8,15 +8,42 @@ import openai
 import tiktoken
 import json
 import os
-import re
 import time
-import regex
+import random
+import asyncio
+import typing
 import warnings
+import functools
+import hashlib
+import importlib
 from collections import OrderedDict
+import tasqsym_encoder.aimodel.offline_client as offline_client
+import tasqsym_encoder.aimodel.prompt_assets as prompt_assets
+import tasqsym_encoder.aimodel.dsl_parser as dsl_parser
+import tasqsym_encoder.aimodel.action_index as action_index
+import tasqsym_encoder.aimodel.response_cache as response_cache
+import tasqsym_encoder.aimodel.rate_limiter as rate_limiter
+import tasqsym_encoder.aimodel.encode_context as encode_context
+import tasqsym_encoder.artifact_writer as artifact_writer
 
 
 enc = tiktoken.get_encoding("cl100k_base")  
 
+@functools.lru_cache(maxsize=1024)
+def count_tokens(text: str) -> int:
+    """Number of tokens of a message (cached, the prompt texts are shared among the sessions and turns)."""
+    return len(enc.encode(text))
+
+
+_shared_clients: dict[tuple, typing.Any] = {}  # (service, endpoint, key, ...) -> client
+
+
+def _get_shared_client(key: tuple, create: typing.Callable) -> typing.Any:
+    """The sessions of the process use the same client (and its pool of connections) per endpoint and key."""
+    if key not in _shared_clients: _shared_clients[key] = create()
+    return _shared_clients[key]
+
+
 class AIModel(ABC):
 
     # please define in child class before calling __init__()
@@ -28,98 +55,93 @@ class AIModel(ABC):
 
     world: dict = {}  # please define compile_world() to fill in content
 
+    shared_response_cache: response_cache.ResponseCache = None  # set to reuse responses for the same instruction and world (shared among sessions)
+    shared_artifact_writer: artifact_writer.ArtifactWriter = None  # set to write the prompt logs in the background (to its directory instead of logdir)
+
+    # when streaming, the response is complete once the ```python block closes as format_response() only reads the block
+    # set False if the format_response() of the child class reads the text after the block
+    stream_until_code_block: bool = True
+
     def __init__(self, credentials: dict, use_azure: bool=True, logdir: str='', use_mini: bool=False):
         self.use_azure = use_azure
         self.use_mini = use_mini
         self.logdir = logdir  # log AOAI outputs if not an empty string
-        if self.use_azure:
-            self.api_version = "2024-02-01"
-            self.client = openai.AzureOpenAI(
-                # cf. https://learn.microsoft.com/en-us/azure/ai-services/openai/reference#rest-api-versioning
-                api_version=self.api_version,
-                # cf. https://learn.microsoft.com/en-us/azure/cognitive-services/openai/how-to/create-resource?pivots=web-portal#create-a-resource
-                azure_endpoint = credentials["AZURE_OPENAI_ENDPOINT_GPT4OMINI"] if self.use_mini else credentials["AZURE_OPENAI_ENDPOINT"],
-                api_key = credentials["AZURE_OPENAI_KEY_GPT4OMINI"] if self.use_mini else credentials["AZURE_OPENAI_KEY"]
-            )            
-        else:
-            self.client = openai.OpenAI(
-                api_key = credentials["OPENAI_API_KEY"]
-            )
+        self.api_version = "2024-02-01"
+        backend = credentials.get("LLM_BACKEND") or ""
+        offline = (backend == "offline")
+        self.client, limiter_key = self._create_client(backend, credentials)
+        # the quota is per deployment, shared by all sessions of the process (no limits by default for the offline backend)
+        self.rate_limiter = rate_limiter.get_limiter(
+            limiter_key,
+            requests_per_minute=float(credentials.get("LLM_REQUESTS_PER_MINUTE") or (0 if offline else 60)),
+            tokens_per_minute=float(credentials.get("LLM_TOKENS_PER_MINUTE") or 0),
+            max_concurrency=int(credentials.get("LLM_MAX_CONCURRENCY") or (0 if offline else 8)))
         self.credentials = credentials
         self.messages = []
         self.max_token_length = 8000
         self.max_completion_length = 1000
         self.query = ''
         self.instruction = ''
+        self.cache_key = None  # response cache entry of the last generate()
         self.current_time = time.time()
-        self.waittime_sec = 5
-        self.time_api_called = time.time() - self.waittime_sec
         self.retry_count_tolerance = 10
+        self.record_file = credentials.get("LLM_RECORD_FILE") or ""  # completions to replay with the offline backend
 
-        # load prompt file
+        # load prompt file (shared among the sessions, read from disk only once per process or if modified)
         fp_system = os.path.join(self.dir_system, 'system.txt')
-        with open(fp_system) as f:
-            data = f.read()
-        self.system_message = {"role": "system", "content": data}
-
-        for prompt_name in self.prompt_load_order:
-            fp_prompt = os.path.join(self.dir_prompt, prompt_name + '.txt')
-            with open(fp_prompt) as f:
-                data = f.read()
-                # insert the action definitions loaded from file to the action prompt
-                if data.find('ACTION_DEFINITIONS_PLACEHOLDER') != -1:  # only enters for action prompt
-                    with open(self.action_definitions_file, 'r') as file:
-                        action_definitions = file.read()
-                    data = data.replace('ACTION_DEFINITIONS_PLACEHOLDER', action_definitions)
-            data_split = re.split(r'\[user\]\n|\[assistant\]\n', data)
-            data_split = [item for item in data_split if len(item) != 0]
-            # messages start with "user" and ends with "system"
-            assert len(data_split) % 2 == 0
-            for i, item in enumerate(data_split):
-                if i % 2 == 0: self.messages.append({"sender": "user", "text": item})
-                else: self.messages.append({"sender": "assistant", "text": item})
+        self.system_message = {"role": "system", "content": prompt_assets.read_text(fp_system)}
+
+        self.reset_history()
 
         fp_query = os.path.join(self.dir_query, 'query.txt')
-        with open(fp_query) as f:
-            self.query = f.read()
+        self.query = prompt_assets.read_text(fp_query)
 
     def reset_history(self): # clear the conversation history and reset the prompt
-        self.messages = []
-        for prompt_name in self.prompt_load_order:
-            fp_prompt = os.path.join(self.dir_prompt, prompt_name + '.txt')
-            with open(fp_prompt) as f:
-                data = f.read()
-                if data.find('ACTION_DEFINITIONS_PLACEHOLDER') != -1:  # only enters for action prompt
-                    with open(self.action_definitions_file, 'r') as file:
-                        action_definitions = file.read()
-                    data = data.replace('ACTION_DEFINITIONS_PLACEHOLDER', action_definitions)
-            data_split = re.split(r'\[user\]\n|\[assistant\]\n', data)
-            data_split = [item for item in data_split if len(item) != 0]
-            # messages start with "user" and ends with "system"
-            assert len(data_split) % 2 == 0
-            for i, item in enumerate(data_split):
-                if i % 2 == 0: self.messages.append({"sender": "user", "text": item})
-                else: self.messages.append({"sender": "assistant", "text": item})
+        # the prompt messages are shared among the sessions and only read, appended messages belong to this session
+        self.messages = list(prompt_assets.load_prompt_messages(self.dir_prompt, self.prompt_load_order, self.action_definitions_file))
+        self.dialog_tokens = 0  # tokens of the messages after the prompt files (updated on append/eviction)
+
+        # the system and prompt file messages are pinned, only the dialog after them is evicted when over budget
+        self.num_pinned_messages = len(self.messages)
+        self.pinned_tokens = count_tokens(self.system_message["content"]) + sum(count_tokens(m["text"]) for m in self.messages)
+
+    def _append_message(self, sender: str, text: str):
+        self.messages.append({"sender": sender, "text": text})
+        self.dialog_tokens += count_tokens(text)
 
 
     """Functions to get results from GPT."""
 
-    def _create_prompt(self) -> str:
+    def _create_prompt(self) -> list[dict]:
+        if self.pinned_tokens + self.dialog_tokens > self.max_token_length - self.max_completion_length:
+            self._evict_dialog(self.pinned_tokens + self.dialog_tokens - (self.max_token_length - self.max_completion_length))
         prompt = []
         prompt.append(self.system_message)
         for message in self.messages:
             prompt.append({"role": message['sender'], "content": message['text']})
-        prompt_content = ""
-        for message in prompt:
-            prompt_content += message["content"]
-        print('prompt length: ' + str(len(enc.encode(prompt_content))))
-        if len(enc.encode(prompt_content)) > self.max_token_length - self.max_completion_length:
-            print('prompt too long. truncated.')
-            # truncate the prompt by removing the oldest two messages
-            self.messages = self.messages[2:]
-            prompt = self._create_prompt()
+        print('prompt length: ' + str(self.pinned_tokens + self.dialog_tokens))
         return prompt
 
+    def _evict_dialog(self, excess_tokens: int):
+        """
+        Remove the oldest dialog turns (user and assistant message pairs) in one pass until the prompt fits the budget.
+        The pinned prompt messages and the latest message (the current request) are always kept.
+        excess_tokens: number of tokens over the budget
+        """
+        start = self.num_pinned_messages
+        end = start
+        last = len(self.messages) - 1
+        removed_tokens = 0
+        while (removed_tokens < excess_tokens or (end - start) % 2 == 1) and end < last:
+            removed_tokens += count_tokens(self.messages[end]['text'])
+            end += 1
+        if end > start:
+            print('prompt too long. removed %d oldest dialog messages.' % (end - start))
+            del self.messages[start:end]
+            self.dialog_tokens -= removed_tokens
+        if removed_tokens < excess_tokens:
+            print('prompt warning: prompt files and the latest message exceed the token budget by %d' % (excess_tokens - removed_tokens))
+
     def _format_dslstr(self, text: str) -> str:
         lines = text.strip().splitlines()
         indent_level = 0
@@ -138,120 +160,95 @@ class AIModel(ABC):
         return "\n".join(formatted_lines)
 
     def _dslstr2dict(self, text: str, action_definitions: dict) -> dict:
-        text = text.strip()
-        if text.startswith("action") or text.startswith("condition"):
-            parent_type = "action" if text.startswith("action") else "condition"
-            start = text.find('[') + 1
-            end = text.find(']', start)
-            content = text[start:end].strip()
-            node_content = self._dslstr2dict_parse_node(content, parent_type, action_definitions)
-            return node_content
-        elif text.startswith("root"):
-            parent_type = "root"
-            pattern = r'root (\{(?:[^{}]|(?1))*\})'
-        elif text.startswith("sequence"):
-            parent_type = "sequence"
-            pattern = r'sequence (\{(?:[^{}]|(?1))*\})'
-        elif text.startswith("selector"):
-            parent_type = "selector"
-            pattern = r'selector (\{(?:[^{}]|(?1))*\})'
-        elif text.startswith("retry"):
-            parent_type = "retry"
-            pattern = r'retry (\{(?:[^{}]|(?1))*\})'
-        else:
-            warnings.warn("pattern was not set. probably input is not a valid format.")
-            return None
-
-        # get code block (e.g., "root {X}" => "{X}")
-        try: matches = regex.findall(pattern, text)
-        except:
-            warnings.warn("pattern was not set. probably input is not a valid format.")
-            return None
+        """
+        Convert the DSL string to a language-level behavior tree (see dsl_parser for the syntax).
 
-        if matches:
-            content = max(matches, key=len)  # extract the longest match (the most outside block)
-            content = content[1:-1]  # remove brackets (e.g., "{sequence {X}}" => "sequence {X}")
-            if parent_type == "sequence" or parent_type == "selector": # child may have multiple nodes
-                node_list = self._dslstr2dict_parse_nodes(content, action_definitions)
-                return {parent_type: node_list}
-            else: # single child (root and decorators by definition only have a single child)
-                return {parent_type: self._dslstr2dict(content, action_definitions)}
-        else:
-            warnings.warn("No match found. Invalid format.")
+        return: the tree, None if the input is not a valid format.
+        """
+        index = action_index.get_index(action_definitions)
+        try:
+            return dsl_parser.parse(text, lambda node_type, name, args: self._dslstr2dict_parse_node(name, args, node_type, index))
+        except dsl_parser.DSLParseError as e:
+            warnings.warn("invalid format: %s" % e)
             return None
 
-    def _dslstr2dict_parse_node(self, text: str, node_type: str, action_definitions: dict) -> dict:
-        content = text.split(',')
+    def _dslstr2dict_parse_node(self, name: str, args: list[str], node_type: str, index: action_index.ActionIndex) -> dict:
         # regardless of condition or action, mapped to action node
         # if is indeed a condition, remap to a CONDITION in model.py
-        if len(content) == 1:  # node has zero args
-            return {'node': content[0]}
+        if len(args) == 0:  # node has zero args
+            return {'node': name}
+        mapped_args = index.map_arguments(node_type, name, args)
+        if mapped_args is None: return {'node': name}  # could not find arg definitions
+        return {'node': name, **mapped_args}
+
+    def _create_client(self, backend: str, credentials: dict) -> tuple[typing.Any, tuple]:
+        """
+        Client of the language model, override to use a different service.
+        backend:     LLM_BACKEND in the credentials, empty for Azure OpenAI / OpenAI (see use_azure), "offline" for the local
+                     stand-in, or a client class as MODULE_PATH.CLASS constructed with the credentials (any object with the
+                     same chat.completions.create() coroutine as openai.AsyncOpenAI)
+        credentials: content of the credentials file
+
+        return: the client and the key of its quota (sessions with the same key share the rate limits)
+        """
+        if backend == "offline":  # no network access, for testing the encoder
+            return offline_client.OfflineChatClient.from_credentials(credentials), ("offline",)
+        if backend != "":
+            module_name, class_name = backend.rsplit('.', 1)
+            return getattr(importlib.import_module(module_name), class_name)(credentials), (backend,)
+        if self.use_azure:
+            # async clients so that waiting for a response does not block the other sessions of the server
+            # (retries are left to generate() so that a rate limit holds the requests of all sessions)
+            azure_endpoint = credentials["AZURE_OPENAI_ENDPOINT_GPT4OMINI"] if self.use_mini else credentials["AZURE_OPENAI_ENDPOINT"]
+            api_key = credentials["AZURE_OPENAI_KEY_GPT4OMINI"] if self.use_mini else credentials["AZURE_OPENAI_KEY"]
+            client = _get_shared_client(("azure", azure_endpoint, api_key, self.api_version), lambda: openai.AsyncAzureOpenAI(
+                # cf. https://learn.microsoft.com/en-us/azure/ai-services/openai/reference#rest-api-versioning
+                api_version=self.api_version,
+                # cf. https://learn.microsoft.com/en-us/azure/cognitive-services/openai/how-to/create-resource?pivots=web-portal#create-a-resource
+                azure_endpoint = azure_endpoint,
+                api_key = api_key,
+                max_retries=0
+            ))
+            return client, ("azure", str(client.base_url), credentials.get("AZURE_OPENAI_DEPLOYMENT_NAME_CHATGPT", ""))
         else:
-            tmp_node = {'node': content[0]}
-            action_list = action_definitions['Actions'] if node_type == 'action' else action_definitions['Conditions']
-            for action in action_list:
-                if action['Name'] == content[0]: break
-                action = None
-            if action is None: return {'node': content[0]}  # could not find arg definitions
-
-            arg_info = action["Arguments"]
-            for i, arg in enumerate(content[1:]):
-                arg = arg.strip()
-                try: arg = int(arg)
-                except ValueError: arg = arg.strip('"')
-                key = list(arg_info)[i]
-                tmp_node[key] = arg
-            return tmp_node
-
-    def _dslstr2dict_parse_nodes(self, text: str, action_definitions: dict) -> dict:
-        nodes = []
-        i = 0
-        while i < len(text):
-            for key in ['condition', 'action']:
-                if text[i:].startswith(key): break
-                key = ""
-
-            if key != "":
-                start = text.find('[', i) + 1
-                end = text.find(']', start)
-                content = text[start:end].strip()
-                node_content = self._dslstr2dict_parse_node(content, key, action_definitions)
-                nodes.append(node_content)
-                i = end + 1
-            else:
-                # Decorators are temporarily treated as a list as will be formatted in _parse_dict() anyway
-                parent_type = ""
-                for key in ['sequence', 'selector', 'retry']:
-                    if text[i:].startswith(key):
-                        parent_type = key
-                        break
-                if parent_type != "":
-                    start = text.find('{', i) + 1
-                    end = start
-                    balance = 1  # We start after the opening '{', so we start with a balance of 1
-                    while balance > 0:
-                        if text[end] == '{': balance += 1
-                        elif text[end] == '}': balance -= 1
-                        end += 1
-                    content = text[start:end-1]
-                    node_list = self._dslstr2dict_parse_nodes(content, action_definitions)
-                    nodes.append({parent_type: node_list})
-                    i = end
-                else:
-                    i += 1  # Skip characters until we find a node type
-        return nodes
-
-    def generate(self, message: str, environment: str, is_user_feedback: bool=False) -> str:
+            client = _get_shared_client(("openai", credentials["OPENAI_API_KEY"]), lambda: openai.AsyncOpenAI(
+                api_key = credentials["OPENAI_API_KEY"],
+                max_retries=0
+            ))
+            return client, ("openai", rate_limiter.secret_key(credentials["OPENAI_API_KEY"]))
+
+    def _retry_wait_sec(self, error: Exception, retry_count: int) -> float:
+        """Wait time before retrying a failed call: as requested by the API if stated, otherwise exponential backoff with jitter."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            # jitter so that the waiting sessions do not all retry at the same moment
+            try:
+                if "retry-after-ms" in response.headers: return float(response.headers["retry-after-ms"]) / 1000. * random.uniform(1., 1.1)
+                if "retry-after" in response.headers: return float(response.headers["retry-after"]) * random.uniform(1., 1.1)
+            except ValueError: pass  # e.g., retry-after as a date
+        return min(60., 2. ** retry_count) * random.uniform(.5, 1.)
+
+    async def generate(self, message: str, environment: str, is_user_feedback: bool=False,
+                       on_partial: typing.Callable[[str], typing.Awaitable]=None) -> str:
         """
         Obtain a response from GPT from a user input string.
         message:          User input string.
         environment:      Current state of the environment (see compile_world()).
         is_user_feedback: Whether the user input string is a feedback to a previous generated reponse.
+        on_partial:       If set, the response is streamed and this coroutine is called with each new piece of text.
 
         return: Response from GPT.
         """
+        if self.use_azure: model = self.credentials.get("AZURE_OPENAI_DEPLOYMENT_NAME_CHATGPT", "")
+        else: model = "gpt-3.5-turbo-16k"
+
+        self.cache_key = None
+        if self.shared_response_cache is not None and not is_user_feedback:
+            history = [m['text'] for m in self.messages[self.num_pinned_messages:]]
+            self.cache_key = self.shared_response_cache.make_key(message, environment, history, self._prompt_version(), model)
+
         if is_user_feedback:
-            self.messages.append({'sender': 'user', 'text': message})
+            self._append_message('user', message)
         else:
             text_base = self.query
             if text_base.find('[ENVIRONMENT]') != -1:
@@ -260,65 +257,91 @@ class AIModel(ABC):
             if text_base.find('[INSTRUCTION]') != -1:
                 text_base = text_base.replace('[INSTRUCTION]', message)
                 self.instruction = text_base
-            self.messages.append({'sender': 'user', 'text': text_base})
+            self._append_message('user', text_base)
+
+        if self.cache_key is not None:
+            text = self.shared_response_cache.get(self.cache_key)
+            if text is not None:
+                print("using cached response (cache: %s)" % self.shared_response_cache.stats())
+                self._append_message('assistant', text)
+                return text
 
-        if self.logdir != '':
+        prompt = self._create_prompt()
+        if self.logdir != '' or self.shared_artifact_writer is not None:
             # file name includes the name of this file and the current time
-            file_name = self.logdir + \
-                str(time.strftime('%Y%m%d_%H%M%S', time.localtime())) + \
-                '_aimodel_task_planning.txt'
-            if self.use_azure and self.api_version == '2022-12-01':
-                with open(file_name, 'w', encoding='utf-8') as f:
-                    f.write(self._create_prompt())
+            log_name = str(time.strftime('%Y%m%d_%H%M%S', time.localtime())) + '_aimodel_task_planning'
+            log_text = ''.join(item['content'] + '\n' for item in prompt)
+            if self.shared_artifact_writer is not None: self.shared_artifact_writer.write_text(log_name, log_text)
             else:
-                with open(file_name, 'w', encoding='utf-8') as f:
-                    for item in self._create_prompt():
-                        f.write(item['content'])
-                        f.write('\n')
+                with open(self.logdir + log_name + '.txt', 'w', encoding='utf-8') as f: f.write(log_text)
 
         self.current_time = time.time()
-        time_diff = self.current_time - self.time_api_called
-        if time_diff < self.waittime_sec:
-            print("waiting for " + str(self.waittime_sec - time_diff) + " seconds...")
-            time.sleep(self.waittime_sec - time_diff)
-
+        retry_count = 0
         while True:
             try:
-                if self.use_azure:
-                    deployment_name=self.credentials["AZURE_OPENAI_DEPLOYMENT_NAME_CHATGPT"]
-                    response = self.client.chat.completions.create(
-                        model=deployment_name,
-                        # response_format={ "type": "json_object" },
-                        messages=self._create_prompt(),
-                        temperature=0.2,#2.0,
-                        max_tokens=self.max_completion_length,
-                        top_p=0.5,
-                        frequency_penalty=0.0,
-                        presence_penalty=0.0)
-                    text = response.choices[0].message.content
-                else:
-                    response = self.client.chat.completions.create(
-                        model="gpt-3.5-turbo-16k",
-                        messages=self._create_prompt(),
-                        temperature=0.2,#2.0,
-                        max_tokens=self.max_completion_length,
-                        top_p=0.5,
-                        frequency_penalty=0.0,
-                        presence_penalty=0.0)
-                    text = response.choices[0].message.content
-                self.time_api_called = time.time()
+                async with self.rate_limiter.slot(self.pinned_tokens + self.dialog_tokens + self.max_completion_length) as queue_sec:
+                    if queue_sec > 1.: print("waited %.1f seconds for the rate limit" % queue_sec)
+                    text = await self._complete(model, prompt, on_partial)
                 break
-            except Exception as e:
+            except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
                 print(e)
-                match = re.search("retry after (\\d+) seconds", e.args[0])
-                wait_time = int(match.group(1))
-                print("api call failed due to rate limit. waiting for " + str(wait_time) + " seconds...")
-                time.sleep(wait_time)
-                continue
-        self.messages.append({"sender": "assistant", "text": text})
+                if retry_count >= self.retry_count_tolerance: raise
+                wait_time = self._retry_wait_sec(e, retry_count)
+                if isinstance(e, openai.RateLimitError): self.rate_limiter.pause(wait_time)  # the quota is shared
+                print("api call failed. retrying in " + str(round(wait_time, 1)) + " seconds...")
+                await asyncio.sleep(wait_time)
+                retry_count += 1
+        if self.record_file != "": offline_client.record_completion(self.record_file, prompt, text)
+        self._append_message('assistant', text)
+        if self.cache_key is not None: self.shared_response_cache.put(self.cache_key, text)
 
         return text  # generated_response
 
+    async def _complete(self, model: str, prompt: list[dict], on_partial: typing.Callable[[str], typing.Awaitable]=None) -> str:
+        request = dict(
+            model=model,
+            # response_format={ "type": "json_object" },
+            messages=prompt,
+            temperature=0.2,#2.0,
+            max_tokens=self.max_completion_length,
+            top_p=0.5,
+            frequency_penalty=0.0,
+            presence_penalty=0.0)
+        if on_partial is None:
+            response = await self.client.chat.completions.create(**request)
+            return response.choices[0].message.content
+
+        stream = await self.client.chat.completions.create(stream=True, **request)
+        text = ''
+        code_start = -1  # position of the ```python block in the response
+        try:
+            async for chunk in stream:
+                if len(chunk.choices) == 0 or chunk.choices[0].delta.content is None: continue  # e.g., content filter results
+                searched = len(text)
+                text += chunk.choices[0].delta.content
+                await on_partial(chunk.choices[0].delta.content)
+                if not self.stream_until_code_block: continue
+
+                # only the new text is searched (from a few characters before in case a marker was split between pieces)
+                if code_start == -1:
+                    code_start = text.find('```python', max(0, searched - len('```python')))
+                    if code_start == -1: continue
+                if text.find('```', max(code_start + len('```python'), searched - 2)) != -1:
+                    print("code block complete, stopped streaming")
+                    break
+        finally:
+            await stream.close()
+        return text
+
+    def discard_cached_response(self):
+        """Remove the last response from the cache (e.g., if it could not be formatted)."""
+        if self.shared_response_cache is not None and self.cache_key is not None: self.shared_response_cache.invalidate(self.cache_key)
+
+    def _prompt_version(self) -> str:
+        """Hash of the prompt assets (system, prompt files and query), responses to another prompt version are not reused."""
+        content = [self.system_message["content"], self.query] + [m['text'] for m in self.messages[:self.num_pinned_messages]]
+        return hashlib.sha256('\0'.join(content).encode('utf-8')).hexdigest()
+
 
     """Functions to generate skill-level trees from language-level trees."""
 
@@ -358,7 +381,8 @@ class AIModel(ABC):
         return: Behavior tree using robot-executable skills.
         """
         self.handle_expected_outcome_states(expected_outcome_states, data_engine)
-        return self._map_tree(input_tree, data_engine)
+        # the nodes of the tree look up the same datasets, fetched only once per tree
+        return self._map_tree(input_tree, encode_context.EncodeContext(data_engine))
 
 
     """Functions to implement by user."""
@@ -410,7 +434,7 @@ class AIModel(ABC):
         dslstr = tree_template.replace("TASK_SEQUENCE", response_values_as_dict["task_sequence"])
 
         dslstr = self._format_dslstr(dslstr)
-        with open(self.action_definitions_file, 'r') as file: action_definitions = json.loads(file.read())
+        action_definitions = prompt_assets.load_action_definitions(self.action_definitions_file)
         dsldict = self._dslstr2dict(dslstr, action_definitions)
 
         # must return with "task_sequence" field to work with server.py
@@ -431,7 +455,7 @@ class AIModel(ABC):
         Mapping from a language-level action node to a robot-executable skill node(s).
         node:                    Language-level action node in the behavior tree generated using outputs from GPT.
         expected_outcome_states: The predicted state of the environment after performing all actions (if returned by GPT).
-        data_engine:             The data lake about the environment to load data from and to.
+        data_engine:             The data lake about the environment to load data from and to (an EncodeContext shared by the nodes of the tree).
 
         return: Robot-executable skill node(s).
         """
@@ -0,0 +1,137 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Parser of the behavior tree DSL in the responses of the language model.
+
+tree      := node
+node      := composite '{' node* '}' | leaf '[' name (',' argument)* ']'
+composite := 'root' | 'sequence' | 'selector' | 'retry'
+leaf      := 'action' | 'condition'
+
+Arguments are quoted strings (may contain ',' or ']') or bare words.
+Separators between nodes (',', ';', '\\', escaped newlines) are ignored, as well as content after the tree.
+The text is tokenized and parsed in a single pass (linear in the text length).
+"""
+
+import re
+import typing
+import warnings
+
+
+COMPOSITES = ("root", "sequence", "selector", "retry")
+LEAVES = ("action", "condition")
+SEPARATORS = (',', ';', '\\', '\\n')  # '\\n': newline left escaped by the response formatting
+
+# every character other than whitespace belongs to a token
+_TOKEN = re.compile(r'(?P<string>"[^"]*")|(?P<punct>\\n|[{}\[\],;\\])|(?P<word>[^\s{}\[\],;\\"]+)|(?P<quote>")')
+
+
+class DSLParseError(ValueError):
+    """Invalid DSL, the message includes the line and column of the error."""
+
+    def __init__(self, message: str, text: str, position: int):
+        self.position = position
+        self.line = text.count('\n', 0, position) + 1
+        self.column = position - (text.rfind('\n', 0, position) + 1) + 1
+        super().__init__("%s at line %d column %d" % (message, self.line, self.column))
+
+
+Token = tuple[str, str, int, int]  # (kind: string, punct or word, value, start position, end position)
+
+KIND = 0
+VALUE = 1
+START = 2
+END = 3
+
+
+def tokenize(text: str) -> list[Token]:
+    if text.count('"') % 2 == 1: raise DSLParseError('unterminated string', text, text.rfind('"'))
+    return [(match.lastgroup, match.group(), match.start(), match.end()) for match in _TOKEN.finditer(text)]
+
+
+class _Parser:
+
+    def __init__(self, text: str, make_leaf: typing.Callable):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+        self.make_leaf = make_leaf
+
+    def error(self, message: str, token: Token=None):
+        raise DSLParseError(message, self.text, len(self.text) if token is None else token[START])
+
+    def next(self) -> Token:
+        if self.index >= len(self.tokens): return None
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, value: str, after: Token) -> Token:
+        token = self.next()
+        if token is None or token[KIND] != "punct" or token[VALUE] != value:
+            self.error("expected '%s' after '%s'" % (value, after[VALUE]), token)
+        return token
+
+    def parse_node(self) -> dict:
+        token = self.next()
+        if token is None: self.error("expected a node")
+        if token[KIND] == "word" and token[VALUE] in LEAVES: return self.parse_leaf(token)
+        if token[KIND] == "word" and token[VALUE] in COMPOSITES: return self.parse_composite(token)
+        self.error("expected a node but got '%s'" % token[VALUE], token)
+
+    def parse_composite(self, keyword: Token) -> dict:
+        self.expect('{', keyword)
+        children = []
+        while True:
+            token = self.next()
+            if token is None: self.error("missing '}' of '%s' at position %d" % (keyword[VALUE], keyword[START]))
+            if token[KIND] == "punct" and token[VALUE] == '}': break
+            if token[KIND] == "punct" and token[VALUE] in SEPARATORS: continue
+            if token[KIND] == "word" and (token[VALUE] in LEAVES or token[VALUE] in COMPOSITES):
+                self.index -= 1
+                children.append(self.parse_node())
+                continue
+            if token[KIND] == "punct": self.error("unexpected '%s' in '%s'" % (token[VALUE], keyword[VALUE]), token)
+            warnings.warn(str(DSLParseError("ignored '%s' in '%s'" % (token[VALUE], keyword[VALUE]), self.text, token[START])))
+
+        if keyword[VALUE] == "root":  # root has a single child by definition
+            if len(children) != 1: self.error("'root' must have exactly one child (got %d)" % len(children), keyword)
+            return {"root": children[0]}
+        # decorators are also returned as a list, formatted in AIModel._parse_dict()
+        return {keyword[VALUE]: children}
+
+    def parse_leaf(self, keyword: Token) -> dict:
+        self.expect('[', keyword)
+        items = []  # raw text of the name and the arguments
+        first = None
+        last = None
+        while True:
+            token = self.next()
+            if token is None: self.error("missing ']' of '%s' at position %d" % (keyword[VALUE], keyword[START]))
+            if token[KIND] == "punct" and token[VALUE] in (',', ']'):
+                if first is not None: items.append(self.text[first[START]:last[END]])
+                elif token[VALUE] == ',' or len(items) > 0: items.append("")
+                first = None
+                if token[VALUE] == ']': break
+                continue
+            if token[KIND] == "punct": self.error("unexpected '%s' in '%s'" % (token[VALUE], keyword[VALUE]), token)
+            if first is None: first = token
+            last = token
+
+        if len(items) > 1 and items[-1] == "": items.pop()  # trailing comma
+        if len(items) == 0 or items[0] == "": self.error("missing node name", keyword)
+        return self.make_leaf(keyword[VALUE], items[0], items[1:])
+
+
+def parse(text: str, make_leaf: typing.Callable[[str, str, list[str]], dict]) -> dict:
+    """
+    Parse a tree (or a single leaf node).
+    text:      DSL string
+    make_leaf: called as make_leaf(node_type, name, raw_arguments) to create the content of the action/condition nodes
+
+    return: nested dictionaries, e.g., {"root": {"sequence": [<leaf>, {"retry": [<leaf>]}]}}
+    """
+    return _Parser(text, make_leaf).parse_node()
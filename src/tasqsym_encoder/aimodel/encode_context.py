@@ -0,0 +1,48 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import typing
+import tasqsym.core.common.structs as tss_structs
+
+
+class EncodeContext:
+    """
+    View of the data engine while compiling one tree (see AIModel.encode()), passed to my_node_parse_rule() in place of the data engine.
+    Each dataset is fetched from the data engine once per tree, the following getData() calls return the same data.
+    Other methods are those of the data engine.
+    """
+
+    def __init__(self, data_engine):
+        self.data_engine = data_engine
+        self.datasets: dict[str, tuple[tss_structs.Status, dict]] = {}
+        self.situation_keys: dict[tuple, str] = {}  # (data name, entry name, default situation) -> situation key chosen for the entry
+
+    def getData(self, cmd: str) -> tuple[tss_structs.Status, dict]:
+        if cmd not in self.datasets: self.datasets[cmd] = self.data_engine.getData(cmd)
+        return self.datasets[cmd]
+
+    def updateData(self, cmd: str, data: dict) -> tss_structs.Status:
+        """Writes through to the data engine, the dataset is fetched again on the next getData()."""
+        self.datasets.pop(cmd, None)
+        self.situation_keys = {k: v for k, v in self.situation_keys.items() if k[0] != cmd}
+        return self.data_engine.updateData(cmd, data)
+
+    def getSituationData(self, cmd: str, name: str, default_key: str, choose: typing.Callable[[dict, str], str]) -> dict:
+        """
+        Entry of a dataset keyed by name then by situation (e.g., objects_metadata), the situation is chosen once per tree.
+        cmd:         the type of data
+        name:        name of the entry (e.g., object name)
+        default_key: preferred situation
+        choose:      called as choose(situations of the entry, default_key) to get the situation key if not chosen yet
+
+        return: the data of the entry for the chosen situation
+        """
+        _, data = self.getData(cmd)
+        key = (cmd, name, default_key)
+        if key not in self.situation_keys: self.situation_keys[key] = choose(data[name], default_key)
+        return data[name][self.situation_keys[key]]
+
+    def __getattr__(self, name: str):
+        return getattr(self.data_engine, name)
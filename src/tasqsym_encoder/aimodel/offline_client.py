@@ -0,0 +1,164 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import re
+import json
+import random
+import asyncio
+import hashlib
+import itertools
+import types
+
+
+def prompt_hash(messages: list[dict]) -> str:
+    """Key of a recorded completion (same prompt, same response)."""
+    content = json.dumps([[m["role"], m["content"]] for m in messages], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def record_completion(record_file: str, messages: list[dict], response: str):
+    """Append a completion to a recordings file (json lines) to replay later with OFFLINE_RECORDINGS_FILE."""
+    with open(record_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"prompt_hash": prompt_hash(messages), "response": response}, ensure_ascii=False) + '\n')
+
+
+_recordings: dict[str, tuple[int, dict[str, str]]] = {}  # path -> (modification time, recordings)
+
+
+def load_recordings(record_file: str) -> dict[str, str]:
+    """
+    return: prompt hash -> response (the last recorded response if the same prompt was recorded several times)
+    The file is read once per process (or if modified) and the returned recordings are shared among the sessions.
+    """
+    path = os.path.abspath(record_file)
+    mtime = os.stat(path).st_mtime_ns
+    if path in _recordings and _recordings[path][0] == mtime: return _recordings[path][1]
+    recordings = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip() == "": continue
+            entry = json.loads(line)
+            recordings[entry["prompt_hash"]] = entry["response"]
+    _recordings[path] = (mtime, recordings)
+    return recordings
+
+
+class LatencyModel:
+    """Simulated response time."""
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, latency_sec: float=0., distribution: str="fixed", spread: float=0., seed: int=None):
+        """
+        latency_sec:  mean (median for lognormal) response time
+        distribution: fixed, uniform (latency_sec +- spread), normal (standard deviation spread)
+                      or lognormal (spread is the standard deviation of the log, long tail as the actual service)
+        seed:         seed of the samples for repeatable runs (random if None)
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            print("unknown latency distribution %s, using fixed" % distribution)
+            distribution = "fixed"
+        self.latency_sec = latency_sec
+        self.distribution = distribution
+        self.spread = spread
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.distribution == "uniform": latency_sec = self.rng.uniform(self.latency_sec - self.spread, self.latency_sec + self.spread)
+        elif self.distribution == "normal": latency_sec = self.rng.gauss(self.latency_sec, self.spread)
+        elif self.distribution == "lognormal": latency_sec = self.latency_sec * self.rng.lognormvariate(0., self.spread)
+        else: latency_sec = self.latency_sec
+        return max(0., latency_sec)
+
+
+class _OfflineStream:
+    """Same iteration as the openai.AsyncStream of chat completion chunks."""
+
+    def __init__(self, text: str, latency_sec: float):
+        self.pieces = re.findall(r'\S+\s*|\s+', text)  # a piece per word
+        self.delay_sec = latency_sec / max(1, len(self.pieces))
+
+    async def __aiter__(self):
+        for piece in self.pieces:
+            if self.delay_sec > 0: await asyncio.sleep(self.delay_sec)
+            delta = types.SimpleNamespace(role="assistant", content=piece)
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(index=0, delta=delta, finish_reason=None)])
+
+    async def close(self): pass
+
+
+class _OfflineCompletions:
+
+    def __init__(self, response_file: str, latency: LatencyModel, recordings: dict[str, str]):
+        self.response_file = response_file
+        self.latency = latency
+        self.recordings = recordings
+        self.replayed = 0
+        self.missed = 0
+
+    async def create(self, model: str, messages: list[dict], stream: bool=False, **kwargs):
+        """Same call as openai.AsyncOpenAI().chat.completions.create() (the sampling arguments are ignored)."""
+        text = self._response(messages)
+        latency_sec = self.latency.sample()
+        if stream: return _OfflineStream(text, latency_sec)  # latency spread over the pieces
+        if latency_sec > 0: await asyncio.sleep(latency_sec)
+        message = types.SimpleNamespace(role="assistant", content=text)
+        return types.SimpleNamespace(model=model, choices=[types.SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+    def _response(self, messages: list[dict]) -> str:
+        if len(self.recordings) > 0:
+            text = self.recordings.get(prompt_hash(messages))
+            if text is not None:
+                self.replayed += 1
+                return text
+            self.missed += 1
+            print("no recorded completion for the prompt, using the %s" % ("response file" if self.response_file != "" else "prompt examples"))
+        if self.response_file != "":
+            with open(self.response_file, encoding='utf-8') as f: text = f.read()
+        else:
+            # the last example output before the request is a well-formatted response for the prompt set
+            text = ""
+            for message in messages[:-1]:
+                start = message["content"].rfind('```python')
+                end = message["content"].find('```', start + len('```python'))
+                if start != -1 and end != -1: text = message["content"][start:end + 3]
+        return text
+
+
+_client_count = itertools.count()
+
+
+class OfflineChatClient:
+    """
+    Stand-in for the OpenAI client which does not access the network (for testing or benchmarking the encoder without credentials).
+    Replays the recorded completion of the same prompt if any, otherwise returns the content of a response file if set,
+    otherwise the last example output (```python block) of the prompt.
+    """
+
+    def __init__(self, response_file: str="", latency_sec: float=0., recordings_file: str="", latency: LatencyModel=None):
+        """
+        response_file:   text file with the response to return for every request (empty to use the prompt examples)
+        latency_sec:     simulated time to generate a response (ignored if latency is set)
+        recordings_file: completions recorded with record_completion() (none if empty)
+        latency:         distribution of the simulated time to generate a response
+        """
+        if latency is None: latency = LatencyModel(latency_sec)
+        recordings = load_recordings(recordings_file) if recordings_file != "" else {}
+        self.chat = types.SimpleNamespace(completions=_OfflineCompletions(response_file, latency, recordings))
+
+    @classmethod
+    def from_credentials(cls, credentials: dict):
+        """OFFLINE_RESPONSE_FILE, OFFLINE_RECORDINGS_FILE, OFFLINE_LATENCY_SEC, OFFLINE_LATENCY_DIST, OFFLINE_LATENCY_SPREAD and OFFLINE_SEED."""
+        seed = credentials.get("OFFLINE_SEED") or None
+        # each session gets its own (still repeatable) samples
+        latency = LatencyModel(
+            float(credentials.get("OFFLINE_LATENCY_SEC") or 0.),
+            credentials.get("OFFLINE_LATENCY_DIST") or "fixed",
+            float(credentials.get("OFFLINE_LATENCY_SPREAD") or 0.),
+            None if seed is None else int(seed) + next(_client_count))
+        return cls(credentials.get("OFFLINE_RESPONSE_FILE") or "", recordings_file=credentials.get("OFFLINE_RECORDINGS_FILE") or "", latency=latency)
+
+    async def close(self): pass
@@ -0,0 +1,72 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Process-wide cache of the prompt files and action definitions shared by all sessions of the server.
+Entries are keyed by the file paths and reloaded when the modification time of a file changes (edits apply without restart).
+The returned values are shared among the sessions and must not be modified.
+"""
+
+import os
+import re
+import json
+import typing
+
+
+_assets: dict[tuple, tuple[tuple, typing.Any]] = {}  # (kind, paths) -> (modification times, value)
+
+
+def _get_asset(kind: str, paths: list[str], load: typing.Callable) -> typing.Any:
+    key = (kind,) + tuple(os.path.abspath(p) for p in paths)
+    mtimes = tuple(os.stat(p).st_mtime_ns for p in paths)
+    entry = _assets.get(key)
+    if entry is not None and entry[0] == mtimes: return entry[1]
+    value = load()
+    _assets[key] = (mtimes, value)
+    return value
+
+
+def _read(path: str) -> str:
+    with open(path) as f: return f.read()
+
+
+def read_text(path: str) -> str:
+    """Content of a prompt file (e.g., system.txt, query.txt)."""
+    return _get_asset("text", [path], lambda: _read(path))
+
+
+def load_action_definitions(path: str) -> dict:
+    """Parsed action definitions (json)."""
+    return _get_asset("action_definitions", [path], lambda: json.loads(_read(path)))
+
+
+def load_prompt_messages(dir_prompt: str, prompt_load_order: list[str], action_definitions_file: str) -> tuple[dict]:
+    """
+    The prompt files split into user and assistant messages, with the action definitions inserted into the action prompt.
+    dir_prompt:              directory of the prompt files
+    prompt_load_order:       prompt file names (without .txt) in the order to load
+    action_definitions_file: file to insert in place of ACTION_DEFINITIONS_PLACEHOLDER
+
+    return: messages as {"sender": "user" or "assistant", "text": <content>}
+    """
+    prompt_files = [os.path.join(dir_prompt, prompt_name + '.txt') for prompt_name in prompt_load_order]
+
+    def load() -> tuple[dict]:
+        messages = []
+        for fp_prompt in prompt_files:
+            data = _read(fp_prompt)
+            # insert the action definitions loaded from file to the action prompt
+            if data.find('ACTION_DEFINITIONS_PLACEHOLDER') != -1:  # only enters for action prompt
+                data = data.replace('ACTION_DEFINITIONS_PLACEHOLDER', _read(action_definitions_file))
+            data_split = re.split(r'\[user\]\n|\[assistant\]\n', data)
+            data_split = [item for item in data_split if len(item) != 0]
+            # messages start with "user" and ends with "system"
+            assert len(data_split) % 2 == 0
+            for i, item in enumerate(data_split):
+                if i % 2 == 0: messages.append({"sender": "user", "text": item})
+                else: messages.append({"sender": "assistant", "text": item})
+        return tuple(messages)
+
+    return _get_asset("prompt_messages", prompt_files + [action_definitions_file], load)
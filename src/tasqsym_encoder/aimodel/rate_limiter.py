@@ -0,0 +1,134 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import time
+import typing
+import asyncio
+import hashlib
+import contextlib
+
+
+class _TokenBucket:
+
+    def __init__(self, per_minute: float, now: float):
+        """
+        per_minute: refill rate (unlimited if zero)
+        now:        current time in seconds
+        """
+        self.rate = per_minute / 60.
+        # allow bursts of 10 seconds worth of quota, the window the service typically checks the limits on
+        self.capacity = max(1., per_minute / 6.)
+        self.level = self.capacity
+        self.updated = now
+
+    def wait_sec(self, amount: float, now: float) -> float:
+        if self.rate <= 0: return 0.
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)  # a request larger than the burst waits for a full bucket
+        return 0. if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.rate > 0: self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Limits the requests to a model deployment shared by all sessions of the server.
+
+    Requests wait (asynchronously, in arrival order) for a free slot among the concurrent requests and for the quota
+    of requests and tokens per minute. A rate limit response pauses all requests until the time stated by the service.
+    """
+
+    def __init__(self, requests_per_minute: float=0., tokens_per_minute: float=0., max_concurrency: int=0,
+                 clock: typing.Callable[[], float]=time.monotonic, sleep: typing.Callable[[float], typing.Awaitable]=asyncio.sleep):
+        """
+        requests_per_minute: request quota (unlimited if zero)
+        tokens_per_minute:   prompt and completion token quota (unlimited if zero)
+        max_concurrency:     maximum number of requests waiting for a response (unlimited if zero)
+        clock, sleep:        time source in seconds and the coroutine waiting on it (replaced in tests)
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.request_bucket = _TokenBucket(requests_per_minute, clock())
+        self.token_bucket = _TokenBucket(tokens_per_minute, clock())
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        self.paused_until = 0.
+        self._order = asyncio.Lock()  # first come, first served
+
+        # metrics
+        self.requests = 0
+        self.waiting = 0
+        self.throttled = 0
+        self.total_queue_sec = 0.
+        self.max_queue_sec = 0.
+
+    @contextlib.asynccontextmanager
+    async def slot(self, tokens: int=0):
+        """
+        Wait until the request can be sent, the slot is held until the response is received.
+        tokens: estimated prompt and completion tokens of the request
+        """
+        queued = self.clock()
+        self.waiting += 1
+        try:
+            if self.semaphore is not None: await self.semaphore.acquire()
+            try:
+                async with self._order:
+                    while True:
+                        now = self.clock()
+                        wait_sec = max(self.paused_until - now, self.request_bucket.wait_sec(1, now), self.token_bucket.wait_sec(tokens, now))
+                        if wait_sec <= 0: break
+                        await self.sleep(wait_sec)
+                    self.request_bucket.take(1)
+                    self.token_bucket.take(tokens)
+            except BaseException:
+                if self.semaphore is not None: self.semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        queue_sec = self.clock() - queued
+        self.requests += 1
+        self.total_queue_sec += queue_sec
+        self.max_queue_sec = max(self.max_queue_sec, queue_sec)
+        try: yield queue_sec
+        finally:
+            if self.semaphore is not None: self.semaphore.release()
+
+    def pause(self, wait_sec: float):
+        """Hold all requests (e.g., the service returned a rate limit error with a time to retry after)."""
+        self.throttled += 1
+        self.paused_until = max(self.paused_until, self.clock() + wait_sec)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "waiting": self.waiting,
+            "throttled": self.throttled,
+            "avg_queue_ms": round(1000. * self.total_queue_sec / max(1, self.requests), 1),
+            "max_queue_ms": round(1000. * self.max_queue_sec, 1)
+        }
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+
+
+def get_limiter(key: tuple, requests_per_minute: float=0., tokens_per_minute: float=0., max_concurrency: int=0) -> RateLimiter:
+    """
+    The limiter of a deployment (created with the given limits on the first call).
+    key: identifies the quota, e.g., (endpoint, deployment name)
+    """
+    if key not in _limiters: _limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute, max_concurrency)
+    return _limiters[key]
+
+
+def secret_key(secret: str) -> str:
+    """Identifies a quota by a secret (e.g., an API key) without keeping the secret in the limiter keys and the stats."""
+    return hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]
+
+
+def all_stats() -> dict:
+    return {'/'.join(str(k) for k in key): limiter.stats() for key, limiter in _limiters.items()}
@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import re
+import json
+import time
+import hashlib
+import collections
+
+
+def normalize_instruction(instruction: str) -> str:
+    """Instructions differing only in case or whitespace are the same request."""
+    return re.sub(r'\s+', ' ', instruction).strip().lower()
+
+
+class ResponseCache:
+    """
+    Cache of the language model responses shared by the sessions of the server.
+
+    Entries are kept in memory (least recently used dropped first) and optionally on disk (one json file per entry),
+    so that the cache survives restarts. Entries expire after the time to live.
+    """
+
+    def __init__(self, cache_dir: str="", max_entries: int=256, ttl_sec: float=86400.):
+        """
+        cache_dir:   directory to persist the entries (memory only if empty)
+        max_entries: maximum number of entries in memory and on disk
+        ttl_sec:     time until an entry expires
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.entries: collections.OrderedDict[str, tuple[float, str]] = collections.OrderedDict()  # key -> (created time, response)
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir != "": os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(instruction: str, world: dict, history: list[str], prompt_version: str, model: str) -> str:
+        """
+        instruction:    user instruction
+        world:          environment representation from compile_world()
+        history:        dialog messages before the instruction (if any)
+        prompt_version: hash of the prompt assets
+        model:          model or deployment name
+        """
+        content = json.dumps([normalize_instruction(instruction), world, history, prompt_version, model], sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str:
+        """return: the cached response, None if not cached or expired"""
+        entry = self.entries.get(key)
+        if entry is None: entry = self._load(key)
+        if entry is None or time.time() - entry[0] > self.ttl_sec:
+            if entry is not None: self.invalidate(key)
+            self.misses += 1
+            return None
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        self._evict()
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, response: str):
+        entry = (time.time(), response)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        self._evict()
+        if self.cache_dir == "": return
+        with open(self._path(key), 'w', encoding='utf-8') as f: json.dump({"time": entry[0], "response": response}, f)
+        self._evict_disk()
+
+    def invalidate(self, key: str=None):
+        """Remove an entry (all entries if None)."""
+        keys = list(self.entries.keys()) if key is None else [key]
+        for k in keys: self.entries.pop(k, None)
+        if self.cache_dir == "": return
+        if key is None: keys = [f[:-len('.json')] for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+        for k in keys:
+            try: os.remove(self._path(k))
+            except FileNotFoundError: pass
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def _load(self, key: str) -> tuple[float, str]:
+        if self.cache_dir == "": return None
+        try:
+            with open(self._path(key), encoding='utf-8') as f: data = json.load(f)
+            os.utime(self._path(key))  # the modification time is the last use for the eviction on disk
+            return (data["time"], data["response"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError): return None
+
+    def _evict(self):
+        while len(self.entries) > self.max_entries: self.entries.popitem(last=False)
+
+    def _evict_disk(self):
+        files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+        if len(files) <= self.max_entries: return
+        files.sort(key=os.path.getmtime)
+        for fp in files[:len(files) - self.max_entries]: os.remove(fp)
@@ -0,0 +1,176 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import gzip
+import json
+import queue
+import stat
+import shutil
+import hashlib
+import threading
+import collections
+
+
+class ArtifactWriter:
+    """
+    Writes the outputs of the server (task plans, prompt logs) from a background thread so that the sessions never wait for the disk.
+
+    Contents are stored once, read-only, under objects/<first 2 characters of the sha256>/<sha256> and the artifact names are
+    symbolic links to them (copies if the file system does not support symbolic links), so identical plans are stored once
+    and an artifact cannot be modified through another artifact with the same contents.
+    The artifacts and the contents they refer to are listed in objects/manifest.jsonl: only these artifacts are rotated
+    or overwritten (other files in the directory are left as they are), and a content is removed once no artifact refers to it.
+    """
+
+    def __init__(self, output_dir: str, max_pending: int=256, compress: bool=False, max_artifacts: int=0):
+        """
+        output_dir:    directory of the artifacts
+        max_pending:   artifacts waiting to be written, artifacts beyond are dropped (the sessions are never blocked)
+        compress:      add to store the artifacts gzip compressed (.gz)
+        max_artifacts: maximum number of artifacts kept in the directory (no limit if 0)
+        """
+        self.output_dir = output_dir
+        self.objects_dir = os.path.join(output_dir, 'objects')
+        self.manifest_file = os.path.join(self.objects_dir, 'manifest.jsonl')
+        self.compress = compress
+        self.max_artifacts = max_artifacts
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.queue: queue.Queue = queue.Queue(max_pending)
+        self.written = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.refused = 0  # artifacts not written as a file not listed in the manifest has the same name
+
+        # artifacts of this and previous runs, oldest first {file name: content path under objects/}
+        self.artifacts: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self.references: collections.Counter[str] = collections.Counter()  # number of artifacts referring to each content
+        self._manifest_lines = 0
+        self._loadManifest()
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write_json(self, name: str, data: dict):
+        """
+        name: file name without the extension
+        data: serialized (compact) before returning, later changes of data are not written
+        """
+        self._put(name, '.json', json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+
+    def write_text(self, name: str, text: str, extension: str='.txt'):
+        self._put(name, extension, text)
+
+    def _put(self, name: str, extension: str, content: str):
+        try: self.queue.put_nowait((name, extension, content))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 100 == 1: print("artifact writer warning: too many artifacts waiting, dropped %s (%d dropped)" % (name, self.dropped))
+
+    def close(self):
+        """Write the queued artifacts and stop the thread."""
+        if not self.thread.is_alive(): return
+        self.queue.put(None)
+        self.thread.join()
+
+    def stats(self) -> dict:
+        return {"written": self.written, "deduplicated": self.deduplicated, "dropped": self.dropped, "refused": self.refused, "pending": self.queue.qsize(),
+                "artifacts": len(self.artifacts), "contents": len(self.references)}
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None: return
+            try: self._store(*item)
+            except OSError as e: print("artifact writer warning: could not write %s: %s" % (item[0], e))
+
+    def _store(self, name: str, extension: str, content: str):
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if self.compress: extension += '.gz'
+
+        file_name = name + extension
+        fp = os.path.join(self.output_dir, file_name)
+        object_name = os.path.join(digest[:2], digest + extension)
+        if os.path.lexists(fp):
+            if file_name not in self.artifacts:  # e.g., written by the user or by an older version of the server
+                self.refused += 1
+                print("artifact writer warning: %s already exists and was not written by the writer, not overwritten" % file_name)
+                return
+            if self.artifacts[file_name] == object_name: return  # same name and contents (e.g., within the same second)
+
+        fp_object = os.path.join(self.objects_dir, object_name)
+        if os.path.exists(fp_object): self.deduplicated += 1
+        else:
+            os.makedirs(os.path.dirname(fp_object), exist_ok=True)
+            with open(fp_object + '.tmp', 'wb') as f: f.write(gzip.compress(data, mtime=0) if self.compress else data)
+            os.chmod(fp_object + '.tmp', stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(fp_object + '.tmp', fp_object)  # complete contents only
+
+        # replaces the previous artifact of the same name at once
+        if os.path.lexists(fp + '.tmp'): _removeFile(fp + '.tmp')
+        try: os.symlink(os.path.relpath(fp_object, os.path.dirname(fp)), fp + '.tmp')
+        except (OSError, NotImplementedError): shutil.copyfile(fp_object, fp + '.tmp')
+        os.replace(fp + '.tmp', fp)
+
+        self.references[object_name] += 1  # before releasing the previous contents of the name, which may be the same
+        if file_name in self.artifacts: self._release(file_name)
+        self.artifacts[file_name] = object_name
+        self._appendManifest({"name": file_name, "object": object_name})
+        self.written += 1
+        self._rotate()
+
+    def _rotate(self):
+        if self.max_artifacts <= 0: return
+        while len(self.artifacts) > self.max_artifacts:
+            file_name = next(iter(self.artifacts))
+            _removeFile(os.path.join(self.output_dir, file_name))
+            self._release(file_name)
+            self._appendManifest({"removed": file_name})
+
+    def _release(self, file_name: str):
+        """Forget the artifact, and remove its contents if no other artifact refers to them."""
+        object_name = self.artifacts.pop(file_name)
+        self.references[object_name] -= 1
+        if self.references[object_name] > 0: return
+        del self.references[object_name]
+        _removeFile(os.path.join(self.objects_dir, object_name))
+
+    def _loadManifest(self):
+        if not os.path.exists(self.manifest_file): return
+        with open(self.manifest_file, encoding='utf-8') as f:
+            for line in f:
+                try: record = json.loads(line)
+                except json.JSONDecodeError: continue  # partly written when the server stopped
+                self._manifest_lines += 1
+                if "removed" in record: self.artifacts.pop(record["removed"], None)
+                else:
+                    self.artifacts.pop(record["name"], None)  # written again, now the latest
+                    self.artifacts[record["name"]] = record["object"]
+        for object_name in self.artifacts.values(): self.references[object_name] += 1
+        for file_name in [n for n in self.artifacts if not os.path.lexists(os.path.join(self.output_dir, n))]:
+            self._release(file_name)  # removed by the user
+        self._rewriteManifest()
+
+    def _appendManifest(self, record: dict):
+        with open(self.manifest_file, 'a', encoding='utf-8') as f: f.write(json.dumps(record) + '\n')
+        self._manifest_lines += 1
+        if self._manifest_lines > 2 * len(self.artifacts) + 1000: self._rewriteManifest()  # drop the records of removed artifacts
+
+    def _rewriteManifest(self):
+        with open(self.manifest_file + '.tmp', 'w', encoding='utf-8') as f:
+            for file_name, object_name in self.artifacts.items(): f.write(json.dumps({"name": file_name, "object": object_name}) + '\n')
+        os.replace(self.manifest_file + '.tmp', self.manifest_file)
+        self._manifest_lines = len(self.artifacts)
+
+
+def _removeFile(path: str):
+    """Remove a file if it exists, including the read-only contents (which cannot be removed on Windows otherwise)."""
+    try: os.remove(path)
+    except FileNotFoundError: pass
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.remove(path)
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import time
+import asyncio
+import threading
+import collections
+
+
+class FeedbackQueue:
+    """
+    Feedback messages from the core waiting to be claimed by the server, shared by the server-side bridges.
+
+    Messages may be put from any thread (e.g., the mqtt network thread). Waits are asyncio futures resolved
+    in the event loop of the server once a matching message arrives, so no polling is needed.
+    Unclaimed messages are dropped oldest-first beyond the retention policy.
+    """
+
+    def __init__(self, retention_count: int=256, retention_sec: float=600.):
+        """
+        retention_count: maximum number of unclaimed feedback messages to keep
+        retention_sec:   time to keep unclaimed feedback messages
+        """
+        self.retention_count = retention_count
+        self.retention_sec = retention_sec
+
+        # unclaimed messages in order of arrival {id: (received_time, message)}
+        self.messages: collections.OrderedDict = collections.OrderedDict()
+        # messages which will not arrive (e.g., the connection was lost after sending the command) {id: reason}
+        self.failed: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self._loop: asyncio.AbstractEventLoop = None
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._any_waiters: list[tuple[str, asyncio.Future]] = []
+
+    def put(self, msg: dict):
+        """Add a feedback message (thread-safe)."""
+        with self._lock:
+            self.messages[msg["id"]] = (time.monotonic(), msg)
+            self._expire()
+        if self._loop is not None: self._loop.call_soon_threadsafe(self._dispatch)
+
+    def fail(self, msg_ids: list[str], reason: str):
+        """The feedback with the specified ids will not arrive, waits for them raise ConnectionError (thread-safe)."""
+        with self._lock:
+            for msg_id in msg_ids: self.failed[msg_id] = reason
+            while len(self.failed) > self.retention_count: self.failed.popitem(last=False)
+        if self._loop is not None: self._loop.call_soon_threadsafe(self._dispatch)
+
+    async def wait(self, msg_id: str) -> dict:
+        """Wait for the feedback with the specified id (raises asyncio.CancelledError if cancelled, ConnectionError if failed)."""
+        self._loop = asyncio.get_running_loop()
+        waiter = self._loop.create_future()
+        self._waiters[msg_id] = waiter
+        self._dispatch()  # may have arrived already
+        try: return await waiter
+        finally:
+            if self._waiters.get(msg_id) is waiter: self._waiters.pop(msg_id)
+
+    async def waitAny(self, after_msg_id: str) -> dict:
+        """Wait for the first arriving feedback with an id later than after_msg_id (raises asyncio.CancelledError if cancelled)."""
+        self._loop = asyncio.get_running_loop()
+        waiter = self._loop.create_future()
+        self._any_waiters.append((after_msg_id, waiter))
+        self._dispatch()  # may have arrived already
+        return await waiter
+
+    def _dispatch(self):
+        """Hand over queued messages to the waits (called in the event loop)."""
+        with self._lock:
+            for msg_id, waiter in list(self._waiters.items()):
+                if waiter.done(): self._waiters.pop(msg_id)
+                elif msg_id in self.messages:
+                    self._waiters.pop(msg_id)
+                    waiter.set_result(self.messages.pop(msg_id)[1])
+                elif msg_id in self.failed:
+                    self._waiters.pop(msg_id)
+                    waiter.set_exception(ConnectionError(self.failed.pop(msg_id)))
+
+            self._any_waiters = [(after, waiter) for after, waiter in self._any_waiters if not waiter.done()]
+            if len(self.messages) == 0 or len(self._any_waiters) == 0: return
+            remaining = []
+            for after, waiter in self._any_waiters:
+                msg_id = next((stamp for stamp in self.messages if stamp > after), None)
+                if msg_id is None: remaining.append((after, waiter))
+                else: waiter.set_result(self.messages.pop(msg_id)[1])
+            self._any_waiters = remaining
+
+    def _expire(self):
+        expire_before = time.monotonic() - self.retention_sec
+        while len(self.messages) > 0:
+            received_time, _ = next(iter(self.messages.values()))
+            if len(self.messages) <= self.retention_count and received_time >= expire_before: break
+            msg_id, _ = self.messages.popitem(last=False)
+            print("dropped unclaimed feedback %s" % msg_id)
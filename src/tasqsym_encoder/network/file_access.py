@@ -5,8 +5,8 @@
 
 import os
 import json
-import time
 import dotenv
+import tasqsym.assets.include.message_id as message_id
 
 
 class LocalFileBridge:
@@ -24,15 +24,17 @@ class LocalFileBridge:
         final_values = {**default_values, **envvar_values, **envfile_values}
         self.outfile = final_values['TASQSYM_ENCODER_OUTPUT_FILE']
 
-    def send_command(self, cmd, rest) -> int:
-        timestamp = int(time.strftime("%Y%m%d%H%M%S", time.localtime()))
+    def send_command(self, cmd, rest, device_id: str="") -> str:
+        timestamp = message_id.newMessageId()
         if cmd == "run":
             with open(self.outfile, 'w', encoding='utf-8') as f:
                 json.dump(rest["content"], f, ensure_ascii=False, indent=4)
             print("wrote to %s" % self.outfile)
         return timestamp
 
-    async def wait_feedback(self, timestamp) -> bool: self.feedback = timestamp
+    async def wait_feedback(self, timestamp, timeout_sec: float=None) -> bool:
+        self.feedback = timestamp
+        return True
 
     async def wait_any_feedback(self, after_this_timestamp) -> bool: self.feedback = after_this_timestamp
 
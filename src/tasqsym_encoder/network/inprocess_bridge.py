@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import copy
+import asyncio
+import importlib.util
+import tasqsym
+import tasqsym.assets.include.message_id as message_id
+import tasqsym.core.interface.telemetry_publisher as telemetry_publisher
+import tasqsym_encoder.network.feedback_queue as feedback_queue
+
+
+class InProcessBridgeOnCore:
+    """Core side of the in-process channel (same interface as MQTTBridgeOnCore)."""
+
+    def __init__(self, server_bridge):
+        self.queue = {"run": [], "abort": [], "setup": []}
+        self.server_bridge = server_bridge
+
+    async def connect(self): pass
+
+    async def send_feedback(self, data: dict): self.server_bridge.feedback_queue.put(copy.deepcopy(data))
+
+    async def send_telemetry(self, data: dict): self.server_bridge.telemetry = telemetry_publisher.mergeTelemetry(self.server_bridge.telemetry, copy.deepcopy(data))
+
+    async def disconnect(self): pass
+
+
+class InProcessBridgeOnServer:
+    """
+    Server side of the in-process channel (same interface as MQTTBridgeOnServer).
+    Messages are handed over as copies of the dictionaries, so that neither side can modify the content of the other.
+    """
+
+    def __init__(self, retention_count: int=256, retention_sec: float=600.):
+        self.feedback = None
+        self.feedback_queue = feedback_queue.FeedbackQueue(retention_count, retention_sec)
+        self.telemetry: dict = {}  # latest telemetry values of the core
+        self.core_bridge = InProcessBridgeOnCore(self)
+
+    def send_command(self, cmd, rest, device_id: str="") -> str:
+        """device_id is ignored as the bridge connects to a single core."""
+        timestamp = message_id.newMessageId()  # ids are time-ordered
+        data = {
+            "id": timestamp,
+            "command": cmd
+        }
+        data = {**data, **rest}
+        self.core_bridge.queue[cmd].append(copy.deepcopy(data))
+        return timestamp
+
+    async def wait_feedback(self, timestamp, timeout_sec: float=None) -> bool:
+        """timeout_sec: give up waiting after this time (wait forever if None)"""
+        print("waiting for %s in process" % timestamp)
+        try:
+            self.feedback = await asyncio.wait_for(self.feedback_queue.wait(timestamp), timeout_sec)
+        except asyncio.TimeoutError:
+            print('timed out waiting for %s' % timestamp)
+            self.feedback = None
+            return False
+        except asyncio.CancelledError:
+            print('cancelled during monitoring')
+            self.feedback = None
+            return False
+        return True
+
+    async def wait_any_feedback(self, after_this_timestamp) -> bool:
+        print("waiting for any feedback in process")
+        try:
+            self.feedback = await self.feedback_queue.waitAny(after_this_timestamp)
+        except asyncio.CancelledError:
+            print('cancelled during monitoring')
+            self.feedback = None
+            return False
+        return True
+
+    def get_telemetry(self, device_id: str="") -> dict: return self.telemetry
+
+    def disconnect(self): pass
+
+
+def load_core_main():
+    """
+    Load the core entry module (tasqsym/core.py) to run its distribute_mode in the same process.
+    The module cannot be imported by name as the tasqsym.core package shadows it.
+    """
+    core_file = os.path.join(os.path.dirname(tasqsym.__file__), "core.py")
+    spec = importlib.util.spec_from_file_location("tasqsym_core_main", core_file)
+    core_main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(core_main)
+    return core_main
@@ -3,74 +3,105 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------------------------
 
-import sys
 import asyncio
 import json
-import time
 import paho.mqtt.client as mqtt
 import tasqsym.assets.include.load_mqtt_config as load_mqtt_config
+import tasqsym.assets.include.wire_codec as wire_codec
+import tasqsym.assets.include.mqtt_session as mqtt_session
+import tasqsym.assets.include.message_id as message_id
+import tasqsym.core.interface.telemetry_publisher as telemetry_publisher
+import tasqsym_encoder.network.feedback_queue as feedback_queue
 
 
 class MQTTBridgeOnServer:
 
-    def __init__(self, mqtt_envfile: str):
-        self.topic_d2c_feedback = "tasqsym/d2c/feedback"
-        self.topic_c2d_command = "tasqsym/c2d/command"
+    def __init__(self, mqtt_envfile: str, retention_count: int=256, retention_sec: float=600.):
+        """
+        mqtt_envfile:    file with the connection settings
+        retention_count: maximum number of unclaimed feedback messages to keep
+        retention_sec:   time to keep unclaimed feedback messages
+        """
+        # feedback from all devices, commands are sent to the topic of each device
+        self.topic_d2c_feedback = load_mqtt_config.device_topic('+', "d2c", "feedback")
+        self.topic_d2c_telemetry = load_mqtt_config.device_topic('+', "d2c", "telemetry")
 
-        self.connected = False
         self.feedback = None
-        self.mqtt_queue = {self.topic_d2c_feedback: {}}
+
+        # message ids are unique among devices so that a single queue is used for all devices
+        self.feedback_queue = feedback_queue.FeedbackQueue(retention_count, retention_sec)
+        self.telemetry: dict[str, dict] = {}  # latest telemetry values of each device
+
+        # capabilities are published as retained messages so that a peer connecting later still receives them
+        self.topic_codecs = "tasqsym/c2d/codecs"
+        self.topic_peer_codecs = load_mqtt_config.device_topic('+', "d2c", "codecs")
 
         connection_settings = load_mqtt_config.get_connection_settings(mqtt_envfile)
-        self.mqtt_client = load_mqtt_config.create_mqtt_client(connection_settings)
-
-        self.mqtt_client.on_connect = self.on_connect
-        self.mqtt_client.on_publish = self.on_publish
-        self.mqtt_client.on_subscribe = self.on_subscribe
-        self.mqtt_client.on_message = self.on_message
-        self.mqtt_client.on_disconnect = self.on_disconnect
-        self.mqtt_client.connect(connection_settings['MQTT_HOST_NAME'], connection_settings['MQTT_TCP_PORT'], keepalive=connection_settings["MQTT_KEEP_ALIVE_IN_SECONDS"])
-        self.mqtt_client.loop_start()
-
-        elapsed = 0
-        while not self.connected and elapsed < 5:
-            time.sleep(1.)
-            elapsed += 1
-        if elapsed == 5:
-            print('failed connection timeout')
-            sys.exit(0)
-
-        (_subscribe_result, subscribe_mid) = self.mqtt_client.subscribe(self.topic_d2c_feedback)
-    def on_connect(self, _client, _userdata, _flags, rc):
-        self.connected = (rc == mqtt.MQTT_ERR_SUCCESS)
-    def on_publish(self, _client, _userdata, mid):
-        print(f"Sent publish with message id {mid}")
-    def on_subscribe(self, _client, _userdata, mid, _granted_qos):
-        print(f"Subscribe for message id {mid} acknowledged by MQTT broker")
+        self.default_device_id = connection_settings["MQTT_DEVICE_ID"]  # used if a command does not specify the device
+        self.codec_preference = connection_settings["MQTT_WIRE_CODECS"]
+        self.codec = wire_codec.WireCodec(self.codec_preference)  # only used for the announcement and decoding
+        self.device_codecs: dict[str, wire_codec.WireCodec] = {}  # negotiated per device
+
+        # reconnects on broker/network outages instead of exiting
+        # commands are not buffered while offline: a late command (e.g., a plan the operator abandoned) is unsafe for the robot,
+        # the command then gets no feedback and the wait for it times out
+        self.session = mqtt_session.MQTTSession(
+            connection_settings, [self.topic_d2c_feedback, self.topic_peer_codecs, self.topic_d2c_telemetry],
+            self.on_message, self.on_connected,
+            cleared_on_loss=self.topic_codecs)  # so that a crashed server does not leave outdated capabilities
+        self.mqtt_client = self.session.mqtt_client
+        self.session.start()
+
+    @property
+    def connected(self) -> bool: return self.session.connected
+    def on_connected(self):
+        self.session.publish(self.topic_codecs, json.dumps(self.codec.capabilities()), retain=True)
     def on_message(self, _client, _userdata, message):
+        if mqtt.topic_matches_sub(self.topic_d2c_telemetry, message.topic):
+            device_id = load_mqtt_config.device_from_topic(message.topic)
+            self.telemetry[device_id] = telemetry_publisher.mergeTelemetry(self.telemetry.get(device_id, {}), self.codec.decode(message.payload))
+            return
         print(f"Received message on topic {message.topic} with payload {message.payload}")
-        msg = json.loads(message.payload)
-        self.mqtt_queue[message.topic][msg["id"]] = msg
-    def on_disconnect(self, _client, _userdata, rc):
-        print("Received disconnect with error='{}'".format(mqtt.error_string(rc)))
+        if mqtt.topic_matches_sub(self.topic_peer_codecs, message.topic):
+            device_id = load_mqtt_config.device_from_topic(message.topic)
+            if len(message.payload) == 0: self.device_codecs.pop(device_id, None)  # retained capabilities cleared
+            else: self.getDeviceCodec(device_id).negotiate(json.loads(message.payload))
+            return
+        if not mqtt.topic_matches_sub(self.topic_d2c_feedback, message.topic): return  # some brokers match wildcards loosely
+        msg = self.codec.decode(message.payload)
+        self.feedback_queue.put(msg)
+
+    def getDeviceCodec(self, device_id: str) -> wire_codec.WireCodec:
+        if device_id not in self.device_codecs: self.device_codecs[device_id] = wire_codec.WireCodec(self.codec_preference)
+        return self.device_codecs[device_id]
 
-    def send_command(self, cmd, rest) -> int:
-        timestamp = int(time.strftime("%Y%m%d%H%M%S", time.localtime()))
+    def send_command(self, cmd, rest, device_id: str="") -> str:
+        """
+        cmd:       command name
+        rest:      content of the command
+        device_id: core to send the command to (MQTT_DEVICE_ID of the server if empty)
+        """
+        if device_id == "": device_id = self.default_device_id
+        timestamp = message_id.newMessageId()  # ids are time-ordered
         data = {
             "id": timestamp,
             "command": cmd
         }
         data = {**data, **rest}
-        # TODO: send_command to get topic (device id) as arg
-        self.mqtt_client.publish(self.topic_c2d_command, json.dumps(data))
+        topic = load_mqtt_config.device_topic(device_id, "c2d", "command")
+        if not self.session.publish(topic, self.getDeviceCodec(device_id).encode(data), buffered=False):
+            print("mqtt warning: not connected, could not send command %s %s" % (cmd, timestamp))
         return timestamp
 
-    async def wait_feedback(self, timestamp) -> bool:
-        print("waiting for %d in topic %s" % (timestamp, self.topic_d2c_feedback))
+    async def wait_feedback(self, timestamp, timeout_sec: float=None) -> bool:
+        """timeout_sec: give up waiting after this time (wait forever if None)"""
+        print("waiting for %s in topic %s" % (timestamp, self.topic_d2c_feedback))
         try:
-            while timestamp not in self.mqtt_queue[self.topic_d2c_feedback]:
-                await asyncio.sleep(.1)
-            self.feedback = self.mqtt_queue[self.topic_d2c_feedback].pop(timestamp)
+            self.feedback = await asyncio.wait_for(self.feedback_queue.wait(timestamp), timeout_sec)
+        except asyncio.TimeoutError:
+            print('timed out waiting for %s (connection health: %s)' % (timestamp, self.session.health()))
+            self.feedback = None
+            return False
         except asyncio.CancelledError:
             print('cancelled during monitoring')
             self.feedback = None
@@ -80,22 +111,20 @@ class MQTTBridgeOnServer:
     async def wait_any_feedback(self, after_this_timestamp) -> bool:
         print("waiting for any feedback in topic %s" % (self.topic_d2c_feedback))
         try:
-            while True:
-                found_stamps = []
-                for stamp, msg in self.mqtt_queue[self.topic_d2c_feedback].items():
-                    if stamp > after_this_timestamp:
-                        found_stamps.append(stamp)
-                if len(found_stamps) > 0:
-                    found_stamps.sort()
-                    timestamp = found_stamps[0]
-                    break
-                await asyncio.sleep(.1)
-            self.feedback = self.mqtt_queue[self.topic_d2c_feedback].pop(timestamp)
+            self.feedback = await self.feedback_queue.waitAny(after_this_timestamp)
         except asyncio.CancelledError:
             print('cancelled during monitoring')
             self.feedback = None
             return False
         return True
 
+    def get_telemetry(self, device_id: str="") -> dict:
+        """Latest telemetry values of the device (MQTT_DEVICE_ID of the server if empty)."""
+        if device_id == "": device_id = self.default_device_id
+        return self.telemetry.get(device_id, {})
+
+    def health(self) -> dict: return self.session.health()
+
     def disconnect(self):
-        self.mqtt_client.disconnect()
\ No newline at end of file
+        self.session.clearRetained(self.topic_codecs)  # the last will is not sent on a normal disconnection
+        self.session.stop()
\ No newline at end of file
@@ -0,0 +1,68 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+
+
+class OutboundQueue:
+    """
+    Messages to one websocket client, sent in order by a writer task so that the senders (planning, broadcasts) never wait for the client.
+
+    A client which does not keep up (more than max_pending messages waiting, or a message not sent within send_timeout_sec)
+    is disconnected instead of holding the messages in memory.
+    """
+
+    def __init__(self, websocket, max_pending: int=1000, send_timeout_sec: float=10.):
+        """
+        websocket:        connection to send to (any object with send_text() and close() coroutines)
+        max_pending:      maximum number of messages waiting to be sent
+        send_timeout_sec: maximum time to send a message
+        """
+        self.websocket = websocket
+        self.send_timeout_sec = send_timeout_sec
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self.closed = False
+        self.writer = asyncio.create_task(self._write())
+
+    def put(self, message: str) -> bool:
+        """return: False if the message was not queued (closed, or the client was too slow and is disconnected)"""
+        if self.closed: return False
+        try: self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            print("outbound queue full, disconnecting the slow client")
+            self.abort()
+            return False
+        return True
+
+    def close(self):
+        """Close the connection once the queued messages are sent."""
+        if self.closed: return
+        self.closed = True
+        try: self.queue.put_nowait(None)
+        except asyncio.QueueFull: self.abort()
+
+    def abort(self):
+        """Close the connection without sending the queued messages."""
+        self.closed = True
+        if self.writer.done(): return
+        self.writer.cancel()
+        asyncio.create_task(self._close_websocket())  # the receiving side then handles the disconnection
+
+    async def _write(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                if message is None: break  # closed
+                await asyncio.wait_for(self.websocket.send_text(message), self.send_timeout_sec)
+        except asyncio.TimeoutError:
+            print("could not send a message within %s seconds, disconnecting the slow client" % self.send_timeout_sec)
+            self.closed = True
+        except asyncio.CancelledError: return  # aborted (closed by abort())
+        except Exception: self.closed = True  # disconnected by the client (handled by the receiving side)
+        await self._close_websocket()
+
+    async def _close_websocket(self):
+        try: await asyncio.wait_for(self.websocket.close(), self.send_timeout_sec)
+        except Exception: pass  # already closed
@@ -0,0 +1,129 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+import tasqsym.assets.include.stream_transport as stream_transport
+import tasqsym.assets.include.wire_codec as wire_codec
+import tasqsym.assets.include.message_id as message_id
+import tasqsym.core.interface.telemetry_publisher as telemetry_publisher
+import tasqsym_encoder.network.feedback_queue as feedback_queue
+
+
+class SocketBridgeOnServer:
+    """
+    Same interface as MQTTBridgeOnServer but connects to the core over a Unix domain socket or a TCP loopback port.
+    The connection is opened on the first command and reopened on the next command if the core restarted.
+    Waits for the commands lost with the connection (not sent, or sent but not responded to) fail instead of waiting for the core.
+    """
+
+    def __init__(self, envfile: str, retention_count: int=256, retention_sec: float=600.):
+        self.feedback = None
+        self.feedback_queue = feedback_queue.FeedbackQueue(retention_count, retention_sec)
+        self.telemetry: dict = {}  # latest telemetry values of the core
+
+        socket_settings = stream_transport.get_socket_settings(envfile)
+        self.address = socket_settings["TASQSYM_SOCKET_ADDRESS"]
+        self.codec = wire_codec.WireCodec(socket_settings["TASQSYM_WIRE_CODECS"])
+
+        self.writer: asyncio.StreamWriter = None
+        self.pending_commands: list[dict] = []  # commands sent before the connection is ready
+        self.outstanding: set[str] = set()  # ids of the commands sent on the connection and not responded to yet
+        self._connection_task: asyncio.Task = None
+
+    def send_command(self, cmd, rest, device_id: str="") -> str:
+        """device_id is ignored as the bridge connects to a single core."""
+        timestamp = message_id.newMessageId()  # ids are time-ordered
+        data = {
+            "id": timestamp,
+            "command": cmd
+        }
+        data = {**data, **rest}
+        if self.writer is not None:
+            self.writer.write(stream_transport.pack_frame(self.codec.encode(data)))
+            self.outstanding.add(timestamp)
+        else:
+            self.pending_commands.append(data)
+            if self._connection_task is None or self._connection_task.done():
+                self._connection_task = asyncio.get_running_loop().create_task(self._connectionLoop())
+        return timestamp
+
+    async def _connectionLoop(self):
+        try: reader, writer = await stream_transport.open_connection(self.address)
+        except OSError as e:
+            print("could not connect to the core on %s: %s (will retry on the next command)" % (self.address, e))
+            self._failCommands("could not connect to the core")
+            return
+
+        try:
+            # negotiate the codec before sending the queued commands
+            writer.write(stream_transport.hello_frame(self.codec.capabilities()))
+            msg = self.codec.decode(await stream_transport.read_frame(reader))
+            if "wire_codecs" in msg: self.codec.negotiate(msg["wire_codecs"])
+            else: self.feedback_queue.put(msg)
+
+            self.writer = writer
+            for data in self.pending_commands:
+                writer.write(stream_transport.pack_frame(self.codec.encode(data)))
+                self.outstanding.add(data["id"])
+            self.pending_commands = []
+
+            while True:
+                msg = self.codec.decode(await stream_transport.read_frame(reader))
+                if msg.get("type") == "telemetry":
+                    self.telemetry = telemetry_publisher.mergeTelemetry(self.telemetry, msg)
+                    continue
+                print("Received message %s" % msg)
+                self.outstanding.discard(msg.get("id"))
+                self.feedback_queue.put(msg)
+        except stream_transport.FrameSizeError as e:
+            print("closing the core connection: %s" % e)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            print("core disconnected")
+        finally:
+            self.writer = None
+            self.codec.reset()
+            writer.close()
+            self._failCommands("core disconnected")
+
+    def _failCommands(self, reason: str):
+        """Fail the waits for the commands which will not be responded to."""
+        msg_ids = list(self.outstanding) + [data["id"] for data in self.pending_commands]
+        self.outstanding = set()
+        self.pending_commands = []
+        if len(msg_ids) > 0: self.feedback_queue.fail(msg_ids, reason)
+
+    async def wait_feedback(self, timestamp, timeout_sec: float=None) -> bool:
+        """timeout_sec: give up waiting after this time (wait forever if None)"""
+        print("waiting for %s on %s" % (timestamp, self.address))
+        try:
+            self.feedback = await asyncio.wait_for(self.feedback_queue.wait(timestamp), timeout_sec)
+        except asyncio.TimeoutError:
+            print('timed out waiting for %s' % timestamp)
+            self.feedback = None
+            return False
+        except ConnectionError as e:
+            print('no feedback for %s: %s' % (timestamp, e))
+            self.feedback = None
+            return False
+        except asyncio.CancelledError:
+            print('cancelled during monitoring')
+            self.feedback = None
+            return False
+        return True
+
+    async def wait_any_feedback(self, after_this_timestamp) -> bool:
+        print("waiting for any feedback on %s" % self.address)
+        try:
+            self.feedback = await self.feedback_queue.waitAny(after_this_timestamp)
+        except asyncio.CancelledError:
+            print('cancelled during monitoring')
+            self.feedback = None
+            return False
+        return True
+
+    def get_telemetry(self, device_id: str="") -> dict: return self.telemetry
+
+    def disconnect(self):
+        if self._connection_task is not None: self._connection_task.cancel()
@@ -0,0 +1,87 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Load test of the encoder server: opens concurrent websocket sessions, each sending instructions as the UI does,
+and reports the throughput and the latencies. Run the server with LLM_BACKEND=offline for a repeatable baseline, e.g.:
+
+python ./src/tasqsym_encoder/run_load_test.py --sessions 32 --rounds 4 --confirm
+"""
+
+import time
+import argparse
+import asyncio
+import statistics
+import websockets
+
+
+async def wait_robot_message(websocket, stats: dict) -> str:
+    """Receive until the response to the last message (records the time of the first streamed piece)."""
+    while True:
+        message = await asyncio.wait_for(websocket.recv(), pargs.timeout)
+        if message.startswith("CONSOLE_LOG: partial response: ") and "first_piece" not in stats: stats["first_piece"] = time.monotonic()
+        if message.startswith("Robot:"): return message
+
+
+async def run_session(index: int, results: dict):
+    async with websockets.connect("%s/ws/%s_%d" % (pargs.url, pargs.prefix, index), max_size=None) as websocket:
+        for _ in range(pargs.rounds):
+            stats = {}
+            start = time.monotonic()
+            try:
+                await websocket.send(pargs.instruction)
+                message = await wait_robot_message(websocket, stats)
+                results["plan"].append(time.monotonic() - start)
+                if "first_piece" in stats: results["first_piece"].append(stats["first_piece"] - start)
+                if not message.startswith("Robot: Please enter 'Y'"):
+                    results["errors"].append("session %d: no task plan (%s)" % (index, message[:80]))
+                    continue
+                if pargs.confirm:
+                    confirmed = time.monotonic()
+                    await websocket.send("y")
+                    await wait_robot_message(websocket, stats)
+                    results["confirm"].append(time.monotonic() - confirmed)
+                results["total"].append(time.monotonic() - start)
+            except asyncio.TimeoutError:
+                results["errors"].append("session %d: timed out" % index)
+
+
+def summary(name: str, latencies: list[float]) -> str:
+    if len(latencies) == 0: return "%-12s -" % name
+    latencies = sorted(latencies)
+    def percentile(p: float) -> float: return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+    return "%-12s n=%d mean=%.3fs p50=%.3fs p90=%.3fs p99=%.3fs max=%.3fs" % (
+        name, len(latencies), statistics.mean(latencies), percentile(.5), percentile(.9), percentile(.99), latencies[-1])
+
+
+async def main():
+    results = {"plan": [], "first_piece": [], "confirm": [], "total": [], "errors": []}
+    start = time.monotonic()
+    await asyncio.gather(*[run_session(i, results) for i in range(pargs.sessions)])
+    elapsed = time.monotonic() - start
+
+    print("sessions: %d, rounds: %d, elapsed: %.2fs, throughput: %.2f instructions/s" % (
+        pargs.sessions, pargs.rounds, elapsed, len(results["total"]) / elapsed))
+    print(summary("first piece", results["first_piece"]))
+    print(summary("task plan", results["plan"]))
+    if pargs.confirm: print(summary("confirm", results["confirm"]))
+    print(summary("total", results["total"]))
+    print("errors: %d" % len(results["errors"]))
+    for error in results["errors"][:10]: print("  " + error)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="ws://localhost:9100", help="address of the encoder server")
+    parser.add_argument("--sessions", type=int, default=8, help="number of concurrent sessions")
+    parser.add_argument("--rounds", type=int, default=1, help="instructions sent by each session (one after the other)")
+    parser.add_argument("--instruction", default="Bring the empty bottle to the trash can.", help="instruction sent by every session")
+    parser.add_argument("--confirm", action="store_true", help="add if confirming the task plans (also measures sending the task)")
+    parser.add_argument("--timeout", type=float, default=120., help="time in seconds to wait for a response")
+    parser.add_argument("--prefix", default="load", help="prefix of the session ids (use different prefixes for runs on the same server)")
+
+    pargs = parser.parse_args()
+
+    asyncio.run(main())
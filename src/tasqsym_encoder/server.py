@@ -6,6 +6,7 @@
 import time
 import json
 import os
+import asyncio
 import fastapi
 from fastapi import WebSocket, Request, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
@@ -13,13 +14,21 @@ from fastapi.templating import Jinja2Templates
 import sys
 import signal
 import enum
+import collections
+import typing
 import dotenv
+import pydantic
 import uvicorn
 
 import tasqsym.core.common.constants as tss_constants
+import tasqsym.core.common.structs as tss_structs
 import tasqsym.core.interface.config_loader as config_loader
 
 import tasqsym_encoder.aimodel.aimodel_base as aimodel_base
+import tasqsym_encoder.aimodel.response_cache as response_cache
+import tasqsym_encoder.aimodel.rate_limiter as rate_limiter
+import tasqsym_encoder.network.outbound_queue as outbound_queue
+import tasqsym_encoder.artifact_writer as artifact_writer
 
 
 """
@@ -32,6 +41,22 @@ AZURE_OPENAI_DEPLOYMENT_NAME_CHATGPT=
 
 # below required if --aoai flag disabled
 OPENAI_API_KEY=
+
+# below optional, limits of the deployment shared by all sessions (defaults 60 requests/min, no token limit, 8 concurrent requests)
+LLM_REQUESTS_PER_MINUTE=
+LLM_TOKENS_PER_MINUTE=
+LLM_MAX_CONCURRENCY=
+
+# below to test without accessing the network (responses are replayed from the recordings, or taken from the file or the example prompts)
+LLM_BACKEND=offline
+OFFLINE_RESPONSE_FILE=
+OFFLINE_RECORDINGS_FILE=
+OFFLINE_LATENCY_SEC=
+OFFLINE_LATENCY_DIST=
+OFFLINE_LATENCY_SPREAD=
+OFFLINE_SEED=
+
+# below optional, LLM_BACKEND=MODULE_PATH.CLASS to use another client, LLM_RECORD_FILE= to record the completions to replay offline
 """
 
 import argparse
@@ -41,9 +66,22 @@ parser.add_argument("--aimodel", help="aimodel python module as MODULE_PATH.CLAS
 parser.add_argument("--config", help="tasqsym config file also including data such as description about the environment")
 parser.add_argument("--outdir", default="", help="directory to store intermediate outputs")
 parser.add_argument("--aoai", action="store_true", help="add if using Azure OpenAI")
-parser.add_argument("--connection", help="connection style to tasqsym (mqtt or empty) will not connect to tasqsym core if empty", default="")
+parser.add_argument("--connection", help="connection style to tasqsym (mqtt, socket, inprocess, file or empty) will not connect to tasqsym core if empty", default="")
+parser.add_argument("--coreconfig", default="", help="config file to pre-load on the core if --connection inprocess")
 parser.add_argument("--aioutput", action="store_true", help="add if showing aimodel output plans instead of the behavior tree")
 parser.add_argument("--initcore", action="store_true", help="add if sending configurations loaded on the server to the core")
+parser.add_argument("--response_cache", action="store_true", help="add if reusing the responses for the same instruction and environment")
+parser.add_argument("--cachedir", default="", help="directory to keep the response cache across restarts (memory only if empty)")
+parser.add_argument("--cache_ttl", type=float, default=86400., help="time in seconds until a cached response expires")
+parser.add_argument("--max_sessions", type=int, default=100, help="maximum number of sessions, the least recently active session is closed for a new one (no limit if 0)")
+parser.add_argument("--session_timeout", type=float, default=3600., help="time in seconds until an idle session is closed (never if 0)")
+parser.add_argument("--send_queue", type=int, default=1000, help="messages waiting to be sent to a session before the client is considered too slow and disconnected")
+parser.add_argument("--send_timeout", type=float, default=10., help="time in seconds to send a message before the client is considered too slow and disconnected")
+parser.add_argument("--artifact_compress", action="store_true", help="add if storing the outputs in --outdir gzip compressed")
+parser.add_argument("--artifact_max", type=int, default=0, help="maximum number of outputs kept in --outdir, the oldest are removed (no limit if 0)")
+parser.add_argument("--artifact_queue", type=int, default=256, help="outputs waiting to be written to --outdir, outputs beyond are dropped")
+parser.add_argument("--feedback_timeout", type=float, default=30., help="time in seconds to wait for the core to respond to a command before reporting a failure (wait forever if 0)")
+parser.add_argument("--batch_workers", type=int, default=16, help="instructions of a batch (/encode_batch) encoded at the same time")
 
 pargs, unknown = parser.parse_known_args()
 
@@ -66,6 +104,17 @@ if pargs.connection == "mqtt":
     """
     import tasqsym_encoder.network.mqtt_bridge as mqtt_bridge
     network_client = mqtt_bridge.MQTTBridgeOnServer(pargs.credentials)
+elif pargs.connection == "socket":
+    """
+    below optional in credentials file content:
+    TASQSYM_SOCKET_ADDRESS=  # unix:<path> or tcp:<host>:<port> (default tcp:127.0.0.1:9110)
+    """
+    import tasqsym_encoder.network.socket_bridge as socket_bridge
+    network_client = socket_bridge.SocketBridgeOnServer(pargs.credentials)
+elif pargs.connection == "inprocess":
+    # the core runs in the event loop of the server (see start_inprocess_core)
+    import tasqsym_encoder.network.inprocess_bridge as inprocess_bridge
+    network_client = inprocess_bridge.InProcessBridgeOnServer()
 elif pargs.connection == "file":
     import tasqsym_encoder.network.file_access as file_access
     network_client = file_access.LocalFileBridge(pargs.credentials)
@@ -74,6 +123,12 @@ elif pargs.connection != "":
 
 azure_credentials = dotenv.dotenv_values(pargs.credentials)
 output_dir = pargs.outdir
+# outputs are written in the background (identical outputs stored once)
+plan_artifacts = artifact_writer.ArtifactWriter(
+    output_dir, max_pending=pargs.artifact_queue, compress=pargs.artifact_compress, max_artifacts=pargs.artifact_max) if output_dir != "" else None
+
+# shared among the sessions
+llm_response_cache = response_cache.ResponseCache(pargs.cachedir, ttl_sec=pargs.cache_ttl) if pargs.response_cache else None
 
 # load AI model
 aimodel_modstr = pargs.aimodel
@@ -120,6 +175,13 @@ templates = Jinja2Templates(directory="../robotics-task-sequencer-system-framewo
 
 app = fastapi.FastAPI()
 
+@app.on_event("startup")
+async def start_inprocess_core():
+    global inprocess_core
+    if pargs.connection != "inprocess": return
+    core_main = inprocess_bridge.load_core_main()
+    inprocess_core = asyncio.create_task(core_main.distribute_mode(pargs.coreconfig, network_client.core_bridge))
+
 
 class ServerState(enum.Enum):
     ON_TASK_REQUEST = "wait task request"
@@ -135,93 +197,220 @@ class ServerMemory:
         self.task_plan = task_plan
         self.compiled_plan = compiled_plan
 
+def create_aimodel() -> aimodel_base.AIModel:
+    model = getattr(aimodel_module, aimodel_class_name)(
+        azure_credentials,
+        use_azure=use_azureOpenAI,
+        logdir=output_dir)
+    model.shared_response_cache = llm_response_cache
+    model.shared_artifact_writer = plan_artifacts
+    return model
+
+class DataEngineOverlay:
+    """
+    Reads through to the data engine but keeps the updates to itself,
+    so that encoding an instruction of a batch does not change the environment state seen by the other instructions and sessions.
+    """
+
+    def __init__(self, data_engine):
+        self.data_engine = data_engine
+        self.updates: dict[str, dict] = {}
+
+    def getData(self, cmd: str) -> tuple[tss_structs.Status, dict]:
+        if cmd in self.updates: return tss_structs.STATUS_SUCCESS, self.updates[cmd]
+        return self.data_engine.getData(cmd)
+
+    def updateData(self, cmd: str, data: dict) -> tss_structs.Status:
+        self.updates[cmd] = data
+        return tss_structs.STATUS_SUCCESS
+
+    def commit(self):
+        """Write the updates to the data engine (e.g., once the plan is sent to the robot)."""
+        for cmd, data in self.updates.items(): self.data_engine.updateData(cmd, data)
+
+    def __getattr__(self, name: str):
+        return getattr(self.data_engine, name)
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, max_sessions: int=0, idle_timeout_sec: float=0., send_queue_size: int=1000, send_timeout_sec: float=10.):
+        """
+        max_sessions:     the least recently active session is closed when a session connects over this number (no limit if 0)
+        idle_timeout_sec: sessions without input for this time are closed by evict_idle() (never if 0)
+        send_queue_size:  messages waiting to be sent to a session before its client is disconnected as too slow
+        send_timeout_sec: time to send a message before the client is disconnected as too slow
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout_sec = idle_timeout_sec
+        self.send_queue_size = send_queue_size
+        self.send_timeout_sec = send_timeout_sec
         self.connections: dict[str, WebSocket] = {}
+        self.outbound: dict[str, outbound_queue.OutboundQueue] = {}  # messages are sent by a writer task per session
         self.models: dict[str, aimodel_base.AIModel] = {}
         self.states: dict[str, ServerMemory] = {}
+        self.devices: dict[str, str] = {}  # robot (core device id) each session sends its commands to
+        self.last_active: collections.OrderedDict[str, float] = collections.OrderedDict()  # least recently active first
+        self.busy: set[str] = set()  # sessions processing an input (not evicted)
 
-    async def connect(self, websocket: WebSocket, session_id):
+    async def connect(self, websocket: WebSocket, session_id, device_id: str="") -> bool:
+        """return: whether the session was opened"""
         if session_id in self.connections:
+            await websocket.accept()
             await websocket.send_text("Error: Session ID already in use.")
             await websocket.close()
-            return
+            return False
 
         await websocket.accept()
+        while self.max_sessions > 0 and len(self.connections) >= self.max_sessions:
+            idle_sessions = [k for k in self.last_active if k not in self.busy]
+            if len(idle_sessions) == 0:
+                await websocket.send_text("Error: Too many sessions, please retry later.")
+                await websocket.close()
+                return False
+            await self.evict(idle_sessions[0], "the maximum number of sessions was reached")
+
         self.connections[session_id] = websocket
+        self.outbound[session_id] = outbound_queue.OutboundQueue(websocket, self.send_queue_size, self.send_timeout_sec)
 
-        self.models[session_id] = getattr(aimodel_module, aimodel_class_name)(
-            azure_credentials,
-            use_azure=use_azureOpenAI,
-            logdir=output_dir)
+        self.models[session_id] = create_aimodel()
         self.states[session_id] = ServerMemory()
+        self.devices[session_id] = device_id
+        self.touch(session_id)
+        return True
+
+    def touch(self, session_id: str):
+        """Record an activity of the session."""
+        if session_id not in self.connections: return
+        self.last_active[session_id] = time.monotonic()
+        self.last_active.move_to_end(session_id)
 
     def resetstates(self, session_id: str):
         self.states[session_id] = ServerMemory()
 
-    def disconnect(self, session_id: str):
+    def disconnect(self, session_id: str, websocket: WebSocket=None):
+        """websocket: only disconnect if the session is still of this connection (None to disconnect in any case)"""
         if session_id not in self.connections: return
+        if websocket is not None and self.connections[session_id] is not websocket: return  # the session id was reused after eviction
         self.connections.pop(session_id)
-        del self.models[session_id]
+        self.outbound.pop(session_id).close()  # after sending the queued messages
+        self.models.pop(session_id, None)
+        self.states.pop(session_id, None)
+        self.devices.pop(session_id, None)
+        self.last_active.pop(session_id, None)
+        self.busy.discard(session_id)
+
+    async def evict(self, session_id: str, reason: str):
+        """Close a session and release its model."""
+        if session_id not in self.connections: return
+        print("closing session %s: %s" % (session_id, reason))
+        self.outbound[session_id].put(f"Robot: Closed the session as {reason}. Please reload the page to start a new session.")
+        self.disconnect(session_id)
+
+    async def evict_idle(self):
+        if self.idle_timeout_sec <= 0: return
+        now = time.monotonic()
+        for session_id, last_active in list(self.last_active.items()):
+            if now - last_active < self.idle_timeout_sec: break  # the following sessions were active more recently
+            if session_id in self.busy: continue
+            await self.evict(session_id, "it was idle")
 
     async def send_personal_message(self, message: str, session_id: str):
-        if session_id not in self.connections: return
-        await self.connections[session_id].send_text(message)
+        """Queue the message, returns without waiting for the client."""
+        if session_id not in self.outbound: return
+        self.outbound[session_id].put(message)
 
     async def broadcast(self, message: str):
-        for _, connection in self.connections.items():
-            await connection.send_text(message)
+        """Queue the message to every session, the writer tasks send to the clients concurrently."""
+        for queue in list(self.outbound.values()): queue.put(message)
+
+manager = ConnectionManager(pargs.max_sessions, pargs.session_timeout, pargs.send_queue, pargs.send_timeout)
 
-manager = ConnectionManager()
 
+@app.on_event("startup")
+async def start_session_eviction():
+    async def evict_idle_sessions():
+        while True:
+            await asyncio.sleep(min(60., manager.idle_timeout_sec / 4.))
+            await manager.evict_idle()
+    global session_eviction
+    if manager.idle_timeout_sec > 0: session_eviction = asyncio.create_task(evict_idle_sessions())
+
+@app.on_event("shutdown")
+def flush_artifacts():
+    if plan_artifacts is not None: plan_artifacts.close()  # write the outputs still queued
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse('ui.html', {"request": request})
 
-async def send_configs(configs: dict):
-    if encode_only_test or (not send_configuration_to_core): return
+# the core or the broker may be unreachable, commands without a response within this time are reported as failed
+feedback_timeout_sec = pargs.feedback_timeout if pargs.feedback_timeout > 0 else None
+
+async def send_configs(configs: dict, device_id: str="") -> bool:
+    """return: False if the core did not respond to the setup"""
+    if encode_only_test or (not send_configuration_to_core): return True
 
-    timestamp_setup = network_client.send_command("setup", {"content": configs})
+    timestamp_setup = network_client.send_command("setup", {"content": configs}, device_id)
     print("timestamp--- ", timestamp_setup)
-    await network_client.wait_feedback(timestamp_setup)
+    responded = await network_client.wait_feedback(timestamp_setup, timeout_sec=feedback_timeout_sec)
     print(network_client.feedback)
+    return responded
 
-async def send_task(bt: dict):
+async def send_task(bt: dict, device_id: str=""):
     if encode_only_test: return
 
     content = {
         "content": bt,
         "node_pointer": []
     }
-    timestamp_run = network_client.send_command("run", content)
+    timestamp_run = network_client.send_command("run", content, device_id)
     print("timestamp--- ", timestamp_run)
     # await network_client.wait_feedback(timestamp_run)  # comment-in for synchronous call
     print(network_client.feedback)
 
-async def send_cancel():
+async def send_cancel(device_id: str=""):
     if encode_only_test: return
 
-    timestamp_abort = network_client.send_command("abort", {"emergency": False})
+    timestamp_abort = network_client.send_command("abort", {"emergency": False}, device_id)
     print("timestamp--- ", timestamp_abort)
-    await network_client.wait_feedback(timestamp_abort)  # depending on timing may fail
+    responded = await network_client.wait_feedback(timestamp_abort, timeout_sec=feedback_timeout_sec)  # depending on timing may fail
     print(network_client.feedback)
 
+    if not responded: return f"Could not confirm the cancellation: no response from the robot within {pargs.feedback_timeout} seconds. Please check the connection to the robot."
     return f"Cancelled instructions. Please send a new instruction."
 
-async def send_estop():
+async def send_estop(device_id: str=""):
     if encode_only_test: return
 
-    timestamp_abort = network_client.send_command("abort", {"emergency": True})
+    timestamp_abort = network_client.send_command("abort", {"emergency": True}, device_id)
     print("timestamp--- ", timestamp_abort)
-    await network_client.wait_feedback(timestamp_abort)
+    responded = await network_client.wait_feedback(timestamp_abort, timeout_sec=feedback_timeout_sec)
     print(network_client.feedback)
 
+    if not responded: return f"Could not confirm the emergency stop: no response from the robot within {pargs.feedback_timeout} seconds. Please stop the robot locally and check the connection."
     return f"Sent emergency stop. Please send recovery instructions."
 
 async def notify(message, session_id: str):
     await manager.send_personal_message(message, session_id)
 
+class PartialResponseForwarder:
+    """Forwards the streamed response of the language model to the UI (pieces are coalesced to limit the number of messages)."""
+
+    def __init__(self, session_id: str, interval_sec: float=0.1):
+        self.session_id = session_id
+        self.interval_sec = interval_sec
+        self.pending = ""
+        self.last_sent = 0.
+
+    async def __call__(self, piece: str):
+        self.pending += piece
+        if time.monotonic() - self.last_sent >= self.interval_sec: await self.flush()
+
+    async def flush(self):
+        if self.pending == "": return
+        await notify(f"CONSOLE_LOG: partial response: " + self.pending, self.session_id)
+        self.pending = ""
+        self.last_sent = time.monotonic()
+
 async def compile(task_plan: dict, session_id: str):
     """
     The task plan output (actions from GPT) is not a direct mapping to the skills in core.
@@ -229,28 +418,36 @@ async def compile(task_plan: dict, session_id: str):
     but, GPT will output them as two separate actions: WalkForward() and Navigate().
     """
     await notify(f"CONSOLE_LOG: compiling task model", session_id)
+    return encode_task_plan(manager.models[session_id], task_plan, cfl.data_engine)
+
+def encode_task_plan(model: aimodel_base.AIModel, task_plan: dict, data_engine, tag: str="") -> dict:
+    """
+    model:       model which generated the task plan
+    task_plan:   formatted response of the model
+    data_engine: data engine to load from and to update with the expected outcome
+    tag:         added to the names of the saved outputs (if any) to distinguish plans compiled at the same time
+
+    return: the compiled behavior tree
+    """
     action_sequence = task_plan["task_sequence"]  # currently does not support branching sequence
 
     if "environment_after" in task_plan: expected_outcome_states = task_plan["environment_after"]
     else: expected_outcome_states = None
 
-    compiled_plan = manager.models[session_id].encode(action_sequence, expected_outcome_states, cfl.data_engine)
+    compiled_plan = model.encode(action_sequence, expected_outcome_states, data_engine)
 
     operation_name = (
         time.strftime(
             "%Y%m%d_%H%M%S",
             time.localtime()) +
-        "_operation")
+        "_operation" + tag)
 
-    if output_dir != "":
+    if plan_artifacts is not None:
         # save task plan output
-        fp = os.path.join(output_dir, operation_name + '_task_plan.json')
-        print(f'saving task model to {fp}')
-        with open(fp, 'w') as f: json.dump(compiled_plan, f, indent=4)
+        print(f'saving task model to {operation_name}_task_plan.json')
+        plan_artifacts.write_json(operation_name + '_task_plan', compiled_plan)
         # save intermediate format locally
-        fp = os.path.join(output_dir, operation_name + '_raw_task_plan.json')
-        print(f'saving raw task plan to {fp}')
-        with open(fp, 'w') as f: json.dump(task_plan, f, indent=4)
+        plan_artifacts.write_json(operation_name + '_raw_task_plan', task_plan)
 
     return compiled_plan
 
@@ -259,21 +456,27 @@ async def interface(user_input: str, session_id: str):
     print(user_input)
     while True:
 
-        if user_input == 'cancel': return await send_cancel()  # cancel instructions
+        device_id = manager.devices[session_id]
+
+        if user_input == 'cancel': return await send_cancel(device_id)  # cancel instructions
 
-        if user_input == 'e-stop': return await send_estop()
+        if user_input == 'e-stop': return await send_estop(device_id)
 
         if manager.states[session_id].current_state == ServerState.ON_TASK_REQUEST:
             await notify(f"CONSOLE_LOG: handle task request", session_id)
 
             # send configs to the robot the first time an instruction is given (first time is determined by whether the world is loaded already or not)
-            if len(manager.models[session_id].world) == 0: await send_configs(tss_configs)
+            if len(manager.models[session_id].world) == 0:
+                if not await send_configs(tss_configs, device_id):  # the world stays empty so that the next instruction retries
+                    return f"Could not set up the robot: no response from the robot within {pargs.feedback_timeout} seconds. Please check the connection to the robot and send the instruction again."
 
             # load data set in the data engine (always update as state might have been updated after previous instruction)
             manager.models[session_id].compile_world(cfl.data_engine)
 
             # run GPT
-            text_response = manager.models[session_id].generate(user_input, manager.models[session_id].world)
+            forwarder = PartialResponseForwarder(session_id)
+            text_response = await manager.models[session_id].generate(user_input, manager.models[session_id].world, on_partial=forwarder)
+            await forwarder.flush()
             print("result from instruction", text_response)
             format_success, json_dict = manager.models[session_id].format_response(text_response)
 
@@ -287,6 +490,7 @@ async def interface(user_input: str, session_id: str):
                 if show_output_from_ai: return f"Please enter 'Y' if the following task is okay:", json.dumps(manager.states[session_id].task_plan, indent=4)
                 else: return f"Please enter 'Y' if the following task is okay:", json.dumps(manager.states[session_id].compiled_plan, indent=4)
             else:
+                manager.models[session_id].discard_cached_response()  # do not reuse a response which could not be formatted
                 return text_response
 
         elif manager.states[session_id].current_state == ServerState.ON_USER_CONFIRMATION:
@@ -296,7 +500,9 @@ async def interface(user_input: str, session_id: str):
                 manager.models[session_id].reset_history()
             else:
                 await notify(f"CONSOLE_LOG: got correction from user", session_id)
-                text_response = manager.models[session_id].generate(user_input, manager.models[session_id].world, is_user_feedback=True)
+                forwarder = PartialResponseForwarder(session_id)
+                text_response = await manager.models[session_id].generate(user_input, manager.models[session_id].world, is_user_feedback=True, on_partial=forwarder)
+                await forwarder.flush()
                 print("result from feedback:", text_response)
                 format_success, json_dict = manager.models[session_id].format_response(text_response)
 
@@ -314,21 +520,111 @@ async def interface(user_input: str, session_id: str):
         if manager.states[session_id].current_state == ServerState.ON_TASK_SEND:
             await notify(f"CONSOLE_LOG: send task model", session_id)
 
-            await send_task(manager.states[session_id].compiled_plan)
+            await send_task(manager.states[session_id].compiled_plan, device_id)
             print("send task plan done!")
 
-            manager.states[session_id].current_state = ServerState.ON_TASK_REQUEST
+            manager.resetstates(session_id)  # the sent plans are no longer needed
 
             return f"Finished sending instructions. Please enter further instructions if any; or cancel the current instruction using the button in the buttom left."
 
+class BatchItem(pydantic.BaseModel):
+    instruction: str
+    world: typing.Optional[dict] = None  # environment given to the model instead of the one compiled from the data engine
+
+class BatchRequest(pydantic.BaseModel):
+    items: list[BatchItem]
+    auto_confirm: bool = False  # send the compiled plans to the robot in the order of the items (the items are then planned one after the other)
+    device: str = ""  # robot to send the plans to, default robot of the connection if empty
+
+async def encode_batch_item(model: aimodel_base.AIModel, item: BatchItem, tag: str) -> tuple[dict, DataEngineOverlay]:
+    model.reset_history()  # every instruction is planned on its own
+    data_engine = DataEngineOverlay(cfl.data_engine)
+    result = {"instruction": item.instruction, "success": False}
+    try:
+        model.compile_world(data_engine)
+        if item.world is not None: model.world = item.world
+        text_response = await model.generate(item.instruction, model.world)
+        format_success, json_dict = model.format_response(text_response)
+        if not format_success:
+            model.discard_cached_response()
+            result["error"] = text_response
+            return result, data_engine
+        result["task_plan"] = json_dict
+        result["compiled_plan"] = encode_task_plan(model, json_dict, data_engine, tag)
+        result["success"] = True
+    except Exception as e:  # report and continue with the other instructions
+        print("batch encode failed for %s: %s" % (item.instruction, e))
+        result["error"] = str(e)
+    return result, data_engine
+
+@app.post("/encode_batch")
+async def encode_batch(batch: BatchRequest):
+    """
+    Encode many instructions without the confirmation dialog (e.g., to precompile task catalogs).
+    Each instruction is planned concurrently and independently from the current environment state (or the world of the item),
+    the language model requests of all workers and sessions share the rate limits.
+    With auto_confirm, the plans are sent to the robot one after the other, so each instruction is planned once the previous plan
+    is sent, from the environment state expected after the previous plans (as with confirmed instructions of a session).
+    """
+    start = time.monotonic()
+    results: list[dict] = [None] * len(batch.items)
+
+    if batch.auto_confirm:
+        model = create_aimodel()
+        robot_ready = None  # the robot is set up before sending the first plan
+        for index, item in enumerate(batch.items):
+            results[index], data_engine = await encode_batch_item(model, item, "_batch%d" % index)
+            if not results[index]["success"]: continue  # not sent, the following instructions are planned from the same state
+            if robot_ready is None: robot_ready = await send_configs(tss_configs, batch.device)
+            if not robot_ready:
+                results[index]["error"] = "robot did not respond to the setup, the plan was not sent"
+                continue
+            await send_task(results[index]["compiled_plan"], batch.device)
+            data_engine.commit()  # the next instruction is planned from the state expected after this plan
+            results[index]["sent"] = True
+        return {"results": results, "elapsed_sec": round(time.monotonic() - start, 3)}
+
+    pending = collections.deque(range(len(batch.items)))
+
+    async def worker():
+        model = create_aimodel()  # reused for the instructions taken by this worker
+        while len(pending) > 0:
+            index = pending.popleft()
+            results[index], _ = await encode_batch_item(model, batch.items[index], "_batch%d" % index)
+
+    await asyncio.gather(*[worker() for _ in range(min(len(batch.items), pargs.batch_workers))])
+
+    return {"results": results, "elapsed_sec": round(time.monotonic() - start, 3)}
+
+@app.get("/telemetry")
+async def telemetry(device: str=""):
+    """Latest robot states streamed from the core (empty if the core does not send telemetry)."""
+    if encode_only_test or not hasattr(network_client, "get_telemetry"): return {}
+    return network_client.get_telemetry(device)
+
+@app.delete("/response_cache")
+async def clear_response_cache():
+    """Remove all cached responses (e.g., after updating the environment data or the skills)."""
+    if llm_response_cache is None: return {}
+    llm_response_cache.invalidate()
+    return llm_response_cache.stats()
+
+@app.get("/rate_limits")
+async def rate_limits():
+    """Requests, rate limit responses and time waited for the quota per model deployment."""
+    return rate_limiter.all_stats()
+
 @app.websocket("/ws/{session_id}")
-async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    await manager.connect(websocket, session_id)
+async def websocket_endpoint(websocket: WebSocket, session_id: str, device: str=""):
+    """device: robot to control in this session (e.g., /ws/<session_id>?device=<device_id>), default robot of the connection if empty"""
+    if not await manager.connect(websocket, session_id, device): return
     try:
         while True:
             print('waiting input...')
             data = await websocket.receive_text()
             print(data)
+            manager.touch(session_id)
+            manager.busy.add(session_id)
             if not data.startswith('['):  # "[command]" is an internal command
                 await manager.send_personal_message(f"User: {data}", session_id)
             agent_return = await interface(data, session_id)
@@ -336,8 +632,10 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                 if isinstance(agent_return, tuple): await notify(f"Robot: " + agent_return[0] + '\n' + agent_return[1], session_id)
                 else: await notify(f"Robot: " + agent_return, session_id)
             else: pass
-    except WebSocketDisconnect:
-        manager.disconnect(session_id)
+            manager.busy.discard(session_id)
+            manager.touch(session_id)
+    except WebSocketDisconnect: pass
+    finally: manager.disconnect(session_id, websocket)  # also on errors so that the session is not kept
 
 
 def signal_handler(sig, frame):
@@ -347,7 +645,10 @@ def signal_handler(sig, frame):
     for session_id in session_ids:
         manager.disconnect(session_id)
     if not encode_only_test: network_client.disconnect()
+    if plan_artifacts is not None: plan_artifacts.close()
     sys.exit(0)
-signal.signal(signal.SIGINT, signal_handler)
 
-uvicorn.run(app, host="localhost", port=9100)
\ No newline at end of file
+if __name__ == "__main__":
+    signal.signal(signal.SIGINT, signal_handler)
+
+    uvicorn.run(app, host="localhost", port=9100)
\ No newline at end of file
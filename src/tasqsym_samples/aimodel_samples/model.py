@@ -7,6 +7,7 @@ import os
 import tasqsym.core.common.constants as tss_constants
 import tasqsym.core.classes.engine_base as engine_base  # just for type hints
 import tasqsym_encoder.aimodel.aimodel_base as aimodel_base
+import tasqsym_encoder.aimodel.encode_context as encode_context
 
 
 class PickPlaceScenario(aimodel_base.AIModel):
@@ -60,7 +61,7 @@ class PickPlaceScenario(aimodel_base.AIModel):
             if data_name in expected_outcome_states:
                 data_engine.updateData(data_name, expected_outcome_states[data_name])
 
-    def my_node_parse_rule(self, node: dict, data_engine: engine_base.DataEngineBase) -> dict:
+    def my_node_parse_rule(self, node: dict, data_engine: encode_context.EncodeContext) -> dict:
         # convert to robot-execution-level skills
 
         if node['node'] == "Prepare":
@@ -87,10 +88,8 @@ class PickPlaceScenario(aimodel_base.AIModel):
             ]}
 
         elif node['node'] == "Grab":
-            _, obj_data = data_engine.getData("objects_metadata")
             target = node['@target']
-            object_situation = self._getSituationKey(obj_data[target], self.situation)
-            obj = obj_data[target][object_situation]
+            obj = data_engine.getSituationData("objects_metadata", target, self.situation, self._getSituationKey)
             return {
                 "Node": "GRASP",
                 "@grasp_type": obj["grasp_type"],
@@ -113,16 +112,13 @@ class PickPlaceScenario(aimodel_base.AIModel):
 
         elif node['node'] == "MoveToObjectOrAsset":
             _, obj_data = data_engine.getData("objects_metadata")
-            _, assets_data = data_engine.getData("assets_metadata")
             target = node['@target']
             if target in obj_data:
-                object_situation = self._getSituationKey(obj_data[target], self.situation)
-                obj = obj_data[target][object_situation]
+                obj = data_engine.getSituationData("objects_metadata", target, self.situation, self._getSituationKey)
                 context = "move the " + obj["hand_laterality"] + " hand to a " + target + " using " + obj["grasp_type"] + " grasp"
             else:
                 left_or_right = self.situation.split(" ")[0]
-                asset_situation = self._getSituationKey(assets_data[target], "default situation")
-                obj = assets_data[target][asset_situation]
+                obj = data_engine.getSituationData("assets_metadata", target, "default situation", self._getSituationKey)
                 context = "move the " + left_or_right + " hand to a " + target
 
             res = {"Sequence": []}
@@ -152,9 +148,7 @@ class PickPlaceScenario(aimodel_base.AIModel):
             return res
 
         elif node['node'] == "Release":
-            _, obj_data = data_engine.getData("objects_metadata")
-            object_situation = self._getSituationKey(obj_data[node['@target']], self.situation)
-            obj = obj_data[node['@target']][object_situation]
+            obj = data_engine.getSituationData("objects_metadata", node['@target'], self.situation, self._getSituationKey)
             return {"Sequence": [
                 {
                     "Node": "RELEASE",
@@ -169,14 +163,10 @@ class PickPlaceScenario(aimodel_base.AIModel):
             ]}
 
         elif node['node'] == "PickUp":
-            _, obj_data = data_engine.getData("objects_metadata")
-            _, assets_data = data_engine.getData("assets_metadata")
             obj_arg = node['@target']
-            object_situation = self._getSituationKey(obj_data[obj_arg], self.situation)
-            obj = obj_data[obj_arg][object_situation]
+            obj = data_engine.getSituationData("objects_metadata", obj_arg, self.situation, self._getSituationKey)
             asset_arg = node['@asset']
-            asset_situation = self._getSituationKey(assets_data[asset_arg], "default situation")
-            asset = assets_data[asset_arg][asset_situation]
+            asset = data_engine.getSituationData("assets_metadata", asset_arg, "default situation", self._getSituationKey)
             return {"Sequence": [
                 {
                     "Node": "PICK",
@@ -191,14 +181,10 @@ class PickPlaceScenario(aimodel_base.AIModel):
             ]}
 
         elif node['node'] == "Put":
-            _, obj_data = data_engine.getData("objects_metadata")
-            _, assets_data = data_engine.getData("assets_metadata")
             obj_arg = node['@target']
-            object_situation = self._getSituationKey(obj_data[obj_arg], self.situation)
-            obj = obj_data[obj_arg][object_situation]
+            obj = data_engine.getSituationData("objects_metadata", obj_arg, self.situation, self._getSituationKey)
             asset_arg = node['@asset']
-            asset_situation = self._getSituationKey(assets_data[asset_arg], "default situation")
-            asset = assets_data[asset_arg][asset_situation]
+            asset = data_engine.getSituationData("assets_metadata", asset_arg, "default situation", self._getSituationKey)
             return {
                 "Node": "PLACE",
                 "@attach_direction": asset["attach_direction"],
@@ -47,7 +47,7 @@ class SimGripperController(PhysicalRobot):
         self.base_transform = tss_structs.Pose()
         contact_link_states = [tss_structs.Pose()]
         return tss_structs.EndEffectorState(
-            ["gripper_joint"], tss_structs.JointStates([0.0]),
+            ["gripper_joint"], tss_structs.JointStates.fromValues([0.0]),
             self.parent_link, self.base_transform,
             contact_link_names, contact_annotations, contact_link_states)
 
@@ -39,7 +39,7 @@ class SimGripperModel(ModelRobot):
             """
             print("=============== setting the sim gripper to close the grippers")
             return tss_structs.EndEffectorState(
-                ["gripper_joint"], tss_structs.JointStates([1.0])
+                ["gripper_joint"], tss_structs.JointStates.fromValues([1.0])
             )
         elif task == "release":
             """
@@ -48,7 +48,7 @@ class SimGripperModel(ModelRobot):
             """
             print("=============== setting the sim gripper to open the grippers")
             return tss_structs.EndEffectorState(
-                ["gripper_joint"], tss_structs.JointStates([0.0])
+                ["gripper_joint"], tss_structs.JointStates.fromValues([0.0])
             )
         else:
             msg = "sim gripper model error: unknown task %s in getConfigurationForTask()" % task
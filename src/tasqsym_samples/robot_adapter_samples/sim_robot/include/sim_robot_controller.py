@@ -40,7 +40,7 @@ class SimRobotController(PhysicalRobot):
                         'joint_names': self.joint_names,
                         'points': [
                             {
-                                'positions': joint_values,
+                                'positions': list(joint_values),  # joint values may be a numpy array
                                 'time_from_start': {'sec': int(timesec), 'nanosec': int((timesec - int(timesec))*1000000000)}
                             }
                         ]
@@ -93,7 +93,7 @@ class SimRobotController(PhysicalRobot):
         print("=============== got the latest state from the sim robot controller")
         return tss_structs.ManipulatorState(
             self.joint_names,
-            tss_structs.JointStates([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
+            tss_structs.JointStates.fromValues([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
             self.base_transform
         )
 
@@ -3,6 +3,8 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------------------------
 
+import numpy as np
+
 import tasqsym.core.common.constants as tss_constants
 import tasqsym.core.common.structs as tss_structs
 from tasqsym.core.classes.model_robot import ModelRobot
@@ -50,7 +52,7 @@ class SimRobotModel(ModelRobot):
                 neck_angles = [0.0, 0.0, 0.0]
             return tss_structs.ManipulatorState(
                 self.joint_names,
-                tss_structs.JointStates(latest_state.joint_states.positions[0:5] + neck_angles),
+                tss_structs.JointStates.fromValues(np.concatenate((latest_state.joint_states.positions[0:5], neck_angles))),
                 latest_state.base_state
             )
         elif task == "bring":
@@ -73,7 +75,7 @@ class SimRobotModel(ModelRobot):
             print("=============== setting the sim robot to secure object into a home position")
             return tss_structs.ManipulatorState(
                 self.joint_names,
-                tss_structs.JointStates([0.0, 0.0, -0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
+                tss_structs.JointStates.fromValues([0.0, 0.0, -0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
                 latest_state.base_state
             )
         else:
@@ -7,6 +7,7 @@ import json
 import os
 import tasqsym.core.classes.engine_base as engine_base  # just for type hints
 import tasqsym_encoder.aimodel.aimodel_base as aimodel_base
+import tasqsym_encoder.aimodel.prompt_assets as prompt_assets
 
 
 class ComplexScenario(aimodel_base.AIModel):
@@ -405,7 +406,7 @@ class ComplexScenario(aimodel_base.AIModel):
         dslstr = tree_template.replace("WHERE_TO_CHECK_GOAL", f'"{response_values_as_dict["WHERE_TO_CHECK_GOAL"]}"')
 
         dslstr = self._format_dslstr(dslstr)
-        with open(self.action_definitions_file, 'r') as file: action_definitions = json.loads(file.read())
+        action_definitions = prompt_assets.load_action_definitions(self.action_definitions_file)
         dsldict = self._dslstr2dict(dslstr, action_definitions)
 
         self.node_tag = -1  # reset node ID
@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Allocation benchmark of the core structs (not collected by pytest), measured with tracemalloc:
+- memory of the slotted robot states compared to the same classes with an instance __dict__
+- allocations of returning the shared STATUS_* instances compared to a new Status per return
+
+python ./tests/bench_struct_allocations.py --count 100000
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import tasqsym.core.common.constants as tss_constants
+import tasqsym.core.common.structs as tss_structs
+
+
+class DictStatus(tss_structs.Status): pass  # no __slots__, instances get a __dict__ as before
+
+class DictManipulatorState(tss_structs.ManipulatorState): pass
+
+class DictEndEffectorState(tss_structs.EndEffectorState): pass
+
+
+def measure(create, count: int) -> tuple[int, int]:
+    """return: (bytes kept by the created objects, peak bytes while creating them)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    kept = [create(i) for i in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current - start, peak - start
+
+
+def report(name: str, count: int, slotted: tuple[int, int], baseline: tuple[int, int]):
+    print("%-20s %8.1f B/object (baseline %8.1f B/object, %5.1f%%), peak %8.1f KiB (baseline %8.1f KiB)" % (
+        name, slotted[0] / count, baseline[0] / count, 100. * slotted[0] / baseline[0], slotted[1] / 1024, baseline[1] / 1024))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000, help="number of objects created per measurement")
+    pargs = parser.parse_args()
+
+    joint_names = ["joint%d" % i for i in range(7)]
+    joint_states = tss_structs.JointStates.fromValues([0.] * 7)
+    pose = tss_structs.Pose()
+
+    report("Status", pargs.count,
+           measure(lambda i: tss_structs.Status(tss_constants.StatusFlags.SUCCESS), pargs.count),
+           measure(lambda i: DictStatus(tss_constants.StatusFlags.SUCCESS), pargs.count))
+    report("ManipulatorState", pargs.count,
+           measure(lambda i: tss_structs.ManipulatorState(joint_names, joint_states, pose), pargs.count),
+           measure(lambda i: DictManipulatorState(joint_names, joint_states, pose), pargs.count))
+    report("EndEffectorState", pargs.count,
+           measure(lambda i: tss_structs.EndEffectorState(joint_names, joint_states), pargs.count),
+           measure(lambda i: DictEndEffectorState(joint_names, joint_states), pargs.count))
+    # a return path keeping its status, e.g., the results of the nodes of a long sequence
+    report("returned status", pargs.count,
+           measure(lambda i: tss_structs.STATUS_SUCCESS, pargs.count),
+           measure(lambda i: tss_structs.Status(tss_constants.StatusFlags.SUCCESS), pargs.count))
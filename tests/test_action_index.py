@@ -0,0 +1,73 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import pytest
+
+import tasqsym_encoder.aimodel.action_index as action_index
+
+
+DEFINITIONS = {
+    "Actions": [
+        {"Name": "Move", "Arguments": ["@target", "@speed", "@flag"]},
+        {"Name": "Place", "Arguments": {"@target": "str", "@height": "float", "@careful": "bool", "@count": "int",
+                                        "@waypoints": "list", "@value": "auto"}},
+        {"Name": "Move", "Arguments": {"@ignored": "float"}}
+    ],
+    "Conditions": [
+        {"Name": "Move", "Arguments": {"@speed": "float"}}
+    ]
+}
+
+
+@pytest.fixture
+def index() -> action_index.ActionIndex:
+    return action_index.ActionIndex(DEFINITIONS)
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ('"kitchen"', "kitchen"),
+    ('kitchen', "kitchen"),
+    ('3', 3),
+    ('"3"', "3"),
+    ('1.0', "1.0"),
+    ('true', "true"),
+    ('-2', -2),
+])
+def test_untyped_arguments_keep_strings_and_ints(index: action_index.ActionIndex, raw: str, expected):
+    mapped = index.map_arguments("action", "Move", ["x", raw])
+    assert mapped["@speed"] == expected and type(mapped["@speed"]) is type(expected)
+
+
+def test_declared_types(index: action_index.ActionIndex):
+    mapped = index.map_arguments("action", "Place", ['"table"', '0.25', 'true', '"2"', '"[0.1, 0.2]"', '1.5'])
+    assert mapped == {"@target": "table", "@height": 0.25, "@careful": True, "@count": 2, "@waypoints": [0.1, 0.2], "@value": 1.5}
+    assert type(mapped["@height"]) is float
+
+
+@pytest.mark.parametrize("raw,expected", [('"a"', "a"), ('7', 7), ('0.5', 0.5), ('False', False), ('word', "word")])
+def test_declared_auto_infers_from_the_values(raw: str, expected):
+    value = action_index.coerce_auto(raw)
+    assert value == expected and type(value) is type(expected)
+
+
+def test_invalid_declared_value_is_kept_as_string(index: action_index.ActionIndex):
+    with pytest.warns(UserWarning, match="@height of Place is not a valid float"):
+        mapped = index.map_arguments("action", "Place", ['"table"', 'high'])
+    assert mapped == {"@target": "table", "@height": "high"}
+
+
+def test_first_definition_wins_and_node_types_are_separate(index: action_index.ActionIndex):
+    assert [arg[0] for arg in index.get("action", "Move")] == ["@target", "@speed", "@flag"]
+    assert index.map_arguments("condition", "Move", ["1"]) == {"@speed": 1.}
+    assert index.map_arguments("action", "Unknown", ["1"]) is None
+
+
+def test_extra_arguments_are_ignored(index: action_index.ActionIndex):
+    with pytest.warns(UserWarning, match="ignored the extra 1"):
+        assert index.map_arguments("action", "Move", ["a", "1", "b", "c"]) == {"@target": "a", "@speed": 1, "@flag": "b"}
+
+
+def test_index_is_compiled_once_per_definitions():
+    assert action_index.get_index(DEFINITIONS) is action_index.get_index(DEFINITIONS)
@@ -0,0 +1,100 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import gzip
+import json
+import stat
+
+import tasqsym_encoder.artifact_writer as artifact_writer
+
+
+def read_json(path) -> dict:
+    with open(path, encoding='utf-8') as f: return json.load(f)
+
+def object_files(output_dir) -> list[str]:
+    objects_dir = os.path.join(output_dir, "objects")
+    return sorted(os.path.join(d, f) for d in os.listdir(objects_dir) if os.path.isdir(os.path.join(objects_dir, d))
+                  for f in os.listdir(os.path.join(objects_dir, d)))
+
+
+def test_identical_contents_are_stored_once_read_only(tmp_path):
+    writer = artifact_writer.ArtifactWriter(str(tmp_path))
+    writer.write_json("a_task_plan", {"root": [1, 2]})
+    writer.write_json("b_task_plan", {"root": [1, 2]})
+    writer.close()
+
+    assert read_json(tmp_path / "a_task_plan.json") == read_json(tmp_path / "b_task_plan.json") == {"root": [1, 2]}
+    assert len(object_files(tmp_path)) == 1
+    assert writer.stats()["deduplicated"] == 1
+    for name in ("a_task_plan.json", "b_task_plan.json"):
+        path = tmp_path / name
+        assert os.path.islink(path)
+        assert not os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def test_copies_without_symbolic_links(tmp_path, monkeypatch):
+    def no_symlink(*args): raise OSError("not supported")
+    monkeypatch.setattr(os, "symlink", no_symlink)
+    writer = artifact_writer.ArtifactWriter(str(tmp_path))
+    writer.write_json("a", {"v": 1})
+    writer.write_json("b", {"v": 1})
+    writer.close()
+
+    os.chmod(tmp_path / "a.json", stat.S_IRUSR | stat.S_IWUSR)
+    with open(tmp_path / "a.json", "w") as f: f.write("edited")
+    assert read_json(tmp_path / "b.json") == {"v": 1}  # not the same file
+
+
+def test_files_not_written_by_the_writer_are_not_overwritten(tmp_path):
+    (tmp_path / "mine.json").write_text("user file")
+    writer = artifact_writer.ArtifactWriter(str(tmp_path))
+    writer.write_json("mine", {"v": 1})
+    writer.write_json("other", {"v": 2})
+    writer.close()
+
+    assert (tmp_path / "mine.json").read_text() == "user file"
+    assert writer.stats()["refused"] == 1
+    assert list(writer.artifacts) == ["other.json"]
+    assert len(object_files(tmp_path)) == 1
+
+
+def test_rewriting_an_artifact_replaces_its_contents(tmp_path):
+    writer = artifact_writer.ArtifactWriter(str(tmp_path))
+    writer.write_json("plan", {"v": 1})
+    writer.write_json("plan", {"v": 2})
+    writer.write_json("plan", {"v": 2})
+    writer.close()
+
+    assert read_json(tmp_path / "plan.json") == {"v": 2}
+    assert len(object_files(tmp_path)) == 1  # the first contents are no longer referred to
+    assert writer.stats()["written"] == 2
+
+
+def test_rotation_removes_only_listed_artifacts(tmp_path):
+    (tmp_path / "notes.txt").write_text("kept")
+    writer = artifact_writer.ArtifactWriter(str(tmp_path), max_artifacts=2)
+    for i in range(4): writer.write_json("plan%d" % i, {"v": i % 2})
+    writer.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt", "objects", "plan2.json", "plan3.json"]
+    assert len(object_files(tmp_path)) == 2
+
+
+def test_manifest_is_loaded_on_restart(tmp_path):
+    writer = artifact_writer.ArtifactWriter(str(tmp_path), compress=True)
+    writer.write_text("log0", "prompt")
+    writer.write_text("log1", "prompt")
+    writer.write_text("log2", "other prompt")
+    writer.close()
+    with gzip.open(tmp_path / "log0.txt.gz", "rt") as f: assert f.read() == "prompt"
+
+    os.remove(tmp_path / "log2.txt.gz")  # removed by the user
+    writer = artifact_writer.ArtifactWriter(str(tmp_path), compress=True)
+    assert list(writer.artifacts) == ["log0.txt.gz", "log1.txt.gz"]
+    assert len(object_files(tmp_path)) == 1
+    writer.write_text("log1", "new prompt")  # written by the previous run, so overwritten
+    writer.close()
+    with gzip.open(tmp_path / "log1.txt.gz", "rt") as f: assert f.read() == "new prompt"
@@ -0,0 +1,88 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+
+import tasqsym.core.common.constants as tss_constants
+import tasqsym.core.common.structs as tss_structs
+import tasqsym.core.interface.blackboard as blackboard
+import tasqsym.core.bt_decoder as bt_decoder
+
+
+class RecordingSkillInterface:
+    """Runs every skill node successfully and records the order of the executed nodes."""
+
+    def __init__(self):
+        self.executed: list[str] = []
+
+    def setDecoder(self, skill_name: str) -> tss_structs.Status:
+        return tss_structs.STATUS_SUCCESS
+
+    def setTask(self, skill_name: str) -> tss_structs.Status:
+        return tss_structs.STATUS_SUCCESS
+
+    def runDecoder(self, encoded_params: dict, board, envg) -> tss_structs.Status:
+        self.executed.append(encoded_params["Node"])
+        return tss_structs.STATUS_SUCCESS
+
+    async def runTask(self, envg, board) -> tss_structs.Status:
+        return tss_structs.STATUS_SUCCESS
+
+    def cleanup(self):
+        pass
+
+
+def tree(*nodes: dict) -> dict:
+    return {"root": {"BehaviorTree": {"ID": "MainTree", "Tree": list(nodes)}}}
+
+def skill(name: str) -> dict:
+    return {"Node": name}
+
+def condition(variable_name: str) -> dict:
+    return {"Node": "CONDITION", "@variable_name": variable_name}
+
+
+def run(bt: dict, **kwargs) -> tuple[tss_constants.StatusFlags, list[str]]:
+    board = blackboard.Blackboard()
+    board.setBoardVariable("done", False)
+    rsi = RecordingSkillInterface()
+    status = asyncio.run(bt_decoder.TaskSequenceDecoder().runTree(bt, board, rsi, None, **kwargs))
+    return status.status, rsi.executed
+
+
+# Fallback[CONDITION(false), Sequence[A, B, C]], D
+# node ids: CONDITION [0, 0], A [0, 1, 0], B [0, 1, 1], C [0, 1, 2], D [1]
+FALLBACK_TREE = tree(
+    {"Fallback": [condition("done"), {"Sequence": [skill("A"), skill("B"), skill("C")]}]},
+    skill("D"))
+
+# Sequence[A, B], Sequence[C, D]
+# node ids: A [0, 0], B [0, 1], C [1, 0], D [1, 1]
+NESTED_SEQUENCE_TREE = tree({"Sequence": [skill("A"), skill("B")]}, {"Sequence": [skill("C"), skill("D")]})
+
+
+def test_full_run():
+    assert run(FALLBACK_TREE) == (tss_constants.StatusFlags.SUCCESS, ["A", "B", "C", "D"])
+
+def test_resume_in_later_fallback_branch():
+    assert run(FALLBACK_TREE, resume_after_node_id=[0, 1, 0]) == (tss_constants.StatusFlags.SUCCESS, ["B", "C", "D"])
+
+def test_resume_after_last_node_of_fallback_branch():
+    assert run(FALLBACK_TREE, resume_after_node_id=[0, 1, 2]) == (tss_constants.StatusFlags.SUCCESS, ["D"])
+
+def test_resume_after_successful_fallback_child():
+    # the first child succeeded before the crash, so the fallback does not try the next child
+    bt = tree({"Fallback": [skill("A"), skill("B")]}, skill("C"))
+    assert run(bt, resume_after_node_id=[0, 0]) == (tss_constants.StatusFlags.SUCCESS, ["C"])
+
+def test_resume_in_nested_sequence():
+    assert run(NESTED_SEQUENCE_TREE, resume_after_node_id=[0, 1]) == (tss_constants.StatusFlags.SUCCESS, ["C", "D"])
+    assert run(NESTED_SEQUENCE_TREE, resume_after_node_id=[1, 0]) == (tss_constants.StatusFlags.SUCCESS, ["D"])
+
+def test_resume_after_node_not_in_tree():
+    assert run(NESTED_SEQUENCE_TREE, resume_after_node_id=[2, 0]) == (tss_constants.StatusFlags.FAILED, [])
+
+def test_start_from_node_in_fallback_branch():
+    assert run(FALLBACK_TREE, start_from_node_id=[0, 1, 1]) == (tss_constants.StatusFlags.SUCCESS, ["B", "C", "D"])
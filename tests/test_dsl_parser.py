@@ -0,0 +1,195 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import re
+import json
+import warnings
+
+import pytest
+import regex
+
+import tasqsym_encoder.aimodel.dsl_parser as dsl_parser
+import tasqsym_encoder.aimodel.action_index as action_index
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+SAMPLES = [  # (example prompt, action definitions, tree template of format_response())
+    ("tasqsym_samples/aimodel_samples/prompt/example_prompt.txt", "tasqsym_samples/aimodel_samples/action_definitions.json",
+     """
+        root {
+            sequence {
+                TASK_SEQUENCE
+            }
+        }
+     """),
+    ("tasqsym_samples_more/aimodels/prompt/example_prompt.txt", "tasqsym_samples_more/aimodels/action_definitions.json",
+     """
+        root {
+            selector {
+                condition [GoalCheck, "goal", "table"]
+                retry {
+                    sequence {
+                        sequence {
+                            TASK_SEQUENCE
+                        }
+                        condition [GoalCheck, "goal", "table"]
+                    }
+                }
+            }
+        }
+     """)
+]
+
+
+"""Previous parser (AIModel._dslstr2dict before the single pass parser), the reference of the expected trees."""
+
+def format_dslstr(text: str) -> str:
+    lines = text.strip().splitlines()
+    indent_level = 0
+    formatted_lines = []
+    for line in lines:
+        stripped_line = line.strip()
+        stripped_line = stripped_line.rstrip("\\")
+        stripped_line = stripped_line.replace("];", "]")
+        stripped_line = stripped_line.replace("],", "]")
+        if not stripped_line: continue
+        if stripped_line == "}": indent_level -= 1
+        formatted_lines.append("    " * indent_level + stripped_line)
+        if stripped_line.endswith("{"): indent_level += 1
+    return "\n".join(formatted_lines)
+
+def old_dslstr2dict(text: str, action_definitions: dict) -> dict:
+    text = text.strip()
+    if text.startswith("action") or text.startswith("condition"):
+        parent_type = "action" if text.startswith("action") else "condition"
+        start = text.find('[') + 1
+        end = text.find(']', start)
+        return old_parse_node(text[start:end].strip(), parent_type, action_definitions)
+    for parent_type in ("root", "sequence", "selector", "retry"):
+        if text.startswith(parent_type): break
+    else: return None
+    matches = regex.findall(parent_type + r' (\{(?:[^{}]|(?1))*\})', text)
+    if not matches: return None
+    content = max(matches, key=len)[1:-1]
+    if parent_type == "sequence" or parent_type == "selector": return {parent_type: old_parse_nodes(content, action_definitions)}
+    return {parent_type: old_dslstr2dict(content, action_definitions)}
+
+def old_parse_node(text: str, node_type: str, action_definitions: dict) -> dict:
+    content = text.split(',')
+    if len(content) == 1: return {'node': content[0]}
+    tmp_node = {'node': content[0]}
+    action_list = action_definitions['Actions'] if node_type == 'action' else action_definitions['Conditions']
+    for action in action_list:
+        if action['Name'] == content[0]: break
+        action = None
+    if action is None: return {'node': content[0]}
+    arg_info = action["Arguments"]
+    for i, arg in enumerate(content[1:]):
+        arg = arg.strip()
+        try: arg = int(arg)
+        except ValueError: arg = arg.strip('"')
+        tmp_node[list(arg_info)[i]] = arg
+    return tmp_node
+
+def old_parse_nodes(text: str, action_definitions: dict) -> list:
+    nodes = []
+    i = 0
+    while i < len(text):
+        for key in ['condition', 'action']:
+            if text[i:].startswith(key): break
+            key = ""
+        if key != "":
+            start = text.find('[', i) + 1
+            end = text.find(']', start)
+            nodes.append(old_parse_node(text[start:end].strip(), key, action_definitions))
+            i = end + 1
+            continue
+        for parent_type in ['sequence', 'selector', 'retry']:
+            if text[i:].startswith(parent_type): break
+        else:
+            i += 1
+            continue
+        start = text.find('{', i) + 1
+        end = start
+        balance = 1
+        while balance > 0:
+            if text[end] == '{': balance += 1
+            elif text[end] == '}': balance -= 1
+            end += 1
+        nodes.append({parent_type: old_parse_nodes(text[start:end-1], action_definitions)})
+        i = end
+    return nodes
+
+
+def new_dslstr2dict(text: str, action_definitions: dict) -> dict:
+    """Same mapping of the leaves as AIModel._dslstr2dict_parse_node()."""
+    index = action_index.get_index(action_definitions)
+    def make_leaf(node_type: str, name: str, args: list[str]) -> dict:
+        mapped_args = index.map_arguments(node_type, name, args) if len(args) > 0 else None
+        return {'node': name} if mapped_args is None else {'node': name, **mapped_args}
+    return dsl_parser.parse(text, make_leaf)
+
+
+def sample_cases():
+    for prompt_file, definitions_file, template in SAMPLES:
+        with open(os.path.join(SRC_DIR, prompt_file), encoding='utf-8') as f: prompt = f.read()
+        with open(os.path.join(SRC_DIR, definitions_file), encoding='utf-8') as f: action_definitions = json.load(f)
+        sequences = re.findall(r"'((?:action|condition|sequence|selector)\b[^']*)'", prompt)
+        assert len(sequences) > 0
+        for i, sequence in enumerate(sequences):
+            yield pytest.param(template, sequence, action_definitions, id="%s-%d" % (os.path.basename(os.path.dirname(prompt_file)), i))
+
+
+@pytest.mark.parametrize("template,sequence,action_definitions", list(sample_cases()))
+def test_same_trees_as_previous_parser(template: str, sequence: str, action_definitions: dict):
+    # as formatted by format_response(): newlines in the response are either kept or left escaped
+    for task_sequence in (sequence, sequence.replace("\n", "\\n")):
+        dslstr = format_dslstr(template.replace("TASK_SEQUENCE", task_sequence))
+        expected = old_dslstr2dict(dslstr, action_definitions)
+        assert expected is not None
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # separators only, nothing ignored
+            assert new_dslstr2dict(dslstr, action_definitions) == expected
+
+
+def test_single_leaf():
+    assert dsl_parser.parse('action [Find, "bottle", "right"]', lambda t, n, a: {"type": t, "node": n, "args": a}) == \
+        {"type": "action", "node": "Find", "args": ['"bottle"', '"right"']}
+
+
+def test_quoted_arguments_keep_separators():
+    tree = dsl_parser.parse('root { action [Say, "a, b]", plain words] }', lambda t, n, a: {"node": n, "args": a})
+    assert tree == {"root": {"node": "Say", "args": ['"a, b]"', 'plain words']}}
+
+
+def test_retry_directly_under_root():
+    tree = dsl_parser.parse('root {\n retry {\n  sequence { action [A]; condition [B] }\n }\n}', lambda t, n, a: {"node": n})
+    assert tree == {"root": {"retry": [{"sequence": [{"node": "A"}, {"node": "B"}]}]}}
+    assert dsl_parser.parse('root { retry { action [A] } }', lambda t, n, a: {"node": n}) == {"root": {"retry": [{"node": "A"}]}}
+
+
+@pytest.mark.parametrize("text,message,line,column", [
+    ('root {\n  action [A, "b]\n}', "unterminated string", 2, 14),
+    ('root {\n  sequence {\n    action [A]\n  }\n', "missing '}' of 'root'", 5, 1),
+    ('root { action [A }', "unexpected '}' in 'action'", 1, 18),
+    ('root { action [A] action [B] }', "'root' must have exactly one child (got 2)", 1, 1),
+    ('root { }', "'root' must have exactly one child (got 0)", 1, 1),
+    ('root action [A]', "expected '{' after 'root'", 1, 6),
+    ('sequence { action [] }', "missing node name", 1, 12),
+    ('tree { action [A] }', "expected a node but got 'tree'", 1, 1),
+    ('', "expected a node", 1, 1),
+])
+def test_malformed_input(text: str, message: str, line: int, column: int):
+    with pytest.raises(dsl_parser.DSLParseError) as e:
+        dsl_parser.parse(text, lambda t, n, a: {"node": n})
+    assert message in str(e.value)
+    assert (e.value.line, e.value.column) == (line, column)
+
+
+def test_stray_words_are_ignored_with_a_warning():
+    with pytest.warns(UserWarning, match="ignored 'then' in 'sequence'"):
+        tree = dsl_parser.parse('sequence { action [A] then action [B] }', lambda t, n, a: {"node": n})
+    assert tree == {"sequence": [{"node": "A"}, {"node": "B"}]}
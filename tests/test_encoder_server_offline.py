@@ -0,0 +1,159 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+"""
+Drives server.py end to end with the offline language model client (LLM_BACKEND=offline, no network access),
+the plans are not sent anywhere as the server runs without a connection to the core.
+"""
+
+import os
+import sys
+import time
+import importlib
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+import fastapi.testclient as testclient
+import starlette.websockets as websockets
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORLD = {"assets": ["table"], "objects": ["cup"], "robot_state": {"at_location": "kitchen"}}
+# response of the language model for every instruction (refers to the sample environment data)
+RESPONSE = """```python
+{
+    "task_sequence": 'action [MoveToLocation, "dining_area"]
+                      action [Find, "empty_bottle", "left"]
+                      action [MoveToObjectOrAsset, "empty_bottle"]
+                      action [Grab, "empty_bottle"]',
+    "environment_after": {
+        "asset_object_relations": {"table": ["paper_trash"], "trash_can": []},
+        "robot_state": {"is_grasping": ["empty_bottle"], "at_location": "dining_area", "hands_used_for_action": ["left"]}
+    }
+}
+```"""
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    offline_dir = tmp_path_factory.mktemp("offline")
+    (offline_dir / "response.txt").write_text(RESPONSE)
+    credentials = offline_dir / "credentials.env"
+    credentials.write_text("LLM_BACKEND=offline\nOFFLINE_LATENCY_SEC=0\nOFFLINE_RESPONSE_FILE=%s\n" % (offline_dir / "response.txt"))
+    args = ["server.py", "--credentials", str(credentials), "--aoai",
+            "--aimodel", "tasqsym_samples.aimodel_samples.model.PickPlaceScenario",
+            "--config", os.path.join(REPO_DIR, "src", "tasqsym_samples", "encoder_sample_settings.json"),
+            "--response_cache"]
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(sys, "argv", args)
+        mp.chdir(REPO_DIR)  # the data engine settings refer to the environment data relative to the repository
+        try:
+            module = importlib.import_module("tasqsym_encoder.server")
+        except Exception as e:  # e.g., the tokenizer data could not be downloaded
+            pytest.skip("could not load the server: %s" % e)
+    return module
+
+
+@pytest.fixture
+def client(server):
+    with testclient.TestClient(server.app) as client: yield client
+
+
+def wait_until(condition, timeout_sec: float=2.):
+    deadline = time.monotonic() + timeout_sec
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(.01)
+
+def receive_robot_message(websocket) -> str:
+    while True:
+        message = websocket.receive_text()
+        if message.startswith("Robot: "): return message
+
+
+def test_session_plans_and_sends_the_confirmed_task(server, client):
+    with client.websocket_connect("/ws/plan_session") as websocket:
+        websocket.send_text("throw away the bottle")
+        assert websocket.receive_text() == "User: throw away the bottle"
+        assert receive_robot_message(websocket).startswith("Robot: Please enter 'Y' if the following task is okay:\n{")
+        websocket.send_text("y")
+        assert receive_robot_message(websocket).startswith("Robot: Finished sending instructions.")
+    assert "plan_session" not in server.manager.connections
+
+
+def test_batch_responses_are_cached(server, client):
+    assert client.delete("/response_cache").json()["entries"] == 0
+    stats = server.llm_response_cache.stats()
+    items = [{"instruction": "Pick up the cup", "world": WORLD}]
+
+    first = client.post("/encode_batch", json={"items": items}).json()["results"][0]
+    after_miss = server.llm_response_cache.stats()
+    second = client.post("/encode_batch", json={"items": [{"instruction": "pick up  the cup", "world": WORLD}]}).json()["results"][0]
+    after_hit = server.llm_response_cache.stats()
+
+    assert first["success"] and second["success"]
+    assert second["task_plan"] == first["task_plan"]
+    assert after_miss["misses"] == stats["misses"] + 1 and after_miss["hits"] == stats["hits"]
+    assert after_hit["hits"] == stats["hits"] + 1 and after_hit["misses"] == after_miss["misses"]
+    assert client.delete("/response_cache").json()["entries"] == 0
+
+
+def test_auto_confirmed_batch_is_sent_in_order(server, client, monkeypatch):
+    events = []
+    encode_batch_item = server.encode_batch_item
+
+    async def record_encode(model, item, tag):
+        events.append(("plan", item.instruction))
+        return await encode_batch_item(model, item, tag)
+
+    async def record_configs(configs, device_id=""):
+        events.append(("configs", device_id))
+        return True
+
+    async def record_task(bt, device_id=""):
+        events.append(("send", device_id))
+        sent.append(bt)
+
+    sent = []
+    monkeypatch.setattr(server, "encode_batch_item", record_encode)
+    monkeypatch.setattr(server, "send_configs", record_configs)
+    monkeypatch.setattr(server, "send_task", record_task)
+    instructions = ["bring the bottle %d" % i for i in range(3)]
+
+    response = client.post("/encode_batch", json={"items": [{"instruction": i} for i in instructions],
+                                                  "auto_confirm": True, "device": "robot1"}).json()
+
+    results = response["results"]
+    assert [r["instruction"] for r in results] == instructions
+    assert all(r["success"] and r["sent"] for r in results)
+    assert sent == [r["compiled_plan"] for r in results]
+    assert events == [("plan", instructions[0]), ("configs", "robot1"), ("send", "robot1"),
+                      ("plan", instructions[1]), ("send", "robot1"),
+                      ("plan", instructions[2]), ("send", "robot1")]
+
+
+def test_idle_sessions_are_evicted(server, client, monkeypatch):
+    monkeypatch.setattr(server.manager, "idle_timeout_sec", 60.)
+    with client.websocket_connect("/ws/idle_session") as idle, client.websocket_connect("/ws/active_session") as active:
+        wait_until(lambda: "idle_session" in server.manager.last_active and "active_session" in server.manager.last_active)
+        server.manager.last_active["idle_session"] = time.monotonic() - 120.
+        server.manager.last_active.move_to_end("idle_session", last=False)
+
+        client.portal.call(server.manager.evict_idle)
+
+        assert idle.receive_text().startswith("Robot: Closed the session as it was idle.")
+        with pytest.raises(websockets.WebSocketDisconnect): idle.receive_text()
+        assert "idle_session" not in server.manager.connections
+        assert "active_session" in server.manager.connections
+
+
+def test_least_recently_active_session_is_evicted_for_a_new_one(server, client, monkeypatch):
+    monkeypatch.setattr(server.manager, "max_sessions", 1)
+    with client.websocket_connect("/ws/old_session") as old:
+        with client.websocket_connect("/ws/new_session"):
+            assert old.receive_text().startswith("Robot: Closed the session as the maximum number of sessions was reached.")
+            assert list(server.manager.connections) == ["new_session"]
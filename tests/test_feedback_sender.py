@@ -0,0 +1,113 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+
+import tasqsym.core.interface.feedback_sender as feedback_sender
+
+
+class RecordingClient:
+    """Records the sent messages, each send takes delay_sec and the sends with failing ids raise."""
+
+    def __init__(self, delay_sec: float=0., failing: tuple=()):
+        self.sent: list[dict] = []
+        self.delay_sec = delay_sec
+        self.failing = failing
+
+    async def send_feedback(self, data: dict):
+        await asyncio.sleep(self.delay_sec)
+        if data.get("id") in self.failing: raise ConnectionError("network down")
+        self.sent.append(data)
+
+    def ids(self) -> list:
+        return [data["id"] for data in self.sent]
+
+
+def information(i: int) -> dict:
+    return {"id": i, "type": "information", "node_pointer": [0, i]}
+
+def response(i: int) -> dict:
+    return {"id": i, "type": "response"}
+
+
+def test_consecutive_information_is_coalesced():
+    async def run():
+        client = RecordingClient()
+        sender = feedback_sender.FeedbackSender(client)
+        for i in range(5): sender.push(information(i))
+        sender.push(response(5))
+        sender.push(information(6))
+        sender.push(information(7))
+        await sender.close()
+        return client.ids()
+    assert asyncio.run(run()) == [4, 5, 7]
+
+
+def test_full_queue_drops_the_oldest_information_only():
+    async def run():
+        client = RecordingClient()
+        sender = feedback_sender.FeedbackSender(client, max_queue_size=3)
+        sender.push(response(0))
+        sender.push(information(1))
+        sender.push(response(2))
+        sender.push(information(3))  # full: drops 1
+        sender.push(response(4))     # full: drops 3
+        sender.push(response(5))     # full without information: kept
+        await sender.close()
+        return client.ids()
+    assert asyncio.run(run()) == [0, 2, 4, 5]
+
+
+def test_flush_waits_for_messages_queued_while_sending():
+    async def run():
+        client = RecordingClient(delay_sec=.01)
+        sender = feedback_sender.FeedbackSender(client)
+        sender.push(information(0))
+        await asyncio.sleep(.005)  # first message being sent
+        sender.push(response(1))
+        sender.push(information(2))
+        await sender.flush()
+        ids = client.ids()
+        await sender.close()
+        return ids
+    assert asyncio.run(run()) == [0, 1, 2]
+
+
+def test_flush_before_response_keeps_the_order():
+    async def run():
+        client = RecordingClient(delay_sec=.01)
+        sender = feedback_sender.FeedbackSender(client)
+        for i in range(3):
+            sender.push(information(i))
+            await asyncio.sleep(0)
+        # as runTree() and the caller do: node information first, then the response sent directly
+        await sender.flush()
+        await client.send_feedback(response(99))
+        await sender.close()
+        return client.ids()
+    ids = asyncio.run(run())
+    assert ids[-1] == 99
+    assert ids[-2] == 2
+
+
+def test_send_failure_does_not_stop_later_feedback():
+    async def run():
+        client = RecordingClient(failing=(0,))
+        sender = feedback_sender.FeedbackSender(client)
+        sender.push(response(0))
+        sender.push(information(1))
+        await sender.flush()
+        sender.push(response(2))
+        await sender.close()
+        return client.ids()
+    assert asyncio.run(run()) == [1, 2]
+
+
+def test_flush_without_messages_returns():
+    async def run():
+        sender = feedback_sender.FeedbackSender(RecordingClient())
+        await asyncio.wait_for(sender.flush(), 1.)
+        await sender.close()
+    asyncio.run(run())
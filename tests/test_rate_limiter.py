@@ -0,0 +1,138 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+
+import pytest
+
+import tasqsym_encoder.aimodel.rate_limiter as rate_limiter
+
+
+class FakeClock:
+    """Time only advances when a request sleeps."""
+
+    def __init__(self):
+        self.now = 1000.
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, sec: float):
+        self.sleeps.append(sec)
+        self.now += sec
+        await asyncio.sleep(0)
+
+
+def limiter(clock: FakeClock, **limits) -> rate_limiter.RateLimiter:
+    return rate_limiter.RateLimiter(**limits, clock=clock, sleep=clock.sleep)
+
+
+def test_unlimited_requests_never_wait():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock)
+        for _ in range(100):
+            async with limits.slot(10000) as queue_sec: assert queue_sec == 0.
+        return clock.sleeps, limits.stats()
+    sleeps, stats = asyncio.run(run())
+    assert sleeps == [] and stats["requests"] == 100
+
+
+def test_request_bucket_allows_bursts_then_refills():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock, requests_per_minute=60)  # 1 per second, bursts of 10
+        start = clock.now
+        times = []
+        for _ in range(12):
+            async with limits.slot(): times.append(clock.now - start)
+        return times
+    assert asyncio.run(run()) == pytest.approx([0.] * 10 + [1., 2.])
+
+
+def test_token_bucket_waits_for_the_estimated_tokens():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock, tokens_per_minute=600)  # 10 per second, bursts of 100
+        async with limits.slot(80): pass
+        async with limits.slot(50): pass  # 20 left, waits for 30 more
+        waited = clock.sleeps[:]
+        clock.now += 1000.
+        async with limits.slot(500): pass  # larger than the burst: full bucket only
+        return waited, clock.sleeps[len(waited):]
+    waited, larger = asyncio.run(run())
+    assert waited == pytest.approx([3.])
+    assert larger == []
+
+
+def test_pause_holds_all_requests():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock)
+        limits.pause(5.)
+        limits.pause(2.)  # does not shorten the pause
+        start = clock.now
+        async with limits.slot() as queue_sec: pass
+        return clock.now - start, queue_sec, limits.stats()
+    waited, queue_sec, stats = asyncio.run(run())
+    assert waited == pytest.approx(5.) and queue_sec == pytest.approx(5.)
+    assert stats["throttled"] == 2 and stats["max_queue_ms"] == pytest.approx(5000.)
+
+
+def test_slots_are_served_in_arrival_order():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock, requests_per_minute=6, max_concurrency=2)  # bursts of 1 request
+        order = []
+
+        async def request(i: int):
+            async with limits.slot():
+                order.append(i)
+                await asyncio.sleep(0)
+
+        tasks = []
+        for i in range(6):
+            tasks.append(asyncio.create_task(request(i)))
+            await asyncio.sleep(0)  # arrive one after the other
+        await asyncio.gather(*tasks)
+        return order, limits.stats()
+    order, stats = asyncio.run(run())
+    assert order == list(range(6))
+    assert stats["requests"] == 6 and stats["waiting"] == 0
+
+
+def test_concurrency_is_limited_and_released_on_errors():
+    async def run():
+        clock = FakeClock()
+        limits = limiter(clock, max_concurrency=2)
+        active = []
+        peak = 0
+
+        async def request(fail: bool):
+            nonlocal peak
+            async with limits.slot():
+                active.append(1)
+                peak = max(peak, len(active))
+                await asyncio.sleep(.01)
+                active.pop()
+                if fail: raise RuntimeError("rate limited")
+
+        results = await asyncio.gather(*[request(i % 2 == 0) for i in range(6)], return_exceptions=True)
+        async with limits.slot(): pass  # every slot was released
+        return peak, sum(isinstance(r, RuntimeError) for r in results)
+    assert asyncio.run(run()) == (2, 3)
+
+
+def test_limiters_are_shared_per_key():
+    key = ("test", rate_limiter.secret_key("sk-test"))
+    assert rate_limiter.get_limiter(key, 60) is rate_limiter.get_limiter(key, 120)
+    assert "test/" + key[1] in rate_limiter.all_stats()
+
+
+def test_secret_keys_differ_for_the_same_suffix():
+    assert rate_limiter.secret_key("sk-aaaa1234") != rate_limiter.secret_key("sk-bbbb1234")
+    assert rate_limiter.secret_key("sk-aaaa1234") == rate_limiter.secret_key("sk-aaaa1234")
+    assert len(rate_limiter.secret_key("sk-aaaa1234")) == 16
@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+
+import pytest
+
+import tasqsym.assets.include.stream_transport as stream_transport
+import tasqsym.assets.network.socket_bridge as core_socket_bridge
+import tasqsym_encoder.network.socket_bridge as server_socket_bridge
+
+
+@pytest.fixture
+def socket_address(tmp_path, monkeypatch) -> str:
+    address = "unix:%s" % (tmp_path / "tasqsym.sock")
+    monkeypatch.setenv("TASQSYM_SOCKET_ADDRESS", address)
+    return address
+
+
+async def wait_until(condition, timeout_sec: float=2.):
+    async def poll():
+        while not condition(): await asyncio.sleep(.01)
+    await asyncio.wait_for(poll(), timeout_sec)
+
+
+async def close(core: core_socket_bridge.SocketBridgeOnCore, server: server_socket_bridge.SocketBridgeOnServer=None):
+    if server is not None: server.disconnect()
+    await core.disconnect()
+    await asyncio.sleep(.05)  # let the connection handlers finish
+
+
+def test_feedback_without_server_is_sent_on_connection(socket_address: str):
+    async def run():
+        core = core_socket_bridge.SocketBridgeOnCore(None)
+        await core.connect()
+        await core.send_feedback({"id": "1_0", "type": "response", "success": True})  # e.g., server restarted during a task
+
+        server = server_socket_bridge.SocketBridgeOnServer(None)
+        command_id = server.send_command("run", {"content": {}})
+        assert await server.wait_feedback("1_0", timeout_sec=2.)
+        feedback = server.feedback
+        await wait_until(lambda: len(core.queue["run"]) == 1)
+        assert core.queue["run"][0]["id"] == command_id
+
+        await core.send_feedback({"id": command_id, "type": "response", "success": True})
+        assert await server.wait_feedback(command_id, timeout_sec=2.)
+        await close(core, server)
+        return feedback
+    assert asyncio.run(run()) == {"id": "1_0", "type": "response", "success": True}
+
+
+def test_expired_feedback_is_not_sent(socket_address: str):
+    async def run():
+        core = core_socket_bridge.SocketBridgeOnCore(None, buffer_size=2, buffer_ttl_sec=.05)
+        await core.connect()
+        await core.send_feedback({"id": "1_0", "type": "response"})
+        await asyncio.sleep(.1)
+        for i in range(1, 4): await core.send_feedback({"id": "2_%d" % i, "type": "response"})
+        assert [data["id"] for _, data in core._buffer] == ["2_2", "2_3"]  # oldest dropped
+
+        server = server_socket_bridge.SocketBridgeOnServer(None)
+        server.send_command("setup", {})
+        received = await server.wait_feedback("2_3", timeout_sec=2.)
+        await close(core, server)
+        return received, server.feedback_queue
+    received, queue = asyncio.run(run())
+    assert received
+    assert "2_2" in queue.messages and "1_0" not in queue.messages and "2_1" not in queue.messages
+
+
+def test_unknown_command_is_ignored(socket_address: str):
+    async def run():
+        core = core_socket_bridge.SocketBridgeOnCore(None)
+        await core.connect()
+        server = server_socket_bridge.SocketBridgeOnServer(None)
+        server.send_command("dance", {})
+        command_id = server.send_command("abort", {})
+        await wait_until(lambda: len(core.queue["abort"]) == 1)
+        connected = core.writer is not None
+        await close(core, server)
+        return connected, core.queue["abort"][0]["id"] == command_id
+    assert asyncio.run(run()) == (True, True)
+
+
+def test_oversized_frame_closes_the_connection(socket_address: str):
+    async def run():
+        core = core_socket_bridge.SocketBridgeOnCore(None)
+        await core.connect()
+        reader, writer = await stream_transport.open_connection(socket_address)
+        await stream_transport.read_frame(reader)  # hello
+        writer.write(stream_transport.FRAME_LENGTH.pack(stream_transport.MAX_FRAME_SIZE + 1))
+        await writer.drain()
+        closed = await asyncio.wait_for(reader.read(), 2.) == b""
+        writer.close()
+        await close(core)
+        return closed, core.writer
+    assert asyncio.run(run()) == (True, None)
+
+
+def test_read_frame_limits_the_size():
+    async def run(size: int, max_size: int) -> bytes:
+        reader = asyncio.StreamReader()
+        reader.feed_data(stream_transport.FRAME_LENGTH.pack(size) + b"x" * size)
+        return await stream_transport.read_frame(reader, max_size)
+    assert asyncio.run(run(10, 10)) == b"x" * 10
+    with pytest.raises(stream_transport.FrameSizeError):
+        asyncio.run(run(11, 10))
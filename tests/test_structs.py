@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+import tasqsym.core.common.constants as tss_constants
+import tasqsym.core.common.structs as tss_structs
+import tasqsym.core.common.action_formats as action_formats
+
+
+SHARED_STATUSES = [getattr(tss_structs, name) for name in dir(tss_structs) if name.startswith("STATUS_")]
+
+
+def test_shared_statuses_are_frozen():
+    assert len(SHARED_STATUSES) == 8
+    for status in SHARED_STATUSES: assert isinstance(status, tss_structs.FrozenStatus)
+
+
+@pytest.mark.parametrize("status", SHARED_STATUSES)
+def test_shared_status_cannot_be_modified(status: tss_structs.FrozenStatus):
+    before = (status.status, status.reason, status.message)
+    with pytest.raises(AttributeError):
+        status.status = tss_constants.StatusFlags.FAILED
+    with pytest.raises(AttributeError):
+        status.message = "modified"
+    with pytest.raises(AttributeError):
+        status.extra = 1
+    with pytest.raises(AttributeError):
+        del status.reason
+    assert (status.status, status.reason, status.message) == before
+
+
+@pytest.mark.parametrize("status", SHARED_STATUSES)
+def test_shared_status_copies_are_the_same_instance(status: tss_structs.FrozenStatus):
+    assert copy.copy(status) is status
+    assert copy.deepcopy(status) is status
+    assert copy.deepcopy({"status": status})["status"] is status
+    unpickled = pickle.loads(pickle.dumps(status))
+    assert isinstance(unpickled, tss_structs.FrozenStatus)
+    assert (unpickled.status, unpickled.reason, unpickled.message) == (status.status, status.reason, status.message)
+
+
+def test_new_status_can_be_modified():
+    status = tss_structs.Status(tss_structs.STATUS_SUCCESS.status)
+    status.status = tss_constants.StatusFlags.FAILED
+    status.message = "failed"
+    assert (status.status, status.message) == (tss_constants.StatusFlags.FAILED, "failed")
+    assert tss_structs.STATUS_SUCCESS.status == tss_constants.StatusFlags.SUCCESS
+
+
+def test_structs_have_no_instance_dict():
+    joint_states = tss_structs.JointStates.fromValues([0., 1.])
+    for instance in (tss_structs.Status(tss_constants.StatusFlags.SUCCESS),
+                     tss_structs.RobotState(tss_structs.Pose()),
+                     tss_structs.ManipulatorState(["j0", "j1"], joint_states, tss_structs.Pose()),
+                     tss_structs.EndEffectorState(["j0", "j1"], joint_states),
+                     tss_structs.CombinedRobotState({})):
+        assert not hasattr(instance, "__dict__")
+
+
+def test_joint_positions_by_name():
+    joint_states = tss_structs.JointStates.fromValues([0.1, 0.2, 0.3])
+    manipulator = tss_structs.ManipulatorState(["a", "b", "c"], joint_states, tss_structs.Pose())
+    end_effector = tss_structs.EndEffectorState(["a", "b", "c"], joint_states)
+    for state in (manipulator, end_effector):
+        assert isinstance(state, tss_structs.JointedRobotState)
+        np.testing.assert_array_equal(state.getJointPositions(["c", "a"]), [0.3, 0.1])
+    assert tss_structs.jointIndexMap(("a", "b", "c")) is tss_structs.jointIndexMap(("a", "b", "c"))
+    with pytest.raises(KeyError):
+        manipulator.getJointPositions(["d"])
+
+
+def test_fk_action_copies_the_joint_vectors():
+    contact = tss_structs.Pose([0., 0., 0.1], [0., 0., 0., 1.])
+    shape = tss_structs.EndEffectorState(
+        ["a", "b"], tss_structs.JointStates([0.5, 1], velocities=np.zeros(2)), "wrist", tss_structs.Pose([1, 2, 3]),
+        ["tip"], [tss_structs.EndEffectorState.ContactAnnotations.CONTACT_CENTER], [contact])
+    action = action_formats.FKAction(shape)
+    goal: tss_structs.EndEffectorState = action.goal
+
+    assert type(goal) is tss_structs.EndEffectorState
+    assert goal.joint_states.positions.dtype == np.float64
+    np.testing.assert_array_equal(goal.joint_states.positions, [0.5, 1.])
+    assert goal.joint_states.efforts is None
+    shape.joint_states.positions[0] = 9.
+    shape.joint_states.velocities[0] = 9.
+    shape.base_state.position[0] = 9.
+    shape.contact_link_states[tss_structs.EndEffectorState.ContactAnnotations.CONTACT_CENTER].position[0] = 9.
+    shape.joint_names.append("c")
+    assert goal.joint_states.positions[0] == .5 and goal.joint_states.velocities[0] == 0.
+    assert goal.base_state.position[0] == 1.
+    assert goal.contact_link_states[tss_structs.EndEffectorState.ContactAnnotations.CONTACT_CENTER].position[0] == 0.
+    assert goal.joint_names == ["a", "b"]
+    assert goal.base_link_name == "wrist" and goal.status is tss_structs.STATUS_SUCCESS
+
+
+def test_ik_action_copies_the_goal_and_shape():
+    position = np.array([0.1, 0.2, 0.3])
+    shape = tss_structs.ManipulatorState(["a"], tss_structs.JointStates.fromValues([0.5]), tss_structs.Pose())
+    action = action_formats.IKAction(tss_structs.Pose(position, None), ["tip"], shape)
+    position[0] = 9.
+    shape.joint_states.positions[0] = 9.
+    assert action.goal.position[0] == .1 and action.goal.orientation is None
+    assert action.fixed_shape.joint_states.positions[0] == .5
+    assert action.goal.copy().position is not action.goal.position
+    assert action_formats.IKAction(tss_structs.Pose(), ["tip"]).fixed_shape is None
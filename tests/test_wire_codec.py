@@ -0,0 +1,136 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------------------------
+
+import os
+import enum
+import json
+
+import numpy as np
+import pytest
+
+import tasqsym.assets.include.wire_codec as wire_codec
+
+
+SAMPLE_TREE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "src", "tasqsym_samples", "generated_sequence_samples", "throw_away_the_trash.json")
+
+OPTIONAL_PACKAGES = {"msgpack": "msgpack", "cbor": "cbor2", "zstd": "zstandard", "json": None, "zlib": None, "none": None}
+
+
+class Side(enum.Enum):
+    LEFT = 0
+    RIGHT = 1
+
+
+def sample_message() -> dict:
+    with open(SAMPLE_TREE) as f: tree = json.load(f)
+    return {"type": "task", "msg_id": "1_0", "tree": tree}
+
+
+def codec_with(serializer: str, compressor: str) -> wire_codec.WireCodec:
+    for name in (serializer, compressor):
+        if OPTIONAL_PACKAGES[name] is not None: pytest.importorskip(OPTIONAL_PACKAGES[name])
+    codec = wire_codec.WireCodec(compress_threshold=0)
+    codec.serializer = serializer
+    codec.compressor = compressor
+    return codec
+
+
+def test_starts_with_plain_json():
+    codec = wire_codec.WireCodec()
+    assert (codec.serializer, codec.compressor) == ("json", "none")
+    assert isinstance(codec.encode({"type": "information"}), str)
+
+
+def test_negotiate_selects_the_first_shared_codec():
+    codec = wire_codec.WireCodec()
+    codec.negotiate({"serializers": ["json"], "compressors": ["zlib", "none"]})
+    assert (codec.serializer, codec.compressor) == ("json", "zlib")
+
+    peer = wire_codec.WireCodec()
+    codec.negotiate(peer.capabilities())
+    assert (codec.serializer, codec.compressor) == (wire_codec.availableSerializers()[0], wire_codec.availableCompressors()[0])
+
+
+def test_negotiate_with_a_peer_without_codecs():
+    codec = wire_codec.WireCodec()
+    codec.negotiate({})  # e.g., capabilities of an older peer
+    assert (codec.serializer, codec.compressor) == ("json", "none")
+    codec.negotiate({"serializers": ["bson"], "compressors": ["lz4"]})
+    assert (codec.serializer, codec.compressor) == ("json", "none")
+
+
+def test_preferred_json_keeps_plain_messages():
+    codec = wire_codec.WireCodec("json")
+    assert codec.capabilities() == {"serializers": ["json"], "compressors": ["none"]}
+    codec.negotiate(wire_codec.WireCodec().capabilities())
+    assert isinstance(codec.encode(sample_message()), str)
+
+
+def test_reset_falls_back_to_json():
+    codec = wire_codec.WireCodec()
+    codec.negotiate({"serializers": ["json"], "compressors": ["zlib"]})
+    codec.reset()
+    payload = codec.encode({"type": "information", "value": 1})
+    assert payload == '{"type": "information", "value": 1}'
+    assert codec.decode(payload) == {"type": "information", "value": 1}
+
+
+def test_decode_plain_json_from_any_peer():
+    codec = codec_with("json", "zlib")
+    assert codec.decode('{"a": 1}') == {"a": 1}
+    assert codec.decode(b'{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack", "cbor"])
+@pytest.mark.parametrize("compressor", ["none", "zlib", "zstd"])
+def test_round_trip(serializer: str, compressor: str):
+    codec = codec_with(serializer, compressor)
+    message = sample_message()
+    payload = codec.encode(message)
+    if serializer == "json" and compressor == "none": assert isinstance(payload, str)  # plain json, no frame
+    else:
+        assert payload[:len(wire_codec.FRAME_MAGIC)] == wire_codec.FRAME_MAGIC
+        assert payload[len(wire_codec.FRAME_MAGIC):len(wire_codec.FRAME_MAGIC) + 2] == \
+            bytes([wire_codec.SERIALIZER_IDS[serializer], wire_codec.COMPRESSOR_IDS[compressor]])
+    assert wire_codec.WireCodec().decode(payload) == message  # frames describe their own format
+
+
+def test_compressed_frame_is_smaller_than_json():
+    message = sample_message()
+    payload = codec_with("json", "zlib").encode(message)
+    assert len(payload) < len(json.dumps(message)) / 2
+
+
+def test_small_messages_are_not_compressed():
+    codec = wire_codec.WireCodec(compress_threshold=1024)
+    codec.negotiate({"serializers": ["json"], "compressors": ["zlib"]})
+    payload = codec.encode({"type": "information"})
+    assert payload[len(wire_codec.FRAME_MAGIC) + 1] == wire_codec.COMPRESSOR_IDS["none"]
+    assert codec.decode(payload) == {"type": "information"}
+
+
+def test_unknown_frame_ids_raise():
+    codec = wire_codec.WireCodec()
+    with pytest.raises(ValueError):
+        codec.decode(wire_codec.FRAME_MAGIC + bytes([0, 9]) + b"{}")
+    with pytest.raises(ValueError):
+        codec.decode(wire_codec.FRAME_MAGIC + bytes([9, 0]) + b"{}")
+
+
+def test_to_builtin_converts_numpy_and_enums():
+    assert wire_codec._toBuiltin(np.array([[0.5, 1.0]], dtype=np.float64)) == [[0.5, 1.0]]
+    value = wire_codec._toBuiltin(np.float64(0.25))
+    assert value == 0.25 and type(value) is float
+    assert wire_codec._toBuiltin(Side.RIGHT) == "RIGHT"
+    with pytest.raises(TypeError):
+        wire_codec._toBuiltin(object())
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack", "cbor"])
+def test_encode_numpy_and_enums(serializer: str):
+    codec = codec_with(serializer, "zlib")
+    message = {"joint_states": np.array([0.1, 0.2], dtype=np.float64), "side": Side.LEFT, "count": np.int64(3)}
+    assert codec.decode(codec.encode(message)) == {"joint_states": [0.1, 0.2], "side": "LEFT", "count": 3}